@@ -0,0 +1,93 @@
+"""
+Бенчмарк: AsyncReader против последовательного чтения на «медленной ФС».
+
+Запуск:
+    python benchmarks/bench_async.py [n_files] [latency_ms]
+
+Высокая задержка хранилища имитируется обёрткой над файлом: каждое
+обращение к «диску» (readinto сырого файла) ждёт ``latency_ms``. Сравниваются:
+- последовательный проход по всем файлам обычными ридерами;
+- asyncio.gather по AsyncReader (свой пул потоков на n_files).
+"""
+
+from __future__ import annotations
+import asyncio
+import io
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from bioformats import FastqReader
+from bioformats.aio import AsyncReader
+
+
+class SlowRaw(io.FileIO):
+    """Файл, каждое чтение которого ждёт ``latency`` секунд (сетевое хранилище)."""
+
+    latency = 0.005
+
+    def readinto(self, b):  # type: ignore[override]
+        time.sleep(self.latency)
+        return super().readinto(b)
+
+
+class SlowFastqReader(FastqReader):
+    def open(self) -> None:
+        if self._fh is not None and not self._fh.closed:
+            return
+        raw = io.BufferedReader(SlowRaw(self.filename, "r"), buffer_size=64 << 10)
+        self._fh = io.TextIOWrapper(raw, encoding=self.encoding)  # type: ignore[assignment]
+
+
+def make_fastq(path: Path, n: int, length: int = 100) -> None:
+    rnd = random.Random(0)
+    with open(path, "w", encoding="utf-8") as fh:
+        for i in range(n):
+            seq = "".join(rnd.choices("ACGT", k=length))
+            fh.write(f"@read{i}\n{seq}\n+\n{'I' * length}\n")
+
+
+def sequential(paths) -> int:
+    return sum(sum(1 for _ in SlowFastqReader(str(p)).read()) for p in paths)
+
+
+async def concurrent(paths, max_batches: int) -> int:
+    with ThreadPoolExecutor(max_workers=len(paths)) as pool:
+
+        async def one(path) -> int:
+            n = 0
+            async with AsyncReader(SlowFastqReader(str(path)), executor=pool, max_batches=max_batches) as r:
+                async for batch in r.abatches():
+                    n += len(batch)
+            return n
+
+        return sum(await asyncio.gather(*(one(p) for p in paths)))
+
+
+def main() -> None:
+    n_files = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    SlowRaw.latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 5.0) / 1000
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [Path(tmp) / f"f{i}.fq" for i in range(n_files)]
+        for p in paths:
+            make_fastq(p, 2000)
+        print(f"{n_files} files x 2000 reads, latency {SlowRaw.latency * 1000:.1f} ms per raw read")
+
+        t0 = time.perf_counter()
+        n_seq = sequential(paths)
+        t_seq = time.perf_counter() - t0
+        print(f"  sequential          {t_seq:7.2f} s")
+
+        for max_batches in (1, 8):
+            t0 = time.perf_counter()
+            n_async = asyncio.run(concurrent(paths, max_batches))
+            dt = time.perf_counter() - t0
+            assert n_async == n_seq
+            print(f"  async max_batches={max_batches} {dt:7.2f} s  ({t_seq / dt:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Бенчмарк: текстовый и байтовый (binary=True) режимы FASTQ/FASTA ридеров.
+
+Запуск:
+    python benchmarks/bench_binary.py [n_records]
+
+Генерирует синтетические FASTQ и FASTA во временной папке и печатает
+МБ/с для обоих режимов, а также для QC-прохода (FastqQC).
+"""
+
+from __future__ import annotations
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bioformats import FastaReader, FastqReader
+from bioformats.qc import FastqQC
+
+
+def make_fastq(path: Path, n: int, length: int = 150) -> None:
+    rnd = random.Random(0)
+    with open(path, "w", encoding="utf-8") as fh:
+        for i in range(n):
+            seq = "".join(rnd.choices("ACGT", k=length))
+            qual = "".join(rnd.choices("#+5?II", k=length))
+            fh.write(f"@read{i} lane:1\n{seq}\n+\n{qual}\n")
+
+
+def make_fasta(path: Path, n: int, length: int = 2000) -> None:
+    rnd = random.Random(1)
+    with open(path, "w", encoding="utf-8") as fh:
+        for i in range(n):
+            seq = "".join(rnd.choices("ACGT", k=length))
+            fh.write(f">contig{i}\n")
+            for j in range(0, length, 60):
+                fh.write(seq[j:j + 60] + "\n")
+
+
+def throughput(label: str, fn, size: int) -> float:
+    t0 = time.perf_counter()
+    fn()
+    dt = time.perf_counter() - t0
+    print(f"  {label:<28} {size / dt / 1e6:8.1f} MB/s")
+    return dt
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as tmp:
+        fq, fa = Path(tmp) / "b.fq", Path(tmp) / "b.fa"
+        make_fastq(fq, n)
+        make_fasta(fa, max(1, n // 10))
+
+        for name, path, cls in (("FASTQ", fq, FastqReader), ("FASTA", fa, FastaReader)):
+            size = os.path.getsize(path)
+            print(f"{name}, {size / 1e6:.1f} MB")
+            t_text = throughput("text read()", lambda: sum(1 for _ in cls(str(path)).read()), size)
+            t_bin = throughput(
+                "binary read()", lambda: sum(1 for _ in cls(str(path), binary=True).read()), size
+            )
+            print(f"  speedup: {t_text / t_bin:.2f}x")
+
+        size = os.path.getsize(fq)
+        print("FASTQ QC")
+        t_text = throughput("text FastqQC", lambda: FastqQC().add_reader(FastqReader(str(fq))), size)
+        t_bin = throughput(
+            "binary FastqQC", lambda: FastqQC().add_reader(FastqReader(str(fq), binary=True)), size
+        )
+        print(f"  speedup: {t_text / t_bin:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Бенчмарк: время на запись для полного read() и для read(fields=[...]) / read(lazy=True).
+
+Запуск:
+    python benchmarks/bench_projection.py [n_records]
+
+Генерирует синтетические SAM (с опциональными тегами) и VCF (с сэмплами)
+во временной папке и печатает нс/запись для каждого режима.
+"""
+
+from __future__ import annotations
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bioformats import SamReader, VcfReader
+
+
+def make_sam(path: Path, n: int) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write("@HD\tVN:1.6\tSO:coordinate\n@SQ\tSN:chr1\tLN:100000000\n")
+        seq = "ACGT" * 25
+        qual = "I" * 100
+        for i in range(n):
+            fh.write(
+                f"read{i}\t{(i % 4) * 16}\tchr1\t{i + 1}\t60\t100M\t*\t0\t0\t{seq}\t{qual}"
+                f"\tNM:i:0\tAS:i:100\tRG:Z:grp1\n"
+            )
+
+
+def make_vcf(path: Path, n: int, samples: int = 20) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        names = "\t".join(f"S{i}" for i in range(samples))
+        fh.write(f"##fileformat=VCFv4.2\n#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\t{names}\n")
+        gts = "\t".join(["0/1:12:99"] * samples)
+        for i in range(n):
+            fh.write(f"chr1\t{i + 1}\t.\tA\tG\t{i % 90}.5\tPASS\tDP={i % 50};AF=0.5\tGT:DP:GQ\t{gts}\n")
+
+
+def per_record(label: str, fn, n: int) -> None:
+    t0 = time.perf_counter()
+    fn()
+    dt = time.perf_counter() - t0
+    print(f"  {label:<34} {dt * 1e9 / n:8.0f} ns/record")
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as tmp:
+        sam, vcf = Path(tmp) / "b.sam", Path(tmp) / "b.vcf"
+        make_sam(sam, n)
+        make_vcf(vcf, n)
+
+        for name, reader, two in (
+            ("SAM", SamReader(str(sam)), ["chrom", "pos"]),
+            ("VCF", VcfReader(str(vcf)), ["chrom", "pos"]),
+        ):
+            print(f"{name}, {n} records")
+            per_record("full read()", lambda: sum(1 for _ in reader.read()), n)
+            per_record(f"read(fields={two})", lambda: sum(1 for _ in reader.read(fields=two)), n)
+            per_record(
+                "read(lazy=True), 2 fields accessed",
+                lambda: sum(1 for r in reader.read(lazy=True) if r["pos"] and r["chrom"]),
+                n,
+            )
+
+
+if __name__ == "__main__":
+    main()
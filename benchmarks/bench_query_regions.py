@@ -0,0 +1,74 @@
+"""
+Бенчмарк: query_regions() против цикла filter_by_region() по регионам.
+
+Запуск:
+    python benchmarks/bench_query_regions.py [n_variants] [n_regions]
+
+Генерирует синтетический VCF во временной папке, сжимает в BGZF,
+строит tabix-индекс и сравнивает время (без индекса и с индексом).
+"""
+
+from __future__ import annotations
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bioformats import VcfReader
+from bioformats.bgzf import bgzip
+
+
+def make_vcf(path: Path, n: int) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write("##fileformat=VCFv4.2\n#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\n")
+        for chrom in ("chr1", "chr2"):
+            for i in range(n // 2):
+                fh.write(f"{chrom}\t{1 + i * 100}\t.\tA\tG\t30\tPASS\tDP={i % 90}\n")
+
+
+def timed(label: str, fn) -> float:
+    t0 = time.perf_counter()
+    hits = fn()
+    dt = time.perf_counter() - t0
+    print(f"  {label:<36} {dt:8.3f} s  ({hits} hits)")
+    return dt
+
+
+def main() -> None:
+    n_variants = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    n_regions = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    rnd = random.Random(1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        vcf = Path(tmp) / "bench.vcf"
+        make_vcf(vcf, n_variants)
+        span = n_variants // 2 * 100
+        regions = []
+        for _ in range(n_regions):
+            start = rnd.randint(1, span)
+            regions.append((rnd.choice(("chr1", "chr2")), start, start + rnd.randint(50, 2000)))
+
+        print(f"{n_variants} variants, {n_regions} regions")
+        r = VcfReader(str(vcf))
+        naive = timed(
+            "plain: filter_by_region loop",
+            lambda: sum(len(list(r.filter_by_region(*reg))) for reg in regions),
+        )
+        batch = timed("plain: query_regions", lambda: sum(len(h) for _, h in r.query_regions(regions)))
+
+        gz = bgzip(str(vcf))
+        VcfReader(gz).build_index()
+        rz = VcfReader(gz)
+        naive_idx = timed(
+            "bgzf+tbi: filter_by_region loop",
+            lambda: sum(len(list(rz.filter_by_region(*reg))) for reg in regions),
+        )
+        batch_idx = timed("bgzf+tbi: query_regions", lambda: sum(len(h) for _, h in rz.query_regions(regions)))
+
+        print(f"speedup (plain):    {naive / batch:6.1f}x")
+        print(f"speedup (indexed):  {naive_idx / batch_idx:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Бенчмарк: распаковка .gz в потоках (Reader(threads=N)) против текущего пути.
+
+Запуск:
+    python benchmarks/bench_threads.py [n_records] [threads]
+
+Генерирует FASTQ, сжимает его обычным gzip и BGZF и печатает МБ/с
+(по несжатым данным) для:
+- сырой распаковки (чтение файлового объекта Reader до конца);
+- полного разбора FastqReader.read().
+"""
+
+from __future__ import annotations
+import gzip
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bioformats import FastqReader
+from bioformats.bgzf import bgzip
+
+
+def make_fastq(path: Path, n: int, length: int = 150) -> None:
+    rnd = random.Random(0)
+    with open(path, "w", encoding="utf-8") as fh:
+        for i in range(n):
+            seq = "".join(rnd.choices("ACGT", k=length))
+            qual = "".join(rnd.choices("#+5?II", k=length))
+            fh.write(f"@read{i} lane:1\n{seq}\n+\n{qual}\n")
+
+
+def drain(reader: FastqReader) -> None:
+    with reader:
+        fh = reader._fh
+        while fh.read(1 << 20):  # type: ignore[union-attr]
+            pass
+
+
+def throughput(label: str, fn, size: int) -> float:
+    t0 = time.perf_counter()
+    fn()
+    dt = time.perf_counter() - t0
+    print(f"  {label:<34} {size / dt / 1e6:8.1f} MB/s")
+    return dt
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    with tempfile.TemporaryDirectory() as tmp:
+        plain = Path(tmp) / "r.fq"
+        make_fastq(plain, n)
+        size = os.path.getsize(plain)
+        gz = Path(tmp) / "r.gzip.fq.gz"
+        with open(plain, "rb") as fin, gzip.open(gz, "wb", compresslevel=6) as fout:
+            fout.write(fin.read())
+        bgz = bgzip(str(plain), str(Path(tmp) / "r.bgzf.fq.gz"))
+        print(f"FASTQ {size / 1e6:.1f} MB uncompressed, threads={threads}")
+
+        for name, path in (("gzip", str(gz)), ("BGZF", bgz)):
+            for binary in (False, True):
+                mode = "binary" if binary else "text"
+                print(f"{name}, {mode}")
+                t1 = throughput(f"inflate, threads=1", lambda: drain(FastqReader(path, binary=binary)), size)
+                tn = throughput(
+                    f"inflate, threads={threads}",
+                    lambda: drain(FastqReader(path, binary=binary, threads=threads)),
+                    size,
+                )
+                print(f"    speedup: {t1 / tn:.2f}x")
+                t1 = throughput(
+                    "read(), threads=1", lambda: sum(1 for _ in FastqReader(path, binary=binary).read()), size
+                )
+                tn = throughput(
+                    f"read(), threads={threads}",
+                    lambda: sum(1 for _ in FastqReader(path, binary=binary, threads=threads).read()),
+                    size,
+                )
+                print(f"    speedup: {t1 / tn:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -23,8 +23,24 @@ from .fasta import FastaReader
 from .fastq import FastqReader
 from .sam import SamReader
 from .vcf import VcfReader
+from .fai import FastaIndex
+from .bgzf import BgzfReader, BgzfWriter
+from .tabix import TabixIndex
+from .batch import RecordBatch
+from .parallel import ParallelReader
+from .seqview import SequenceView
+from .stats import Stats
+from .metacache import MetadataCache
+from .genotypes import GenotypeBatch
+from .aio import AsyncReader
+from .writers import FastaWriter, FastqWriter, SamWriter, VcfWriter
+from .coverage import CoverageRun
+from .packed import PackedBatch, PackedSequence
+from .twobit import TwoBitReader, TwoBitWriter
+from .kmers import KmerCounter
+from .trim import FastqTrimmer
 
-__all__ = ["Reader","SequenceReader","GenomicDataReader","FastaReader","FastqReader","SamReader","VcfReader"]
+__all__ = ["Reader","SequenceReader","GenomicDataReader","FastaReader","FastqReader","SamReader","VcfReader","FastaIndex","BgzfReader","BgzfWriter","TabixIndex","RecordBatch","ParallelReader","SequenceView","Stats","MetadataCache","GenotypeBatch","AsyncReader","FastaWriter","FastqWriter","SamWriter","VcfWriter","CoverageRun","PackedSequence","PackedBatch","TwoBitReader","TwoBitWriter","KmerCounter","FastqTrimmer"]
 
 
 __version__ = "0.1.0"
@@ -0,0 +1,166 @@
+# src/bioformats/aio.py
+"""
+Асинхронное чтение для asyncio-конвейеров.
+
+Ридеры пакета блокирующие; AsyncReader выносит чтение и разбор в поток
+(executor) и передаёт записи в event loop батчами через ограниченную
+очередь:
+
+    async with AsyncReader(VcfReader("a.vcf.gz")) as r:
+        async for rec in r.aread():
+            ...
+
+    # сотни файлов одновременно: I/O одного перекрывается с разбором других
+    counts = await asyncio.gather(*(AsyncReader(FastqReader(p)).call("count") for p in paths))
+
+Обратное давление: поток-производитель опережает потребителя не больше
+чем на ``max_batches`` батчей по ``batch_size`` записей — медленный
+потребитель не раздувает память. Если потребитель прервал цикл
+(break, исключение, отмена задачи), производитель останавливается
+на следующем батче, файл закрывается.
+"""
+
+from __future__ import annotations
+from concurrent.futures import Executor
+from itertools import islice
+from typing import Any, AsyncIterator, Iterator, List, Optional, Tuple
+import asyncio
+import threading
+
+from .reader import Reader
+
+_DONE = object()
+
+
+class _Failure:
+    """Исключение из потока-производителя (поднимается у потребителя)."""
+
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+def _batched(records: Iterator[Any], size: int) -> Iterator[List[Any]]:
+    while True:
+        batch = list(islice(records, size))
+        if not batch:
+            return
+        yield batch
+
+
+class AsyncReader:
+    """
+    Асинхронная обёртка над любым ридером (FASTA, FASTQ, SAM, VCF).
+
+    reader      — исходный (блокирующий) ридер;
+    batch_size  — записей в одном батче, передаваемом в event loop;
+    max_batches — ёмкость очереди (сколько батчей читается наперёд);
+    executor    — пул потоков (по умолчанию — executor event loop'а;
+                  для сотен файлов стоит передать свой ThreadPoolExecutor
+                  с нужным числом потоков).
+    """
+
+    def __init__(
+        self,
+        reader: Reader,
+        *,
+        batch_size: int = 1024,
+        max_batches: int = 8,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        if batch_size < 1 or max_batches < 1:
+            raise ValueError("batch_size and max_batches must be positive")
+        self.reader = reader
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.executor = executor
+        self._active: Optional[Tuple[threading.Event, asyncio.Queue, asyncio.Future]] = None
+
+    async def __aenter__(self) -> "AsyncReader":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self._halt()
+        await self.call("close")
+
+    async def call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Вызвать блокирующий метод ридера в executor: ``await r.call("count")``."""
+        loop = asyncio.get_running_loop()
+        fn = getattr(self.reader, method)
+        return await loop.run_in_executor(self.executor, lambda: fn(*args, **kwargs))
+
+    async def aread(self, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        """
+        Записи ``reader.read(*args, **kwargs)`` (те же аргументы: fields,
+        lazy, info...) в порядке файла.
+        """
+        batches = self.abatches(*args, **kwargs)
+        try:
+            async for batch in batches:
+                for rec in batch:
+                    yield rec
+        finally:
+            await batches.aclose()  # остановить производителя сразу, а не при сборке мусора
+
+    async def abatches(self, *args: Any, **kwargs: Any) -> AsyncIterator[List[Any]]:
+        """
+        Записи списками по ``batch_size`` (меньше переключений на запись).
+
+        Ридер читает один проход за раз: новый aread()/abatches()
+        останавливает предыдущий, даже если его цикл прерван break'ом
+        и генератор ещё не закрыт.
+        """
+        loop = asyncio.get_running_loop()
+        await self._halt()
+        queue: asyncio.Queue = asyncio.Queue(self.max_batches)
+        stop = threading.Event()
+
+        def put(item: Any) -> None:
+            # блокирует поток, пока в очереди нет места (обратное давление);
+            # после остановки не кладёт ничего — очередь уже никто не читает
+            if not stop.is_set():
+                asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+        def produce() -> None:
+            try:
+                # файл открыт на время прохода (если не был открыт снаружи):
+                # чтение наперёд делает продолжение с курсора бессмысленным
+                with self.reader._session():
+                    records = self.reader.read(*args, **kwargs)
+                    try:
+                        for batch in _batched(iter(records), self.batch_size):
+                            if stop.is_set():
+                                return
+                            put(batch)
+                    finally:
+                        close = getattr(records, "close", None)
+                        if close is not None:
+                            close()
+                put(_DONE)
+            except BaseException as exc:  # noqa: BLE001 — передаём потребителю
+                put(_Failure(exc))
+
+        producer = loop.run_in_executor(self.executor, produce)
+        self._active = (stop, queue, producer)
+        try:
+            while True:
+                item = await queue.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, _Failure):
+                    raise item.exc
+                yield item
+        finally:
+            if self._active is not None and self._active[2] is producer:
+                await self._halt()
+
+    async def _halt(self) -> None:
+        """Остановить текущий проход и дождаться потока-производителя."""
+        if self._active is None:
+            return
+        stop, queue, producer = self._active
+        self._active = None
+        stop.set()
+        # освободить производителя, ждущего места в очереди
+        while not queue.empty():
+            queue.get_nowait()
+        await producer
@@ -0,0 +1,310 @@
+# src/bioformats/batch.py
+"""
+Колоночные батчи записей (в духе Arrow RecordBatch) на NumPy.
+
+Вместо словаря на каждую запись ридер заполняет заранее выделенные массивы:
+
+- числовые поля   — np.ndarray (int32 pos, uint16 flag, float64 qual, ...)
+- категориальные  — CategoricalColumn: int32-коды + общий словарь категорий
+- строки          — StringColumn: offsets (int64, n+1) + один буфер байт
+
+Схема колонок задаётся в ридере (``_batch_schema``):
+    {"pos": (1, "int32"), "chrom": (0, "category"), "id": (2, "str"), ...}
+где число — индекс поля в строке (0-based), строка — тип колонки.
+
+Батч переводится в pandas (``to_pandas``) и, если установлен pyarrow,
+в Arrow/Parquet (``to_arrow``, ``write_parquet``) прямо из этих буферов:
+категории — DictionaryArray, строки — LargeStringArray над теми же
+offsets и байтами.
+"""
+
+from __future__ import annotations
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow нужен только для to_arrow()/write_parquet()
+    pa = pq = None
+
+ColumnSpec = Tuple[int, str]  # (индекс поля, тип)
+
+# числовые типы колонок и значение для пропуска ('.' / '*')
+_NUMERIC = {
+    "int32": (np.int32, 0),
+    "int64": (np.int64, 0),
+    "uint8": (np.uint8, 0),
+    "uint16": (np.uint16, 0),
+    "float32": (np.float32, np.nan),
+    "float64": (np.float64, np.nan),
+}
+
+
+class StringColumn:
+    """Строковая колонка: ``data[offsets[i]:offsets[i + 1]]`` — i-я строка (UTF-8)."""
+
+    __slots__ = ("offsets", "data")
+
+    def __init__(self, offsets: np.ndarray, data: bytes) -> None:
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        if i < 0:
+            i += len(self)
+        return self.data[self.offsets[i]:self.offsets[i + 1]].decode("utf-8")
+
+    def to_list(self) -> List[str]:
+        # один decode всего буфера: для ASCII символьные смещения = байтовым
+        if self.data.isascii():
+            text = self.data.decode("ascii")
+            o = self.offsets.tolist()
+            return [text[o[i]:o[i + 1]] for i in range(len(o) - 1)]
+        return [self[i] for i in range(len(self))]
+
+    def to_numpy(self) -> np.ndarray:
+        return np.array(self.to_list(), dtype=object)
+
+    @classmethod
+    def concat(cls, cols: Sequence["StringColumn"]) -> "StringColumn":
+        if not cols:
+            return cls(np.zeros(1, dtype=np.int64), b"")
+        parts = [np.zeros(1, dtype=np.int64)]
+        base = 0
+        for c in cols:
+            parts.append(c.offsets[1:] + base)
+            base += int(c.offsets[-1])
+        return cls(np.concatenate(parts), b"".join(c.data for c in cols))
+
+
+class CategoricalColumn:
+    """Категориальная колонка: int32-коды + словарь категорий (общий для всех батчей ридера)."""
+
+    __slots__ = ("codes", "categories")
+
+    def __init__(self, codes: np.ndarray, categories: List[str]) -> None:
+        self.codes = codes
+        self.categories = categories
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, i: int) -> str:
+        return self.categories[self.codes[i]]
+
+    def to_list(self) -> List[str]:
+        cats = self.categories
+        return [cats[c] for c in self.codes.tolist()]
+
+    def to_pandas(self, categories: Optional[List[str]] = None) -> pd.Categorical:
+        return pd.Categorical.from_codes(self.codes, categories=list(categories or self.categories))
+
+
+Column = Union[np.ndarray, StringColumn, CategoricalColumn]
+
+
+class RecordBatch:
+    """Набор колонок одинаковой длины."""
+
+    def __init__(self, columns: Dict[str, Column], num_rows: int) -> None:
+        self.columns = columns
+        self.num_rows = num_rows
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def __getitem__(self, name: str) -> Column:
+        return self.columns[name]
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self.columns)
+
+    def to_pandas(self) -> pd.DataFrame:
+        return batches_to_pandas([self])
+
+    def to_arrow(self) -> "pa.RecordBatch":
+        """pyarrow.RecordBatch без построчной конвертации (нужен pyarrow)."""
+        _require_pyarrow()
+        arrays = [_column_to_arrow(col, self.num_rows) for col in self.columns.values()]
+        return pa.RecordBatch.from_arrays(arrays, names=self.column_names)
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("pyarrow is required for Arrow/Parquet export (pip install bioformats[parquet])")
+
+
+def _column_to_arrow(col: Column, n: int) -> "pa.Array":
+    if isinstance(col, CategoricalColumn):
+        return pa.DictionaryArray.from_arrays(pa.array(col.codes, pa.int32()), pa.array(col.categories, pa.string()))
+    if isinstance(col, StringColumn):
+        return pa.LargeStringArray.from_buffers(n, pa.py_buffer(col.offsets), pa.py_buffer(col.data))
+    return pa.array(col)
+
+
+def write_parquet(batches: Iterable[RecordBatch], path: str, compression: str = "zstd") -> int:
+    """Записать батчи в Parquet по одной группе строк на батч; возвращает число строк."""
+    _require_pyarrow()
+    writer = None
+    rows = 0
+    try:
+        for batch in batches:
+            table = pa.Table.from_batches([batch.to_arrow()])
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema, compression=compression)
+            writer.write_table(table)
+            rows += len(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def batches_to_pandas(batches: Iterable[RecordBatch], limit: Optional[int] = None) -> pd.DataFrame:
+    """
+    Собрать DataFrame из батчей: колонки склеиваются на уровне массивов,
+    категориальные получают итоговый (полный) словарь категорий.
+    """
+    batches = list(batches)
+    if not batches:
+        return pd.DataFrame()
+    names = batches[0].column_names
+    data: Dict[str, object] = {}
+    for name in names:
+        cols = [b[name] for b in batches]
+        first = cols[0]
+        if isinstance(first, CategoricalColumn):
+            codes = np.concatenate([c.codes for c in cols])  # type: ignore[union-attr]
+            data[name] = pd.Categorical.from_codes(codes[:limit], categories=list(cols[-1].categories))  # type: ignore[union-attr]
+        elif isinstance(first, StringColumn):
+            data[name] = StringColumn.concat(cols).to_numpy()[:limit]  # type: ignore[arg-type]
+        else:
+            data[name] = np.concatenate(cols)[:limit]  # type: ignore[arg-type]
+    return pd.DataFrame(data, columns=names)
+
+
+class BatchBuilder:
+    """
+    Заполняет колонки батча построчно из уже разбитых полей.
+    Словари категорий живут в билдере и переиспользуются между батчами,
+    поэтому коды одной категории стабильны во всех батчах ридера.
+    """
+
+    def __init__(self, schema: Dict[str, ColumnSpec], columns: Optional[Sequence[str]], batch_size: int) -> None:
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        names = list(columns) if columns is not None else list(schema)
+        unknown = [c for c in names if c not in schema]
+        if unknown:
+            raise KeyError(f"Unknown columns: {unknown}; available: {list(schema)}")
+        self.names = names
+        self.specs = [schema[c] for c in names]
+        self.max_field = max((idx for idx, _ in self.specs), default=0)
+        self.batch_size = batch_size
+        self._cat_index: Dict[str, Dict[str, int]] = {c: {} for c, (_, k) in zip(names, self.specs) if k == "category"}
+        self._cat_values: Dict[str, List[str]] = {c: [] for c in self._cat_index}
+        self._reset()
+
+    def _reset(self) -> None:
+        self.n = 0
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._strings: Dict[str, List[bytes]] = {}
+        for name, (_, kind) in zip(self.names, self.specs):
+            if kind in _NUMERIC:
+                self._arrays[name] = np.empty(self.batch_size, dtype=_NUMERIC[kind][0])
+            elif kind == "category":
+                self._arrays[name] = np.empty(self.batch_size, dtype=np.int32)
+            elif kind == "str":
+                self._strings[name] = []
+            else:
+                raise ValueError(f"Unknown column type {kind!r} for {name!r}")
+
+    @property
+    def full(self) -> bool:
+        return self.n >= self.batch_size
+
+    def append(self, fields: Sequence[str]) -> None:
+        i = self.n
+        for name, (idx, kind) in zip(self.names, self.specs):
+            value = fields[idx]
+            if kind == "str":
+                self._strings[name].append(value.encode("utf-8"))
+            elif kind == "category":
+                index = self._cat_index[name]
+                code = index.get(value)
+                if code is None:
+                    code = index[value] = len(index)
+                    self._cat_values[name].append(value)
+                self._arrays[name][i] = code
+            else:
+                dtype, missing = _NUMERIC[kind]
+                if value in (".", "*", ""):
+                    self._arrays[name][i] = missing
+                elif dtype is np.float32 or dtype is np.float64:
+                    self._arrays[name][i] = float(value)
+                else:
+                    self._arrays[name][i] = int(value)
+        self.n = i + 1
+
+    def finish(self) -> Optional[RecordBatch]:
+        """Отдать накопленный батч (None, если пусто) и начать новый."""
+        if self.n == 0:
+            return None
+        n = self.n
+        cols: Dict[str, Column] = {}
+        for name, (_, kind) in zip(self.names, self.specs):
+            if kind == "str":
+                pieces = self._strings[name]
+                offsets = np.zeros(n + 1, dtype=np.int64)
+                np.cumsum([len(p) for p in pieces], out=offsets[1:])
+                cols[name] = StringColumn(offsets, b"".join(pieces))
+            elif kind == "category":
+                cols[name] = CategoricalColumn(self._arrays[name][:n], list(self._cat_values[name]))
+            else:
+                cols[name] = self._arrays[name][:n]
+        self._reset()
+        return RecordBatch(cols, n)
+
+
+def resolve_schema(schema: Dict[str, ColumnSpec], dtypes: Optional[Dict[str, str]]) -> Dict[str, ColumnSpec]:
+    """Схема с заменёнными типами колонок: ``{"pos": "int64", "chrom": "str"}``."""
+    if not dtypes:
+        return schema
+    unknown = [c for c in dtypes if c not in schema]
+    if unknown:
+        raise KeyError(f"Unknown columns: {unknown}; available: {list(schema)}")
+    bad = [k for k in dtypes.values() if k not in _NUMERIC and k not in ("category", "str")]
+    if bad:
+        raise ValueError(f"Unknown column types: {bad}")
+    return {name: (idx, dtypes.get(name, kind)) for name, (idx, kind) in schema.items()}
+
+
+def iter_batches(
+    lines: Iterable[str],
+    schema: Dict[str, ColumnSpec],
+    *,
+    min_fields: int,
+    batch_size: int = 65536,
+    columns: Optional[Sequence[str]] = None,
+) -> Iterator[RecordBatch]:
+    """Нарезать строки данных (без заголовка) в колоночные батчи."""
+    builder = BatchBuilder(schema, columns, batch_size)
+    maxsplit = max(builder.max_field + 1, min_fields - 1)
+    for line in lines:
+        fields = line.split("\t", maxsplit)
+        if len(fields) < min_fields:
+            continue
+        builder.append(fields)
+        if builder.full:
+            batch = builder.finish()
+            assert batch is not None
+            yield batch
+    batch = builder.finish()
+    if batch is not None:
+        yield batch
@@ -0,0 +1,429 @@
+# src/bioformats/bgzf.py
+"""
+BGZF — «блочный» gzip (формат htslib: .fa.gz, .vcf.gz, .sam.gz, BAM).
+
+Файл состоит из независимых gzip-блоков по ≤ 64 КБ распакованных данных;
+размер каждого блока записан в extra-поле 'BC' заголовка. Поэтому любую
+позицию можно адресовать «виртуальным смещением»:
+
+    voffset = (смещение начала блока в сжатом файле << 16) | смещение внутри блока
+
+и перейти к ней, распаковав ровно один блок (O(block), а не O(file)).
+
+Здесь:
+- BgzfReader  — файловый объект для чтения (bytes или str), seek/tell по voffset
+- BgzfWriter  — запись BGZF (с EOF-маркером), tell() тоже отдаёт voffset
+- GzipIndex   — ``.gzi``: соответствие несжатых смещений блокам (нужно FAI)
+"""
+
+from __future__ import annotations
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
+import bisect
+import io
+import os
+import struct
+import zlib
+
+# максимум несжатых данных в одном блоке (как в htslib)
+MAX_BLOCK_DATA = 0xFF00
+MAX_BLOCK_SIZE = 0x10000
+
+_HEADER = b"\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff\x06\x00BC\x02\x00"
+_HEADER_SIZE = 18
+# пустой блок — стандартный маркер конца BGZF-файла
+EOF_BLOCK = bytes.fromhex(
+    "1f8b08040000000000ff0600424302001b0003000000000000000000"
+)
+
+
+# ---------- виртуальные смещения ----------
+def make_virtual_offset(block_offset: int, within: int) -> int:
+    """Собрать виртуальное смещение из смещения блока и позиции внутри блока."""
+    if not 0 <= within < MAX_BLOCK_SIZE:
+        raise ValueError(f"In-block offset out of range: {within}")
+    return (block_offset << 16) | within
+
+
+def split_virtual_offset(voffset: int) -> Tuple[int, int]:
+    """(смещение блока, позиция внутри блока)."""
+    return voffset >> 16, voffset & 0xFFFF
+
+
+def is_bgzf(filename: str) -> bool:
+    """Проверить по заголовку первого блока, что файл — BGZF (а не обычный gzip)."""
+    try:
+        with open(filename, "rb") as fh:
+            head = fh.read(_HEADER_SIZE)
+    except OSError:
+        return False
+    return (
+        len(head) == _HEADER_SIZE
+        and head[:4] == b"\x1f\x8b\x08\x04"
+        and head[12:14] == b"BC"
+        and head[14:16] == b"\x02\x00"
+    )
+
+
+def _read_raw_block(raw: BinaryIO, offset: int) -> Optional[Tuple[bytes, int, int, int]]:
+    """
+    Прочитать сжатый блок, начинающийся в ``offset``, без распаковки.
+    Возвращает (deflate-данные, crc32, несжатый размер, размер блока); None — конец файла.
+    """
+    raw.seek(offset)
+    header = raw.read(_HEADER_SIZE)
+    if not header:
+        return None
+    if len(header) < _HEADER_SIZE or header[:4] != b"\x1f\x8b\x08\x04":
+        raise ValueError(f"Not a BGZF block at offset {offset}")
+
+    xlen = struct.unpack_from("<H", header, 10)[0]
+    extra = header[12:] + raw.read(xlen - 6)
+    bsize = None
+    i = 0
+    while i + 4 <= len(extra):
+        si1, si2, slen = extra[i], extra[i + 1], struct.unpack_from("<H", extra, i + 2)[0]
+        if si1 == 66 and si2 == 67 and slen == 2:  # 'B', 'C'
+            bsize = struct.unpack_from("<H", extra, i + 4)[0] + 1
+            break
+        i += 4 + slen
+    if bsize is None:
+        raise ValueError(f"BGZF block at offset {offset} has no BC subfield")
+
+    cdata = raw.read(bsize - xlen - 20)
+    crc, isize = struct.unpack("<II", raw.read(8))
+    return cdata, crc, isize, bsize
+
+
+def _inflate(cdata: bytes, crc: int, isize: int, bsize: int, offset: int) -> Tuple[bytes, int]:
+    """Распаковать блок и сверить CRC (zlib отпускает GIL — можно звать из потоков)."""
+    data = zlib.decompress(cdata, -15) if cdata else b""
+    if len(data) != isize or (zlib.crc32(data) & 0xFFFFFFFF) != crc:
+        raise ValueError(f"Corrupted BGZF block at offset {offset}")
+    return data, bsize
+
+
+def _read_block(raw: BinaryIO, offset: int) -> Tuple[bytes, int]:
+    """
+    Прочитать и распаковать блок, начинающийся в ``offset``.
+    Возвращает (данные, размер блока в сжатом файле); (b"", 0) — конец файла.
+    """
+    block = _read_raw_block(raw, offset)
+    if block is None:
+        return b"", 0
+    return _inflate(*block, offset)
+
+
+def iter_blocks(filename: str) -> Iterator[Tuple[int, int, int]]:
+    """
+    Пройти по заголовкам блоков, не распаковывая данные.
+    Выдаёт (смещение блока, размер блока, несжатый размер).
+    """
+    with open(filename, "rb") as raw:
+        offset = 0
+        while True:
+            raw.seek(offset)
+            header = raw.read(_HEADER_SIZE)
+            if len(header) < _HEADER_SIZE:
+                return
+            bsize = struct.unpack_from("<H", header, 16)[0] + 1
+            raw.seek(offset + bsize - 4)
+            isize = struct.unpack("<I", raw.read(4))[0]
+            yield offset, bsize, isize
+            offset += bsize
+
+
+class BgzfReader(io.IOBase):
+    """
+    Чтение BGZF с произвольным доступом.
+
+    - ``tell()`` возвращает виртуальное смещение, ``seek(voffset)``
+      распаковывает только целевой блок (последние блоки кэшируются);
+    - ``text=True`` — ``readline()``/``read()`` возвращают str
+      (переводы строк ``\\r\\n`` приводятся к ``\\n``, как в текстовом режиме);
+    - ``threads=N`` (N > 1) — при последовательном чтении следующие блоки
+      распаковываются наперёд в пуле из N потоков (zlib отпускает GIL),
+      сжатые данные читаются и собираются по порядку в вызывающем потоке;
+      seek в другое место сбрасывает очередь предвыборки.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        *,
+        text: bool = False,
+        encoding: str = "utf-8",
+        cache_size: int = 32,
+        threads: int = 1,
+    ) -> None:
+        super().__init__()
+        self.name = filename
+        self.text = text
+        self.encoding = encoding
+        self._raw: BinaryIO = open(filename, "rb")
+        self._cache: "OrderedDict[int, Tuple[bytes, int]]" = OrderedDict()
+        self._cache_size = cache_size
+        self._block_start = 0
+        self._block_size = 0
+        self._data = b""
+        self._within = 0
+        # предвыборка: смещение блока -> Future[(данные, размер)] или None (конец файла)
+        self._pool: Optional[ThreadPoolExecutor] = ThreadPoolExecutor(threads) if threads > 1 else None
+        self._ahead: "OrderedDict[int, Optional[Future]]" = OrderedDict()
+        self._ahead_at: Optional[int] = None  # следующий блок для постановки в очередь
+        self._depth = 4 * threads
+        self._load(0)
+
+    # ---------- блоки ----------
+    def _load(self, offset: int) -> None:
+        cached = self._cache.get(offset)
+        if cached is None:
+            cached = _read_block(self._raw, offset) if self._pool is None else self._load_ahead(offset)
+            self._cache[offset] = cached
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(offset)
+        self._block_start = offset
+        self._data, self._block_size = cached
+        self._within = 0
+
+    def _load_ahead(self, offset: int) -> Tuple[bytes, int]:
+        """Блок из очереди предвыборки (дозаполняя её на ``_depth`` блоков вперёд)."""
+        assert self._pool is not None
+        if offset not in self._ahead:
+            # не последовательное чтение — очередь начинается заново с offset
+            self._ahead.clear()
+            self._ahead_at = offset
+        while self._ahead_at is not None and len(self._ahead) < self._depth:
+            at = self._ahead_at
+            block = _read_raw_block(self._raw, at)
+            if block is None:
+                self._ahead[at] = None
+                self._ahead_at = None
+            else:
+                self._ahead[at] = self._pool.submit(_inflate, *block, at)
+                self._ahead_at = at + block[3]
+        fut = self._ahead.pop(offset)
+        return (b"", 0) if fut is None else fut.result()
+
+    def _next_block(self) -> bool:
+        """Перейти к следующему непустому блоку. False — конец файла."""
+        while True:
+            if self._block_size == 0:
+                return False
+            self._load(self._block_start + self._block_size)
+            if self._data:
+                return True
+
+    def _settle(self) -> None:
+        """Если текущий блок дочитан — встать на начало следующего (каноничный tell)."""
+        if self._within >= len(self._data):
+            self._next_block()
+
+    # ---------- file-like API ----------
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        self._settle()
+        return make_virtual_offset(self._block_start, min(self._within, MAX_BLOCK_SIZE - 1))
+
+    def seek(self, voffset: int, whence: int = os.SEEK_SET) -> int:
+        if whence != os.SEEK_SET:
+            raise io.UnsupportedOperation("BGZF supports only absolute virtual offsets")
+        block, within = split_virtual_offset(voffset)
+        if block != self._block_start or self._block_size == 0:
+            self._load(block)
+        if within > len(self._data):
+            raise ValueError(f"Virtual offset {voffset} is past the end of its block")
+        self._within = within
+        return voffset
+
+    def _decode(self, data: bytes) -> Union[bytes, str]:
+        if not self.text:
+            return data
+        text = data.decode(self.encoding)
+        if "\r" in text:
+            text = text.replace("\r\n", "\n")
+        return text
+
+    def readline(self, size: int = -1) -> Union[bytes, str]:  # type: ignore[override]
+        parts: List[bytes] = []
+        while True:
+            self._settle()
+            if self._within >= len(self._data):
+                break
+            nl = self._data.find(b"\n", self._within)
+            if nl >= 0:
+                parts.append(self._data[self._within:nl + 1])
+                self._within = nl + 1
+                break
+            parts.append(self._data[self._within:])
+            self._within = len(self._data)
+        return self._decode(b"".join(parts))
+
+    def read(self, size: int = -1) -> Union[bytes, str]:
+        parts: List[bytes] = []
+        remaining = size
+        while remaining != 0:
+            self._settle()
+            if self._within >= len(self._data):
+                break
+            stop = len(self._data) if remaining < 0 else min(len(self._data), self._within + remaining)
+            parts.append(self._data[self._within:stop])
+            if remaining > 0:
+                remaining -= stop - self._within
+            self._within = stop
+        return self._decode(b"".join(parts))
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = self.readline()
+        if not line:
+            raise StopIteration
+        return line
+
+    def close(self) -> None:
+        raw = getattr(self, "_raw", None)
+        if raw is not None and not self.closed:
+            raw.close()
+            self._cache.clear()
+            if self._pool is not None:
+                self._ahead.clear()
+                self._pool.shutdown(wait=False, cancel_futures=True)
+        super().close()
+
+
+class BgzfWriter(io.IOBase):
+    """
+    Запись BGZF. Данные копятся в буфере и сбрасываются блоками по ≤ 64 КБ.
+
+    ``tell()`` возвращает виртуальное смещение следующего байта — его можно
+    сохранять в индексы (tabix/FAI) прямо во время записи.
+    ``flush()`` принудительно закрывает текущий блок.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        *,
+        text: bool = False,
+        encoding: str = "utf-8",
+        compresslevel: int = 6,
+    ) -> None:
+        super().__init__()
+        self.name = filename
+        self.text = text
+        self.encoding = encoding
+        self.compresslevel = compresslevel
+        self._raw: BinaryIO = open(filename, "wb")
+        self._buf = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return make_virtual_offset(self._raw.tell(), len(self._buf))
+
+    def write(self, data: Union[bytes, str]) -> int:  # type: ignore[override]
+        if isinstance(data, str):
+            data = data.encode(self.encoding)
+        self._buf += data
+        while len(self._buf) >= MAX_BLOCK_DATA:
+            self._write_block(bytes(self._buf[:MAX_BLOCK_DATA]))
+            del self._buf[:MAX_BLOCK_DATA]
+        return len(data)
+
+    def _write_block(self, data: bytes) -> None:
+        comp = zlib.compressobj(self.compresslevel, zlib.DEFLATED, -15)
+        cdata = comp.compress(data) + comp.flush()
+        bsize = len(cdata) + 26
+        if bsize > MAX_BLOCK_SIZE:
+            # несжимаемые данные: делим пополам, чтобы уложиться в лимит блока
+            half = len(data) // 2
+            self._write_block(data[:half])
+            self._write_block(data[half:])
+            return
+        self._raw.write(_HEADER)
+        self._raw.write(struct.pack("<H", bsize - 1))
+        self._raw.write(cdata)
+        self._raw.write(struct.pack("<II", zlib.crc32(data) & 0xFFFFFFFF, len(data)))
+
+    def flush(self) -> None:
+        if self._raw.closed:
+            return
+        if self._buf:
+            self._write_block(bytes(self._buf))
+            self._buf.clear()
+        self._raw.flush()
+
+    def close(self) -> None:
+        if getattr(self, "_raw", None) is not None and not self.closed:
+            try:
+                self.flush()
+                self._raw.write(EOF_BLOCK)
+            finally:
+                self._raw.close()
+        super().close()
+
+
+def bgzip(src: str, dst: Optional[str] = None, *, compresslevel: int = 6) -> str:
+    """Сжать обычный файл в BGZF (аналог ``bgzip -c src > src.gz``)."""
+    dst = dst or src + ".gz"
+    with open(src, "rb") as fin, BgzfWriter(dst, compresslevel=compresslevel) as fout:
+        while True:
+            chunk = fin.read(1 << 20)
+            if not chunk:
+                break
+            fout.write(chunk)
+    return dst
+
+
+class GzipIndex:
+    """
+    ``.gzi``-индекс (как у ``bgzip -i``): для каждого блока пара
+    (сжатое смещение, несжатое смещение). Позволяет перевести позицию
+    в распакованном потоке (например, OFFSET из ``.fai``) в виртуальное смещение.
+    """
+
+    def __init__(self, entries: Optional[List[Tuple[int, int]]] = None) -> None:
+        pairs = sorted(set([(0, 0)] + list(entries or [])))
+        self._coffsets = [c for c, _ in pairs]
+        self._uoffsets = [u for _, u in pairs]
+
+    @classmethod
+    def build(cls, filename: str) -> "GzipIndex":
+        entries = []
+        upos = 0
+        for offset, _bsize, isize in iter_blocks(filename):
+            if isize:
+                entries.append((offset, upos))
+            upos += isize
+        return cls(entries)
+
+    @classmethod
+    def load(cls, path: str) -> "GzipIndex":
+        with open(path, "rb") as fh:
+            (n,) = struct.unpack("<Q", fh.read(8))
+            data = fh.read(16 * n)
+        vals = struct.unpack(f"<{2 * n}Q", data)
+        return cls(list(zip(vals[::2], vals[1::2])))
+
+    def save(self, path: str) -> None:
+        pairs = list(zip(self._coffsets, self._uoffsets))[1:]  # (0, 0) не хранится
+        with open(path, "wb") as fh:
+            fh.write(struct.pack("<Q", len(pairs)))
+            for c, u in pairs:
+                fh.write(struct.pack("<QQ", c, u))
+
+    def to_virtual(self, uoffset: int) -> int:
+        """Несжатое смещение -> виртуальное смещение BGZF."""
+        i = bisect.bisect_right(self._uoffsets, uoffset) - 1
+        return make_virtual_offset(self._coffsets[i], uoffset - self._uoffsets[i])
@@ -0,0 +1,263 @@
+# src/bioformats/coverage.py
+"""
+Покрытие (глубина) по отсортированному SAM — потоково.
+
+Выравнивания идут по возрастанию позиции; каждое раскладывается на
+блоки референса по CIGAR (aligned_blocks). Проход «заметающей прямой»
+держит две кучи:
+
+- starts — блоки, которые ещё не начались (у выравнивания их может быть
+  несколько: сплайс-риды с N);
+- ends   — концы активных блоков; глубина = их число.
+
+Позиции левее начала очередного рида уже не изменятся — по ним сразу
+выдаются отрезки постоянной глубины. Память — O(максимальная глубина),
+а не O(число ридов).
+
+Результат — отрезки в стиле bedGraph (0-based, полуинтервал):
+
+    for run in coverage_runs(SamReader("a.sam")):
+        print(run.chrom, run.start, run.end, run.depth)
+
+    arrays = depth(SamReader("a.sam"))      # {chrom: int32-массив глубины по позициям}
+    depth(SamReader("a.sam.gz"), processes=4)   # хромосомы — по процессам
+
+По умолчанию, как у ``samtools depth``, не учитываются невыровненные,
+вторичные, не прошедшие QC и дубликаты (флаг 0x704), D и N не дают покрытия.
+"""
+
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heappop, heappush
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+import math
+import os
+
+import numpy as np
+
+from .cigar import aligned_blocks
+from .tabix import iter_chunk_lines
+
+DEFAULT_EXCLUDE_FLAGS = 0x4 | 0x100 | 0x200 | 0x400  # unmapped, secondary, QC fail, duplicate
+
+Alignment = Tuple[str, int, str]  # (chrom, начало 0-based, cigar)
+
+
+class CoverageRun(NamedTuple):
+    """Отрезок постоянной глубины (bedGraph: 0-based, полуинтервал)."""
+
+    chrom: str
+    start: int
+    end: int
+    depth: int
+
+
+# ---------- заметающая прямая ----------
+def iter_runs(
+    alignments: Iterable[Alignment],
+    *,
+    deletions: bool = False,
+    zeros: bool = False,
+    lengths: Optional[Dict[str, Optional[int]]] = None,
+) -> Iterator[CoverageRun]:
+    """
+    Отрезки глубины по отсортированным (chrom, начало, cigar).
+
+    zeros=True — выдавать и отрезки нулевой глубины (с начала хромосомы и,
+    если известна длина из ``lengths``, до её конца); хромосомы без
+    выравниваний не выдаются.
+    Неотсортированный вход -> ValueError.
+    """
+    lengths = lengths or {}
+    inf = math.inf
+    out: List[CoverageRun] = []
+    seen = set()
+    chrom: Optional[str] = None
+    starts: List[Tuple[int, int]] = []
+    ends: List[int] = []
+    x = 0
+    last_beg = -1
+    pending: Optional[List] = None  # [start, end, depth] — склейка соседних отрезков
+
+    def emit(s: int, e: int, d: int) -> None:
+        nonlocal pending
+        if pending is not None and pending[2] == d and pending[1] == s:
+            pending[1] = e
+            return
+        if pending is not None and (pending[2] or zeros):
+            out.append(CoverageRun(chrom, pending[0], pending[1], pending[2]))  # type: ignore[arg-type]
+        pending = [s, e, d]
+
+    def advance(limit: float) -> None:
+        """Выдать глубину на [x, limit) и сдвинуть x."""
+        nonlocal x
+        while True:
+            nxt = min(starts[0][0] if starts else inf, ends[0] if ends else inf)
+            if nxt >= limit:
+                if limit != inf and limit > x:
+                    emit(x, int(limit), len(ends))
+                    x = int(limit)
+                return
+            if nxt > x:
+                emit(x, int(nxt), len(ends))
+                x = int(nxt)
+            while ends and ends[0] == x:
+                heappop(ends)
+            while starts and starts[0][0] == x:
+                heappush(ends, heappop(starts)[1])
+
+    def finish_chrom() -> None:
+        nonlocal pending
+        advance(inf)
+        length = lengths.get(chrom) if chrom is not None else None
+        if zeros and length and length > x:
+            emit(x, length, 0)
+        if pending is not None and (pending[2] or zeros):
+            out.append(CoverageRun(chrom, pending[0], pending[1], pending[2]))  # type: ignore[arg-type]
+        pending = None
+
+    for name, beg, cigar in alignments:
+        if name != chrom:
+            if chrom is not None:
+                finish_chrom()
+                yield from out
+                out.clear()
+            if name in seen:
+                raise ValueError(f"Alignments are not sorted: {name!r} appears in several blocks")
+            seen.add(name)
+            chrom, x, last_beg = name, 0, -1
+        if beg < last_beg:
+            raise ValueError(f"Alignments are not sorted: {name}:{beg + 1} after {name}:{last_beg + 1}")
+        last_beg = beg
+        advance(beg)
+        for b, e in aligned_blocks(cigar, deletions):
+            heappush(starts, (beg + b, beg + e))
+        if out:
+            yield from out
+            out.clear()
+
+    if chrom is not None:
+        finish_chrom()
+        yield from out
+
+
+# ---------- источник выравниваний ----------
+def _alignments(
+    reader, chrom: Optional[str], min_mapq: int, exclude_flags: int
+) -> Iterator[Alignment]:
+    """(chrom, начало 0-based, cigar) из SAM-строк с фильтрами по флагу и MAPQ."""
+    if chrom is not None and reader.index is not None:
+        chunks = reader.index.query(chrom, 0, 1 << 29)
+
+        def lines() -> Iterator[str]:
+            with reader._session():
+                for line in iter_chunk_lines(reader._fh, chunks):
+                    yield line.strip()
+
+        source: Iterable[str] = lines()
+    else:
+        source = reader._iter_body(lambda line: line)
+
+    for line in source:
+        if not line or line.startswith("@"):
+            continue
+        f = line.split("\t", 6)
+        if len(f) < 6 or f[2] == "*" or f[5] == "*":
+            continue
+        if chrom is not None and f[2] != chrom:
+            continue
+        if int(f[1]) & exclude_flags or int(f[4]) < min_mapq:
+            continue
+        yield f[2], int(f[3]) - 1, f[5]
+
+
+def _chromosomes(reader) -> List[str]:
+    names = list(reader.header.references)
+    return names or reader.get_chromosomes()
+
+
+def coverage_runs(
+    reader,
+    chrom: Optional[str] = None,
+    *,
+    min_mapq: int = 0,
+    exclude_flags: int = DEFAULT_EXCLUDE_FLAGS,
+    deletions: bool = False,
+    zeros: bool = False,
+    processes: int = 1,
+) -> Iterator[CoverageRun]:
+    """
+    Отрезки глубины по SamReader (файл отсортирован по координате).
+
+    chrom     — только эта хромосома (с tabix-индексом читаются только её блоки);
+    processes — N > 1: хромосомы считаются в пуле процессов и выдаются
+                в порядке заголовка (@SQ). С tabix-индексом каждый процесс
+                читает только свою хромосому, без него — весь файл.
+    """
+    lengths = reader.header.references
+    if processes > 1 and chrom is None:
+        chroms = _chromosomes(reader)
+        opts = (min_mapq, exclude_flags, deletions, zeros)
+        with ProcessPoolExecutor(max_workers=min(processes, max(1, len(chroms)))) as pool:
+            futures = [pool.submit(_chrom_runs, reader, c, opts) for c in chroms]
+            for c, fut in zip(chroms, futures):
+                starts, ends, depths = fut.result()
+                for s, e, d in zip(starts.tolist(), ends.tolist(), depths.tolist()):
+                    yield CoverageRun(c, s, e, d)
+        return
+    yield from iter_runs(
+        _alignments(reader, chrom, min_mapq, exclude_flags),
+        deletions=deletions,
+        zeros=zeros,
+        lengths=lengths,
+    )
+
+
+def _chrom_runs(reader, chrom: str, opts: Tuple[int, int, bool, bool]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Отрезки одной хромосомы (выполняется в воркере): компактные массивы вместо кортежей."""
+    min_mapq, exclude_flags, deletions, zeros = opts
+    runs = list(
+        coverage_runs(reader, chrom, min_mapq=min_mapq, exclude_flags=exclude_flags, deletions=deletions, zeros=zeros)
+    )
+    return (
+        np.array([r.start for r in runs], dtype=np.int64),
+        np.array([r.end for r in runs], dtype=np.int64),
+        np.array([r.depth for r in runs], dtype=np.int32),
+    )
+
+
+def depth(reader, chrom: Optional[str] = None, **kwargs) -> Dict[str, np.ndarray]:
+    """
+    Глубина по позициям: {chrom: int32-массив}, индекс — 0-based позиция.
+    Длина массива — LN из @SQ (иначе — до конца последнего выравнивания).
+    Параметры — как у coverage_runs().
+    """
+    kwargs["zeros"] = False
+    lengths = reader.header.references
+    runs: Dict[str, List[CoverageRun]] = {}
+    for run in coverage_runs(reader, chrom, **kwargs):
+        runs.setdefault(run.chrom, []).append(run)
+    out: Dict[str, np.ndarray] = {}
+    for name, length in lengths.items():
+        if length and (chrom is None or chrom == name) and name not in runs:
+            out[name] = np.zeros(length, dtype=np.int32)  # хромосома без покрытия
+    for name, items in runs.items():
+        starts = np.array([r.start for r in items], dtype=np.int64)
+        ends = np.array([r.end for r in items], dtype=np.int64)
+        depths = np.array([r.depth for r in items], dtype=np.int32)
+        size = max(lengths.get(name) or 0, int(ends.max()))
+        delta = np.zeros(size + 1, dtype=np.int32)
+        np.add.at(delta, starts, depths)
+        np.add.at(delta, ends, -depths)
+        out[name] = np.cumsum(delta[:-1], dtype=np.int32)
+    return out
+
+
+def write_bedgraph(runs: Iterable[CoverageRun], path: Union[str, os.PathLike]) -> int:
+    """Записать отрезки в bedGraph; возвращает число строк."""
+    n = 0
+    with open(path, "w", encoding="utf-8") as fh:
+        for run in runs:
+            fh.write(f"{run.chrom}\t{run.start}\t{run.end}\t{run.depth}\n")
+            n += 1
+    return n
@@ -0,0 +1,192 @@
+# src/bioformats/fai.py
+"""
+FAI-индекс для FASTA (совместим с ``samtools faidx``).
+
+Каждая строка sidecar-файла ``<fasta>.fai`` описывает одну последовательность:
+
+    NAME  LENGTH  OFFSET  LINEBASES  LINEWIDTH
+
+- LENGTH    — длина последовательности (нуклеотиды)
+- OFFSET    — байтовое смещение первого нуклеотида в файле
+- LINEBASES — нуклеотидов в одной строке
+- LINEWIDTH — байт в одной строке (с учётом '\\n' или '\\r\\n')
+
+Зная эти числа, позицию любого нуклеотида можно вычислить арифметически
+и читать только нужные байты (seek + read), не разбирая весь файл.
+"""
+
+from __future__ import annotations
+from typing import Dict, Iterator, NamedTuple, Optional
+import os
+
+from .bgzf import BgzfReader, is_bgzf
+
+
+class FaiRecord(NamedTuple):
+    """Одна запись FAI-индекса."""
+
+    name: str
+    length: int
+    offset: int
+    line_bases: int
+    line_width: int
+
+    def byte_offset(self, pos: int) -> int:
+        """Байтовое смещение нуклеотида ``pos`` (0-based) внутри файла."""
+        if self.line_bases == 0:
+            return self.offset
+        line, col = divmod(pos, self.line_bases)
+        return self.offset + line * self.line_width + col
+
+    def span_chars(self, start: int, end: int) -> int:
+        """
+        Сколько символов (в текстовом режиме) нужно прочитать от ``start``,
+        чтобы получить нуклеотиды [start, end): сами нуклеотиды плюс
+        переводы строк между ними (после universal newlines — по одному символу).
+        """
+        if end <= start or self.line_bases == 0:
+            return 0
+        breaks = (end - 1) // self.line_bases - start // self.line_bases
+        return (end - start) + breaks
+
+
+def fai_path(filename: str) -> str:
+    """Путь к sidecar-индексу для FASTA-файла."""
+    return filename + ".fai"
+
+
+class FastaIndex:
+    """
+    Индекс FASTA: отображение seq_id -> FaiRecord (порядок как в файле).
+
+    Построение:
+        idx = FastaIndex.build("ref.fa")
+        idx.save("ref.fa.fai")
+
+    Загрузка:
+        idx = FastaIndex.load("ref.fa.fai")
+    """
+
+    def __init__(self, records: Optional[Dict[str, FaiRecord]] = None) -> None:
+        self._records: Dict[str, FaiRecord] = dict(records or {})
+
+    # ---------- dict-like API ----------
+    def __contains__(self, name: object) -> bool:
+        return name in self._records
+
+    def __getitem__(self, name: str) -> FaiRecord:
+        return self._records[name]
+
+    def __iter__(self) -> Iterator[FaiRecord]:
+        return iter(self._records.values())
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @property
+    def names(self) -> list[str]:
+        """Идентификаторы последовательностей в порядке следования в файле."""
+        return list(self._records)
+
+    # ---------- построение ----------
+    @classmethod
+    def build(cls, filename: str) -> "FastaIndex":
+        """
+        Построить индекс одним проходом по FASTA (в байтах).
+        Для BGZF смещения считаются в распакованном потоке (как у samtools;
+        перевод в виртуальные смещения — через ``.gzi``).
+
+        Как и samtools, требует одинаковой длины всех строк внутри записи
+        (кроме последней) — иначе арифметика смещений невозможна.
+        """
+        records: Dict[str, FaiRecord] = {}
+
+        name: Optional[str] = None
+        length = offset = line_bases = line_width = 0
+        short_line_seen = False  # встречена «последняя» (короткая) строка записи
+
+        def flush() -> None:
+            if name is None:
+                return
+            if name in records:
+                raise ValueError(f"Duplicate sequence name {name!r} in {filename}")
+            records[name] = FaiRecord(name, length, offset, line_bases, line_width)
+
+        pos = 0
+        with (BgzfReader(filename) if is_bgzf(filename) else open(filename, "rb")) as fh:
+            for raw in fh:
+                line_start = pos
+                pos += len(raw)
+
+                if raw.startswith(b">"):
+                    flush()
+                    header = raw[1:].decode("utf-8").split()
+                    name = header[0] if header else ""
+                    length = line_bases = line_width = 0
+                    offset = pos
+                    short_line_seen = False
+                    continue
+
+                if name is None:
+                    if raw.strip():
+                        raise ValueError(f"Sequence data before first header in {filename}")
+                    continue
+
+                bases = len(raw.rstrip(b"\r\n"))
+                if bases == 0:
+                    # пустые строки допустимы только в конце записи
+                    short_line_seen = True
+                    continue
+
+                if short_line_seen:
+                    raise ValueError(
+                        f"Different line length in sequence {name!r} "
+                        f"(byte {line_start} of {filename})"
+                    )
+                if line_bases == 0:
+                    line_bases, line_width = bases, len(raw)
+                elif bases > line_bases:
+                    raise ValueError(
+                        f"Different line length in sequence {name!r} "
+                        f"(byte {line_start} of {filename})"
+                    )
+                elif bases < line_bases or len(raw) != line_width:
+                    # короткая строка (или строка без '\n' в конце файла) — последняя в записи
+                    short_line_seen = True
+                length += bases
+        flush()
+        return cls(records)
+
+    # ---------- (де)сериализация ----------
+    @classmethod
+    def load(cls, path: str) -> "FastaIndex":
+        """Прочитать ``.fai``-файл."""
+        records: Dict[str, FaiRecord] = {}
+        with open(path, "r", encoding="utf-8") as fh:
+            for line in fh:
+                line = line.rstrip("\r\n")
+                if not line:
+                    continue
+                fields = line.split("\t")
+                if len(fields) < 5:
+                    raise ValueError(f"Malformed FAI line in {path}: {line!r}")
+                name = fields[0]
+                records[name] = FaiRecord(name, *(int(x) for x in fields[1:5]))
+        return cls(records)
+
+    def save(self, path: str) -> None:
+        """Записать индекс в формате ``.fai``."""
+        with open(path, "w", encoding="utf-8", newline="\n") as fh:
+            for rec in self._records.values():
+                fh.write(
+                    f"{rec.name}\t{rec.length}\t{rec.offset}\t{rec.line_bases}\t{rec.line_width}\n"
+                )
+
+    @staticmethod
+    def is_fresh(filename: str, path: Optional[str] = None) -> bool:
+        """Есть ли индекс и не старше ли он самого FASTA-файла."""
+        path = path or fai_path(filename)
+        try:
+            return os.path.getmtime(path) >= os.path.getmtime(filename)
+        except OSError:
+            return False
@@ -8,14 +8,68 @@ FASTA ридер.
 - average_length()
 
 реализована в базовом SequenceReader.
+
+Произвольный доступ — через FAI-индекс (``<fasta>.fai``, см. fai.py):
+- build_index()            — построить (и сохранить) индекс
+- get_sequence(seq_id)     — seek сразу к записи, без разбора файла
+- fetch(seq_id, start, end) — прочитать только байты подпоследовательности
+
+FastaReader(..., mmap=True) — файл отображается в память, read()/fetch()
+возвращают SequenceView (см. seqview.py) вместо склеенных строк.
 """
 
-from typing import Iterator
+from __future__ import annotations
+from typing import Iterable, Iterator, Optional, Union
 from .sequences import SequenceReader, SequencePair
+from .fai import FastaIndex, fai_path
+from .bgzf import GzipIndex
+from .seqview import SequenceView
+from .metacache import MetadataCache
 
 
 class FastaReader(SequenceReader):
-    """Класс для работы с FASTA файлами."""
+    """
+    Класс для работы с FASTA файлами.
+
+    mmap=True (только несжатые файлы) — последовательности отдаются как
+    SequenceView поверх отображения файла: len() и срезы без склейки строк,
+    байты общие для всех процессов через page cache.
+    """
+
+    _chunk_kind = "fasta"
+    _default_validation = "fast"  # как и раньше: записи не по алфавиту пропускаются
+
+    def __init__(
+        self,
+        filename: str,
+        *,
+        alphabet: str = "ACGTNacgtn",
+        encoding: str = "utf-8",
+        gz: Optional[bool] = None,
+        binary: bool = False,
+        mmap: bool = False,
+        cache: Optional[MetadataCache] = None,
+        threads: int = 1,
+        packed: Optional[int] = None,
+        validate: Optional[str] = None,
+    ) -> None:
+        super().__init__(
+            filename,
+            alphabet=alphabet,
+            encoding=encoding,
+            gz=gz,
+            binary=binary,
+            cache=cache,
+            threads=threads,
+            packed=packed,
+            validate=validate,
+        )
+        if mmap and self._is_gz:
+            raise ValueError(f"mmap=True requires an uncompressed FASTA: {filename}")
+        self.mmap = mmap
+        self._index: Optional[FastaIndex] = None
+        self._gzi: Optional[GzipIndex] = None  # только для BGZF: несжатые смещения -> виртуальные
+        self._index_checked = False  # sidecar уже искали (чтобы не дёргать ФС на каждый запрос)
 
     def read(self) -> Iterator[SequencePair]:
         """
@@ -25,30 +79,156 @@ class FastaReader(SequenceReader):
             >seq_id [опциональное описание]
             ACGT...
             ACGT...
+
+        При mmap=True sequence — SequenceView (записи берутся из FAI-индекса),
+        при packed=2/4 — PackedSequence.
         """
+        self._reset_validation()
+        if self.mmap:
+            yield from self._pack_pairs(self._read_mapped())
+            return
         with self:
-            current_header = None
-            current_seq_parts: list[str] = []
-
-            for line in self.iter_lines(strip=True):
-                if not line:
-                    continue
-
-                if line.startswith(">"):
-                    # если была предыдущая последовательность — отдаём её
-                    if current_header is not None and current_seq_parts:
-                        sequence = "".join(current_seq_parts)
-                        if self.validate_sequence(sequence):
-                            yield current_header, sequence
-
-                    # начинаем новую
-                    current_header = line[1:].split()[0]  # только первый токен до пробела
-                    current_seq_parts = []
-                else:
-                    current_seq_parts.append(line)
-
-            # последняя последовательность
-            if current_header is not None and current_seq_parts:
-                sequence = "".join(current_seq_parts)
-                if self.validate_sequence(sequence):
-                    yield current_header, sequence
+            yield from self._pack_pairs(self._parse_lines(self.iter_lines(strip=True)))
+
+    def _read_mapped(self) -> Iterator[tuple[str, SequenceView]]:
+        idx = self.index if self.index is not None else self.build_index(save=False)
+        for rec in idx:
+            view = SequenceView.open(self.filename, rec)
+            # как и read(): пустые записи пропускаются, валидация — по алфавиту
+            # (окнами по отображению; отчёт строится, только если запись не прошла)
+            if not len(view):
+                continue
+            if self.validate == "off" or view.validate(self._alphabet_bytes) or self._accept(rec.name, view):
+                yield rec.name, view
+
+    def _parse_lines(self, lines: Iterable[str]) -> Iterator[SequencePair]:
+        """
+        Собрать записи из потока строк (без '\\n'); общий код для read() и
+        параллельного режима. Строки — str или bytes (binary=True).
+        """
+        gt, empty = (b">", b"") if self.binary else (">", "")
+        current_header = None
+        current_seq_parts: list = []
+
+        for line in lines:
+            if not line:
+                continue
+
+            if line.startswith(gt):
+                # если была предыдущая последовательность — отдаём её
+                if current_header is not None and current_seq_parts:
+                    sequence = empty.join(current_seq_parts)
+                    if self._accept(current_header, sequence):
+                        yield current_header, sequence
+
+                # начинаем новую
+                current_header = line[1:].split()[0]  # только первый токен до пробела
+                if self.binary:
+                    current_header = current_header.decode(self.encoding)
+                current_seq_parts = []
+            else:
+                current_seq_parts.append(line)
+
+        # последняя последовательность
+        if current_header is not None and current_seq_parts:
+            sequence = empty.join(current_seq_parts)
+            if self._accept(current_header, sequence):
+                yield current_header, sequence
+
+    # ---------- FAI-индекс ----------
+    @property
+    def index(self) -> Optional[FastaIndex]:
+        """
+        FAI-индекс файла. Автоматически подгружается из ``<fasta>.fai``
+        (для BGZF — вместе с ``<fasta>.gzi``), если sidecar существует и
+        не старше самого FASTA. Иначе None.
+        """
+        if self._index is None and not self._index_checked:
+            self._index_checked = True
+            if self._is_gz and not self._is_bgzf:
+                return None
+            gzi = self.filename + ".gzi"
+            if FastaIndex.is_fresh(self.filename) and (
+                not self._is_bgzf or FastaIndex.is_fresh(self.filename, gzi)
+            ):
+                self._index = FastaIndex.load(fai_path(self.filename))
+                if self._is_bgzf:
+                    self._gzi = GzipIndex.load(gzi)
+        return self._index
+
+    def build_index(self, save: bool = True) -> FastaIndex:
+        """
+        Построить FAI-индекс одним проходом по файлу.
+        При ``save=True`` индекс записывается рядом с файлом (``<fasta>.fai``,
+        для BGZF ещё и ``<fasta>.gzi``).
+        Обычный gzip не поддерживается: в нём нет произвольного доступа.
+        """
+        if self._is_gz and not self._is_bgzf:
+            raise ValueError(f"FAI index requires an uncompressed or BGZF FASTA: {self.filename}")
+        self._index = FastaIndex.build(self.filename)
+        self._index_checked = True
+        if self._is_bgzf:
+            self._gzi = GzipIndex.build(self.filename)
+        if save:
+            self._index.save(fai_path(self.filename))
+            if self._gzi is not None:
+                self._gzi.save(self.filename + ".gzi")
+        return self._index
+
+    def get_sequence(self, seq_id: str) -> Union[str, bytes, SequenceView]:
+        """
+        Последовательность по идентификатору.
+        С индексом (или при mmap=True) — прямой доступ к записи,
+        без индекса — O(n) через read(). Тип результата — как у fetch().
+        Проверка алфавита (validate) — как в read(): в режиме "fast"
+        некорректная запись не находится (KeyError), в "strict" —
+        InvalidSequenceError.
+        """
+        if self.index is None and not self.mmap:
+            return super().get_sequence(seq_id)
+        sequence = self.fetch(seq_id)
+        if not self._accept(seq_id, sequence):
+            raise KeyError(f"Sequence {seq_id!r} not found in {self.filename}")
+        return sequence
+
+    def fetch(
+        self, seq_id: str, start: Optional[int] = None, end: Optional[int] = None
+    ) -> Union[str, bytes, SequenceView]:
+        """
+        Подпоследовательность ``seq_id[start:end]`` (0-based, полуинтервал,
+        как срез в Python). Читаются только байты нужного диапазона.
+
+        Тип результата зависит от режима ридера:
+          - по умолчанию — str;
+          - binary=True  — bytes;
+          - mmap=True    — SequenceView (без чтения файла до материализации).
+
+        Если индекса нет, он строится в памяти (без записи sidecar-файла).
+        """
+        idx = self.index if self.index is not None else self.build_index(save=False)
+        if seq_id not in idx:
+            raise KeyError(f"Sequence {seq_id!r} not found in {self.filename}")
+        rec = idx[seq_id]
+
+        start, end, _ = slice(start, end).indices(rec.length)
+        if self.mmap:
+            return SequenceView.open(self.filename, rec, start, max(start, end))
+        if end <= start:
+            return b"" if self.binary else ""
+
+        offset = rec.byte_offset(start)
+        if self._gzi is not None or self.binary:
+            # BGZF и байтовый режим читают байты: считаем длину диапазона в байтах
+            nread = rec.byte_offset(end - 1) + 1 - offset
+            if self._gzi is not None:
+                offset = self._gzi.to_virtual(offset)
+        else:
+            nread = rec.span_chars(start, end)
+
+        with self._session():
+            self.seek(offset)
+            assert self._fh is not None
+            chunk = self._fh.read(nread)
+        if self.binary:
+            return chunk.replace(b"\n", b"").replace(b"\r", b"")
+        return chunk.replace("\n", "").replace("\r", "")
@@ -1,8 +1,14 @@
 # fastq.py
 from __future__ import annotations
-from typing import Iterator, Tuple, Optional
+from typing import Iterable, Iterator, Tuple, Optional
+from itertools import islice, zip_longest
+
+import numpy as np
 
 from .sequences import SequenceReader
+from .qc import decode_qualities
+from .trim import FastqBatch
+from .metacache import MetadataCache
 
 SequencePair = Tuple[str, str]  # (seq_id, sequence)
 
@@ -16,8 +22,13 @@ class FastqReader(SequenceReader):
     - read() -> (seq_id, sequence)    — ленивое чтение для статистики
     - _iter_fastq_triplets()          — внутренний генератор (id, seq, qual)
       для построения графиков качества в CLI.
+    - read_batches(n)                 — FastqBatch по n ридов (для trim).
+    - get_quality_scores(seq_id)      — Phred-массив (NumPy) одного рида;
+      кодировка задаётся phred_offset (33 или 64).
     """
 
+    _chunk_kind = "fastq"
+
     def __init__(
         self,
         filename: str,
@@ -25,14 +36,69 @@ class FastqReader(SequenceReader):
         alphabet: str = "ACGTNacgtn",
         encoding: str = "utf-8",
         gz: Optional[bool] = None,
+        phred_offset: int = 33,
+        binary: bool = False,
+        cache: Optional[MetadataCache] = None,
+        threads: int = 1,
+        packed: Optional[int] = None,
+        validate: Optional[str] = None,
     ) -> None:
-        super().__init__(filename, alphabet=alphabet, encoding=encoding, gz=gz)
+        super().__init__(
+            filename,
+            alphabet=alphabet,
+            encoding=encoding,
+            gz=gz,
+            binary=binary,
+            cache=cache,
+            threads=threads,
+            packed=packed,
+            validate=validate,
+        )
+        self.phred_offset = phred_offset
 
     # ---------- публичный API ----------
     def read(self) -> Iterator[SequencePair]:
-        """Ленивое чтение FASTQ файла с возвратом (seq_id, sequence)."""
-        for sid, seq, _qual in self._iter_fastq_triplets():
-            yield sid, seq
+        """
+        Ленивое чтение FASTQ файла с возвратом (seq_id, sequence); packed=2/4 —
+        PackedSequence. По умолчанию риды не проверяются (validate="off").
+        """
+        self._reset_validation()
+        pairs = ((sid, seq) for sid, seq, _qual in self._iter_fastq_triplets())
+        if self.validate != "off":
+            pairs = (pair for pair in pairs if self._accept(*pair))
+        yield from self._pack_pairs(pairs)
+
+    def read_records(self) -> Iterator[Tuple[str, str, str]]:
+        """Ленивое чтение полных записей (seq_id, sequence, quality) — например, для FastqWriter."""
+        yield from self._iter_fastq_triplets()
+
+    def read_batches(self, batch_size: int = 10000) -> Iterator[FastqBatch]:
+        """Полные записи батчами FastqBatch; качества декодируются один раз на батч."""
+        it = self._iter_fastq_triplets()
+        while True:
+            batch = FastqBatch.from_records(islice(it, batch_size), self.phred_offset)
+            if not len(batch):
+                return
+            yield batch
+
+    def get_quality_scores(self, seq_id: str) -> np.ndarray:
+        """Phred-качества рида ``seq_id`` (uint8-массив); KeyError, если рида нет."""
+        with self:
+            for sid, _seq, qual in self._iter_fastq_triplets():
+                if sid == seq_id:
+                    return decode_qualities(qual, self.phred_offset)
+        raise KeyError(f"Read {seq_id!r} not found in {self.filename}")
+
+    def get_average_quality(self, seq_id: str) -> float:
+        """Среднее качество рида ``seq_id`` (0.0 для пустого рида)."""
+        q = self.get_quality_scores(seq_id)
+        return float(q.mean()) if q.size else 0.0
+
+    def _parse_lines(self, lines: Iterable[str]) -> Iterator[SequencePair]:
+        """(seq_id, sequence) из потока строк — для параллельного режима (с проверкой validate, как read())."""
+        for sid, seq, _qual in self._parse_triplets(lines):
+            if self._accept(sid, seq):
+                yield sid, seq
 
     # ---------- внутренняя логика ----------
     def _iter_fastq_triplets(self) -> Iterator[Tuple[str, str, str]]:
@@ -46,24 +112,31 @@ class FastqReader(SequenceReader):
           <QUAL>
         """
         self.open()
-        lines_buffer: list[str] = []
+        return self._parse_triplets(self.iter_lines(strip=True))
 
-        for line in self.iter_lines(strip=True):
-            if not line:
-                continue
-            lines_buffer.append(line)
-            if len(lines_buffer) < 4:
-                continue
+    @staticmethod
+    def _parse_triplets(lines: Iterable[str]) -> Iterator[Tuple[str, str, str]]:
+        """
+        Разбор 4-строчных записей из потока строк (без '\\n').
+        Строки — str или bytes (binary=True): seq/qual остаются bytes, id — str.
+        """
+        it = filter(None, lines)  # пустые строки пропускаются
+        binary, at, plus = False, None, None
 
-            header_line, sequence_line, plus_line, quality_line = lines_buffer
-            lines_buffer = []  # под следующую запись
+        for header_line, sequence_line, plus_line, quality_line in zip_longest(it, it, it, it):
+            if quality_line is None:
+                raise ValueError("Truncated FASTQ record at EOF (incomplete 4-line block).")
 
-            if not header_line.startswith("@"):
+            if at is None:
+                binary = isinstance(header_line, bytes)
+                at, plus = (b"@", b"+") if binary else ("@", "+")
+
+            if not header_line.startswith(at):
                 raise ValueError(
                     f"Invalid FASTQ header: expected '@', got {header_line!r}"
                 )
 
-            if not plus_line.startswith("+"):
+            if not plus_line.startswith(plus):
                 raise ValueError(
                     f"Invalid FASTQ plus-line: expected '+', got {plus_line!r}"
                 )
@@ -75,7 +148,6 @@ class FastqReader(SequenceReader):
                 )
 
             seq_id = header_line[1:].strip()
+            if binary:
+                seq_id = seq_id.decode("utf-8")
             yield seq_id, sequence_line, quality_line
-
-        if lines_buffer:
-            raise ValueError("Truncated FASTQ record at EOF (incomplete 4-line block).")
@@ -1,10 +1,17 @@
 # src/bioformats/genomic.py
 from __future__ import annotations
-from typing import Iterator, Dict, Any, Optional
+from typing import Iterator, Iterable, Dict, Any, Optional, Tuple, Union, List, Callable, Mapping
 from abc import ABC, abstractmethod
+import os
 import pandas as pd
 
 from .reader import Reader
+from .tabix import TabixIndex, iter_chunk_lines, merge_chunks, tbi_path
+from .regions import Region, RegionSet, read_bed
+from .batch import ColumnSpec, RecordBatch, batches_to_pandas, iter_batches, resolve_schema, write_parquet
+from .records import FieldSpec, make_lazy, make_projection
+from .stats import AggregatorLike, Stats, StatsCache
+from .metacache import MetadataCache
 
 class GenomicDataReader(Reader, ABC):
     """
@@ -12,26 +19,63 @@ class GenomicDataReader(Reader, ABC):
     Наследники должны реализовать read() и get_header().
     Общие методы count(), get_chromosomes(), filter_by_region()
     работают полиморфно для всех потомков.
+
+    Для отсортированных BGZF-файлов build_index() строит tabix-индекс
+    (``<file>.tbi``); filter_by_region() подхватывает его автоматически
+    и читает только блоки, пересекающие регион.
+
+    count(), get_chromosomes() и validate_coordinate() берут данные из
+    одного прохода stats(), закэшированного до изменения файла; разобранный
+    заголовок (header, см. header.py) кэшируется так же, и read() начинает
+    сразу с конца заголовка. cache — персистентный кэш метаданных
+    (см. metacache.py), по умолчанию общий, если включён.
     """
 
+    # пресет tabix (переопределяется в наследниках): формат, колонки
+    # (seq, beg, end; 1-based, 0 — конец вычисляется), символ строк заголовка
+    _tabix_format = 0
+    _tabix_columns: Tuple[int, int, int] = (1, 2, 0)
+    _meta_char = "#"
+    # колоночная схема для read_batches(): имя -> (индекс поля, тип); см. batch.py
+    _batch_schema: Dict[str, ColumnSpec] = {}
+    _min_fields = 1
+    # поля записи для read(fields=..., lazy=...): имя -> (индекс колонки, декодер)
+    _fields: Dict[str, FieldSpec] = {}
+    # граница записи для параллельного разбора (см. parallel.py): каждая строка
+    _chunk_kind = "line"
+    # метрики, которые stats() считает «впрок» при любом проходе
+    _default_stats = ("count", "chrom_counts")
+    # модель заголовка: класс(lines, end_offset) (см. header.py)
+    _header_class: Callable[[List[str], int], Any] = None  # type: ignore[assignment]
+
     def __init__(
         self,
         filename: str,
         *,
         encoding: str = "utf-8",
         gz: Optional[bool] = None,
+        cache: Optional[MetadataCache] = None,
+        threads: int = 1,
     ) -> None:
-        super().__init__(filename, encoding=encoding, gz=gz)
+        super().__init__(filename, encoding=encoding, gz=gz, threads=threads)
         # буфер для хранения заголовка (если нужно)
         self._header: list[str] = []
+        self._index: Optional[TabixIndex] = None
+        self._index_checked = False
+        self._stats = StatsCache(cache)
 
     # ----- обязательные абстрактные методы -----
     @abstractmethod
-    def read(self) -> Iterator[Dict[str, Any]]:
+    def read(
+        self, fields: Optional[List[str]] = None, lazy: bool = False
+    ) -> Iterator[Dict[str, Any]]:
         """
         Ленивый генератор записей.
         Для SAM — словари с полями alignment.
         Для VCF — словари с variant information.
+
+        fields — вернуть только эти поля (строка режется до последнего из них);
+        lazy   — отдавать LazyRecord, декодирующий поля при обращении.
         """
         ...
 
@@ -40,49 +84,348 @@ class GenomicDataReader(Reader, ABC):
         """Вернуть строки заголовка (например, начинающиеся с @ или #)."""
         ...
 
+    def _parse_line(self, line: str) -> Optional[Dict[str, Any]]:
+        """Разобрать одну строку данных в запись (используется индексными запросами)."""
+        raise NotImplementedError(f"{type(self).__name__} does not support per-line parsing")
+
+    def _parse_lines(
+        self,
+        lines: Iterable[str],
+        parse: Optional[Callable[[str], Optional[Mapping[str, Any]]]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Записи из потока строк: заголовок и пустые строки пропускаются."""
+        parse = parse or self._parse_line
+        meta = self._meta_char
+        for line in lines:
+            if not line or line.startswith(meta):
+                continue
+            rec = parse(line)
+            if rec is not None:
+                yield rec  # type: ignore[misc]
+
+    def _parse_body(
+        self,
+        lines: Iterable[str],
+        parse: Optional[Callable[[str], Optional[Mapping[str, Any]]]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Записи из строк после заголовка: пропускаются только пустые строки."""
+        parse = parse or self._parse_line
+        for line in lines:
+            if line:
+                rec = parse(line)
+                if rec is not None:
+                    yield rec  # type: ignore[misc]
+
+    def _iter_body(self, parse: Optional[Callable[[str], Optional[Mapping[str, Any]]]] = None) -> Iterator[Dict[str, Any]]:
+        """Записи файла от конца заголовка (заголовок читается и кэшируется один раз)."""
+        start = self.header.end_offset
+        with self:
+            self.seek(start)
+            yield from self._parse_body(self.iter_lines(strip=True), parse)
+
+    # ----- заголовок -----
+    @property
+    def header(self) -> Any:
+        """
+        Разобранный заголовок (VcfHeader / SamHeader). Читается лениво одним
+        ограниченным чтением до первой строки данных и кэшируется до
+        изменения файла.
+        """
+        return self._stats.value(self, "header_model", self._read_header_model)
+
+    def _read_header_model(self) -> Any:
+        lines: List[str] = []
+        with self._session():
+            fh = self._fh
+            assert fh is not None
+            fh.seek(0)
+            self._peek_buf = None
+            while True:
+                end = fh.tell()
+                line = fh.readline()
+                if not line or not line.startswith(self._meta_char):
+                    break
+                lines.append(line.rstrip("\r\n"))
+            if not line:
+                end = fh.tell()
+        return self._header_class(lines, end)
+
+    def _record_parser(
+        self,
+        fields: Optional[List[str]] = None,
+        lazy: bool = False,
+        schema: Optional[Dict[str, FieldSpec]] = None,
+    ) -> Callable[[str], Optional[Mapping[str, Any]]]:
+        """
+        Выбрать парсер строки под read(fields=..., lazy=...). Все варианты
+        отбрасывают строки короче ``_min_fields`` колонок, как _parse_line.
+        ``schema`` — схема полей вместо ``_fields`` (например, с другим декодером колонки).
+        """
+        if lazy:
+            return make_lazy(schema or self._fields, fields, self._min_fields)
+        if schema is None:
+            if fields is None:
+                return self._parse_line
+            return make_projection(self._fields, fields, self._min_fields)
+        return make_projection(schema, fields if fields is not None else list(schema), self._min_fields)
+
+    def _record_interval(self, fields: list[str]) -> Tuple[str, int, int]:
+        """(chrom, beg, end) записи — 0-based полуинтервал для индекса."""
+        col_seq, col_beg, col_end = self._tabix_columns
+        beg = int(fields[col_beg - 1]) - 1
+        end = int(fields[col_end - 1]) if col_end else beg + 1
+        return fields[col_seq - 1], beg, end
+
     # ----- общий API (работает у всех наследников) -----
+    def stats(self, *names: AggregatorLike) -> Dict[str, Any]:
+        """
+        Несколько метрик за один проход read() (см. stats.py); имена
+        кэшируются по размеру/mtime файла. Без аргументов — count и chrom_counts.
+        """
+        if any(not isinstance(n, str) for n in names):
+            return Stats(*names).run(self)
+        return self._stats.get(self, names or self._default_stats, extra=self._default_stats)
+
     def count(self) -> int:
         """Количество записей (без заголовков)."""
-        return sum(1 for _ in self.read())
+        return self.stats("count")["count"]
 
     def get_chromosomes(self) -> list[str]:
         """Список хромосом, найденных в данных (уникальные CHR)."""
-        chroms = set()
-        for rec in self.read():
-            chrom = rec.get("chrom") or rec.get("CHR")
-            if chrom:
-                chroms.add(chrom)
-        return sorted(chroms)
+        return sorted(self.stats("chrom_counts")["chrom_counts"])
 
     def get_reference_genome(self) -> Optional[str]:
         """Вернуть ссылку на референсный геном, если найдено в хедере."""
-        for line in self.get_header():
-            if "ref=" in line or "reference=" in line:
-                # пример: @SQ SN:chr1 LN:1000 ref=GRCh38
-                for token in line.split():
-                    if token.startswith(("ref=", "reference=")):
-                        return token.split("=", 1)[1]
-        return None
+        return self.header.reference
 
     def validate_coordinate(self, chrom: str, pos: int) -> bool:
         """Простейшая проверка, что позиция положительна и хромосома есть в наборе."""
-        return isinstance(pos, int) and pos > 0 and chrom in self.get_chromosomes()
-
-    def to_dataframe(self, limit: Optional[int] = None) -> pd.DataFrame:
-        """Преобразовать прочитанные записи в DataFrame (для статистики)."""
-        rows = []
-        for i, rec in enumerate(self.read()):
-            rows.append(rec)
-            if limit and i >= limit:
+        return isinstance(pos, int) and pos > 0 and chrom in self.stats("chrom_counts")["chrom_counts"]
+
+    def read_batches(
+        self,
+        batch_size: int = 65536,
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Dict[str, str]] = None,
+    ) -> Iterator[RecordBatch]:
+        """
+        Колоночное чтение: батчи по ``batch_size`` записей, без словаря на запись.
+
+        Колонки — NumPy-массивы (pos: int32, flag: uint16, ...), chrom —
+        категориальная (коды + словарь), строки — offsets + буфер байт.
+        ``columns`` ограничивает набор колонок (строка режется только до
+        последнего нужного поля); ``dtypes`` меняет типы колонок схемы,
+        например ``{"pos": "int64", "filter": "str"}``.
+        """
+        if not self._batch_schema:
+            raise NotImplementedError(f"{type(self).__name__} has no columnar schema")
+        start = self.header.end_offset
+        with self:
+            self.seek(start)
+            lines = (line for line in self.iter_lines(strip=True) if line)
+            yield from iter_batches(
+                lines,
+                resolve_schema(self._batch_schema, dtypes),
+                min_fields=self._min_fields,
+                batch_size=batch_size,
+                columns=columns,
+            )
+
+    def to_dataframe(
+        self,
+        limit: Optional[int] = None,
+        *,
+        chunksize: Optional[int] = None,
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Dict[str, str]] = None,
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+        """
+        Преобразовать записи в DataFrame (для статистики).
+        Строится напрямую из колоночных батчей, без промежуточных словарей:
+        chrom — category, pos — int32 (``dtypes={"pos": "int64"}`` — int64).
+        С ``chunksize`` (как в pandas.read_csv) — итератор DataFrame по
+        ``chunksize`` строк, см. iter_dataframes().
+        """
+        if chunksize is not None:
+            return self.iter_dataframes(chunksize, columns=columns, dtypes=dtypes)
+        batch_size = min(limit, 65536) if limit else 65536
+        batches = []
+        total = 0
+        for batch in self.read_batches(batch_size=batch_size, columns=columns, dtypes=dtypes):
+            batches.append(batch)
+            total += len(batch)
+            if limit and total >= limit:
                 break
-        return pd.DataFrame(rows)
+        return batches_to_pandas(batches, limit=limit)
+
+    def iter_dataframes(
+        self,
+        chunksize: int = 65536,
+        *,
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Dict[str, str]] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """DataFrame по ``chunksize`` записей — в памяти только текущий батч."""
+        for batch in self.read_batches(batch_size=chunksize, columns=columns, dtypes=dtypes):
+            yield batch.to_pandas()
+
+    def to_parquet(
+        self,
+        path: str,
+        *,
+        batch_size: int = 65536,
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Dict[str, str]] = None,
+        compression: str = "zstd",
+    ) -> int:
+        """
+        Экспорт в Parquet (нужен pyarrow): группа строк на батч, chrom —
+        словарная колонка. Возвращает число записанных строк.
+        """
+        return write_parquet(self.read_batches(batch_size, columns, dtypes), path, compression)
+
+    def _record_span(self, rec: Mapping[str, Any]) -> Tuple[int, int]:
+        """Координаты записи на референсе (1-based, включительно): по умолчанию — одна позиция."""
+        return rec["pos"], rec["pos"]
+
+    def _overlaps(self, rec: Mapping[str, Any], start: int, end: int) -> bool:
+        """Пересекает ли запись [start, end] (1-based) — по _record_span()."""
+        beg, last = self._record_span(rec)
+        return beg <= end and last >= start
 
     def filter_by_region(
-        self, chrom: str, start: int, end: int
+        self, chrom: str, start: int, end: int, lazy: bool = False
     ) -> Iterator[Dict[str, Any]]:
-        """Фильтрация по координатам (работает для любого формата с полями chrom, pos)."""
+        """
+        Фильтрация по координатам (работает для любого формата с полями chrom, pos).
+        Запись попадает в регион по _overlaps(): для SAM — пересечение
+        выравнивания (до конца по CIGAR), для VCF — позиция варианта.
+        При наличии tabix-индекса читаются только пересекающие регион блоки.
+        lazy=True — LazyRecord (с исходной строкой, например для записи писателем).
+        """
+        if self.index is not None:
+            yield from self._filter_indexed(chrom, start, end, lazy)
+            return
+        for rec in self.read(lazy=lazy):
+            c = rec.get("chrom") or rec.get("CHR")
+            p = rec.get("pos") or rec.get("POS")
+            if c == chrom and isinstance(p, int) and p <= end and self._overlaps(rec, start, end):
+                yield rec
+
+    def query_regions(
+        self, regions: Union[str, os.PathLike, Iterable[Tuple[str, int, int]]]
+    ) -> Iterator[Tuple[Dict[str, Any], List[Region]]]:
+        """
+        Пакетный запрос многих регионов за один проход.
+
+        regions — итерируемое (chrom, start, end) (1-based, включительно,
+        как в filter_by_region) или путь к BED-файлу. Регионы сортируются
+        и сливаются; каждая часть файла читается не более одного раза.
+
+        Выдаёт пары (запись, [регионы, которые она пересекает — как
+        _overlaps() в filter_by_region]) в порядке файла.
+        С tabix-индексом читаются только нужные блоки, без него — один
+        полный проход вместо прохода на каждый регион.
+        """
+        if isinstance(regions, (str, os.PathLike)):
+            regions = read_bed(regions)
+        rset = RegionSet(regions)
+        if not len(rset):
+            return
+
+        if self.index is not None:
+            index = self.index
+            chunks = merge_chunks(
+                c
+                for chrom in rset.chromosomes
+                for start, end in rset.intervals(chrom)
+                for c in index.query(chrom, start - 1, end)
+            )
+            with self._session():
+                assert self._fh is not None
+                for line in iter_chunk_lines(self._fh, chunks):  # type: ignore[arg-type]
+                    line = line.strip()
+                    if not line or line.startswith(self._meta_char):
+                        continue
+                    rec = self._parse_line(line)
+                    if rec is None:
+                        continue
+                    hits = rset.overlapping(rec["chrom"], *self._record_span(rec))
+                    if hits:
+                        yield rec, hits
+            return
+
         for rec in self.read():
             c = rec.get("chrom") or rec.get("CHR")
             p = rec.get("pos") or rec.get("POS")
-            if c == chrom and isinstance(p, int) and start <= p <= end:
-                yield rec
\ No newline at end of file
+            if c in rset and isinstance(p, int):
+                hits = rset.overlapping(c, *self._record_span(rec))
+                if hits:
+                    yield rec, hits
+
+    # ----- tabix-индекс -----
+    @property
+    def index(self) -> Optional[TabixIndex]:
+        """
+        Tabix-индекс файла. Подгружается из ``<file>.tbi``, если файл — BGZF,
+        а индекс существует и не старше файла. Иначе None.
+        """
+        if self._index is None and not self._index_checked:
+            self._index_checked = True
+            if self._is_bgzf and TabixIndex.is_fresh(self.filename):
+                self._index = TabixIndex.load(tbi_path(self.filename))
+        return self._index
+
+    def build_index(self, save: bool = True) -> TabixIndex:
+        """
+        Построить tabix-индекс одним проходом по файлу.
+        Файл должен быть сжат BGZF и отсортирован по (chrom, pos) —
+        иначе ValueError. При ``save=True`` индекс пишется в ``<file>.tbi``.
+        """
+        if not self._is_bgzf:
+            raise ValueError(f"Tabix index requires a BGZF-compressed file: {self.filename}")
+        self._index = TabixIndex.build(
+            self._iter_intervals(),
+            fmt=self._tabix_format,
+            columns=self._tabix_columns,
+            meta=self._meta_char,
+        )
+        self._index_checked = True
+        if save:
+            self._index.save(tbi_path(self.filename))
+        return self._index
+
+    def _iter_intervals(self) -> Iterator[Tuple[str, int, int, int, int]]:
+        """(chrom, beg, end, vbeg, vend) для каждой записи — сырьё для индекса."""
+        with self:
+            fh = self._fh
+            assert fh is not None
+            while True:
+                vbeg = fh.tell()
+                line = fh.readline()
+                if not line:
+                    break
+                if line.startswith(self._meta_char) or not line.strip():
+                    continue
+                fields = line.rstrip("\r\n").split("\t")
+                chrom, beg, end = self._record_interval(fields)
+                if chrom == "*":
+                    continue  # без координат (например, невыровненные риды)
+                yield chrom, beg, end, vbeg, fh.tell()
+
+    def _filter_indexed(self, chrom: str, start: int, end: int, lazy: bool = False) -> Iterator[Dict[str, Any]]:
+        """filter_by_region() через индекс: те же записи и в том же порядке, что и полный проход."""
+        assert self._index is not None
+        chunks = self._index.query(chrom, start - 1, end)
+        if not chunks:
+            return
+        parse = self._record_parser(lazy=lazy)
+        with self._session():
+            assert self._fh is not None
+            for line in iter_chunk_lines(self._fh, chunks):  # type: ignore[arg-type]
+                line = line.strip()
+                if not line or line.startswith(self._meta_char):
+                    continue
+                rec = parse(line)
+                if rec is not None and rec["chrom"] == chrom and self._overlaps(rec, start, end):
+                    yield rec  # type: ignore[misc]
@@ -0,0 +1,296 @@
+# src/bioformats/genotypes.py
+"""
+Типизированный INFO и генотипы VCF в NumPy.
+
+INFO: make_info_parser() строит декодер строки ``DP=10;AF=0.5,0.1;DB``
+в словарь по определениям ``##INFO`` заголовка (Type/Number):
+    {'DP': 10, 'AF': [0.5, 0.1], 'DB': True}
+
+Генотипы: iter_genotypes() собирает батчи GenotypeBatch:
+- gt      — int8 (варианты × сэмплы × плоидность): индексы аллелей,
+            -1 — пропуск ('.'), -2 — аллеля нет (гаплоидный вызов в
+            диплоидной матрице);
+- phased  — bool (варианты × сэмплы);
+- fields  — FORMAT-поля по выбору: Integer -> int32 (пропуск -1),
+            Float -> float32 (NaN), прочие -> object-массив строк.
+
+Декодируются только выбранные сэмплы и поля: строка режется не дальше
+последней нужной колонки, а одинаковые значения (``0/1``, ``./.``, ``35``)
+разбираются один раз — через таблицу уникальных значений батча.
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from operator import itemgetter
+import numpy as np
+
+from .header import FieldDef
+
+MISSING_ALLELE = -1
+ABSENT_ALLELE = -2
+MISSING_INT = -1
+
+_SCALAR = {"Integer": int, "Float": float}
+
+
+def _converter(fd: Optional[FieldDef]) -> Callable[[str], Any]:
+    """Функция значения одного INFO-поля (с учётом Number)."""
+    if fd is None:
+        return lambda v: v
+    conv = _SCALAR.get(fd.type, str)
+
+    def one(v: str) -> Any:
+        return None if v == "." else conv(v)
+
+    if fd.number == "1":
+        return one
+    return lambda v: [one(x) for x in v.split(",")]
+
+
+def make_info_parser(
+    defs: Dict[str, FieldDef], keys: Optional[Sequence[str]] = None
+) -> Callable[[str], Dict[str, Any]]:
+    """
+    Декодер INFO-строки по определениям заголовка.
+    ``keys`` — оставить только эти ключи (остальные не декодируются).
+    Флаги (Type=Flag) -> True; ключи без определения — строки как есть.
+    """
+    convs = {k: _converter(fd) for k, fd in defs.items()}
+    wanted = set(keys) if keys is not None else None
+
+    def parse(info: str) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        if info == "." or not info:
+            return out
+        for item in info.split(";"):
+            key, eq, value = item.partition("=")
+            if wanted is not None and key not in wanted:
+                continue
+            if not eq:
+                out[key] = True
+            else:
+                conv = convs.get(key)
+                out[key] = conv(value) if conv is not None else value
+        return out
+
+    return parse
+
+
+def decode_gt(gt: str, ploidy: int) -> Tuple[Tuple[int, ...], bool]:
+    """``'0|1'`` -> ((0, 1), True); ``'./.'`` -> ((-1, -1), False); ``'1'`` -> ((1, -2), False)."""
+    phased = "|" in gt
+    alleles = gt.replace("|", "/").split("/")
+    if len(alleles) > ploidy:
+        raise ValueError(f"Genotype {gt!r} exceeds ploidy {ploidy}")
+    codes = [MISSING_ALLELE if a in (".", "") else int(a) for a in alleles]
+    codes += [ABSENT_ALLELE] * (ploidy - len(codes))
+    return tuple(codes), phased
+
+
+class _Interner:
+    """Строки -> индексы уникальных значений (разбор каждого уникального значения — один раз)."""
+
+    def __init__(self) -> None:
+        self.ids: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def encode(self, items: List[str]) -> List[int]:
+        ids = self.ids
+        try:
+            return list(map(ids.__getitem__, items))
+        except KeyError:
+            for v in items:
+                if v not in ids:
+                    ids[v] = len(self.values)
+                    self.values.append(v)
+            return list(map(ids.__getitem__, items))
+
+
+class GenotypeBatch:
+    """Генотипы батча вариантов для выбранных сэмплов."""
+
+    def __init__(
+        self,
+        chrom: List[str],
+        pos: np.ndarray,
+        samples: List[str],
+        gt: Optional[np.ndarray],
+        phased: Optional[np.ndarray],
+        fields: Dict[str, np.ndarray],
+    ) -> None:
+        self.chrom = chrom
+        self.pos = pos
+        self.samples = samples
+        self.gt = gt
+        self.phased = phased
+        self.fields = fields
+
+    def __len__(self) -> int:
+        return len(self.pos)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """``batch["GT"]`` — матрица аллелей, ``batch["DP"]`` — FORMAT-поле."""
+        if name == "GT" and self.gt is not None:
+            return self.gt
+        return self.fields[name]
+
+    def alt_allele_counts(self) -> np.ndarray:
+        """Число ALT-аллелей (код > 0) на вариант × сэмпл."""
+        assert self.gt is not None, "GT was not decoded"
+        return (self.gt > 0).sum(axis=2, dtype=np.int16)
+
+    @classmethod
+    def empty(cls, samples: List[str], fields: Sequence[str] = ("GT",), ploidy: int = 2) -> "GenotypeBatch":
+        """Батч без вариантов (формы массивов — как у непустого)."""
+        n_s = len(samples)
+        want_gt = "GT" in fields
+        return cls(
+            [],
+            np.zeros(0, dtype=np.int32),
+            list(samples),
+            np.zeros((0, n_s, ploidy), dtype=np.int8) if want_gt else None,
+            np.zeros((0, n_s), dtype=bool) if want_gt else None,
+            {f: np.zeros((0, n_s), dtype=object) for f in fields if f != "GT"},
+        )
+
+    @classmethod
+    def concat(cls, batches: Sequence["GenotypeBatch"]) -> "GenotypeBatch":
+        if not batches:
+            raise ValueError("No batches to concatenate")
+        first = batches[0]
+        return cls(
+            [c for b in batches for c in b.chrom],
+            np.concatenate([b.pos for b in batches]),
+            first.samples,
+            np.concatenate([b.gt for b in batches]) if first.gt is not None else None,  # type: ignore[misc]
+            np.concatenate([b.phased for b in batches]) if first.phased is not None else None,  # type: ignore[misc]
+            {k: np.concatenate([b.fields[k] for b in batches]) for k in first.fields},
+        )
+
+
+def _field_table(values: List[str], fd: Optional[FieldDef]) -> np.ndarray:
+    """Строковые значения поля -> типизированный массив (по определению FORMAT)."""
+    kind = fd.type if fd is not None and fd.number == "1" else "String"
+    if kind == "Integer":
+        return np.array([MISSING_INT if v in (".", "") else int(v) for v in values], dtype=np.int32)
+    if kind == "Float":
+        return np.array([np.nan if v in (".", "") else float(v) for v in values], dtype=np.float32)
+    return np.array(values, dtype=object)
+
+
+class _FormatGroup:
+    """Строки батча с одинаковой колонкой FORMAT: индексы ячеек в таблице уникальных."""
+
+    def __init__(self, fmt: str) -> None:
+        self.keys = {k: i for i, k in enumerate(fmt.split(":"))}
+        self.interner = _Interner()
+        self.rows: List[int] = []
+        self.ids: List[int] = []
+
+    def add(self, row: int, cells: Sequence[str]) -> None:
+        self.rows.append(row)
+        self.ids.extend(self.interner.encode(cells))  # type: ignore[arg-type]
+
+
+def iter_genotypes(
+    lines: Iterable[str],
+    all_samples: List[str],
+    format_defs: Dict[str, FieldDef],
+    samples: Optional[Sequence[str]] = None,
+    fields: Sequence[str] = ("GT",),
+    ploidy: int = 2,
+    batch_size: int = 4096,
+) -> Iterator[GenotypeBatch]:
+    """
+    Батчи генотипов из строк данных VCF (без заголовка).
+
+    samples — имена сэмплов (по умолчанию все); fields — FORMAT-поля
+    ("GT" даёт матрицы gt/phased, остальные — массивы в ``fields``).
+
+    Ячейки сэмплов (``0/1:35:99``) не режутся по одной: строки батча
+    группируются по FORMAT, ячейки кодируются индексами уникальных значений,
+    и на поля разбирается только таблица уникальных.
+    """
+    if samples is None:
+        cols = list(range(len(all_samples)))
+    else:
+        pos_of = {s: i for i, s in enumerate(all_samples)}
+        missing = [s for s in samples if s not in pos_of]
+        if missing:
+            raise KeyError(f"Unknown samples: {missing}")
+        cols = [pos_of[s] for s in samples]
+    names = [all_samples[c] for c in cols]
+    want_gt = "GT" in fields
+    others = [f for f in fields if f != "GT"]
+    maxsplit = 9 + max(cols) + 1 if cols else 9
+    n_s = len(cols)
+    contiguous = cols == list(range(n_s))
+    take = itemgetter(*[9 + c for c in cols]) if n_s > 1 else None
+
+    gt_table: Dict[str, Tuple[Tuple[int, ...], bool]] = {}
+
+    def decode_gts(values: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        decoded = [gt_table.get(v) or gt_table.setdefault(v, decode_gt(v, ploidy)) for v in values]
+        codes = np.array([d[0] for d in decoded], dtype=np.int8).reshape(-1, ploidy)
+        return codes, np.array([d[1] for d in decoded], dtype=bool)
+
+    def flush(chroms: List[str], positions: List[int], groups: Dict[str, _FormatGroup]) -> GenotypeBatch:
+        n = len(positions)
+        gt = np.full((n, n_s, ploidy), MISSING_ALLELE, dtype=np.int8) if want_gt else None
+        phased = np.zeros((n, n_s), dtype=bool) if want_gt else None
+        arrays: Dict[str, np.ndarray] = {}
+        for group in groups.values():
+            ids = np.array(group.ids, dtype=np.int64).reshape(len(group.rows), n_s)
+            rows = np.array(group.rows, dtype=np.int64)
+            parts = [cell.split(":") for cell in group.interner.values]
+            for f in fields:
+                k = group.keys.get(f)
+                values = [p[k] if k is not None and k < len(p) else "." for p in parts]
+                if f == "GT":
+                    codes, flags = decode_gts(values)
+                    gt[rows] = codes[ids]  # type: ignore[index]
+                    phased[rows] = flags[ids]  # type: ignore[index]
+                    continue
+                table = _field_table(values, format_defs.get(f))
+                if f not in arrays:
+                    arrays[f] = np.empty((n, n_s), dtype=table.dtype)
+                elif arrays[f].dtype != table.dtype:
+                    arrays[f] = arrays[f].astype(object)
+                arrays[f][rows] = table[ids]
+        for f in others:
+            if f not in arrays:
+                arrays[f] = _field_table(["."], format_defs.get(f))[np.zeros((n, n_s), dtype=np.int64)]
+        return GenotypeBatch(chroms, np.array(positions, dtype=np.int32), names, gt, phased, arrays)
+
+    chroms: List[str] = []
+    positions: List[int] = []
+    groups: Dict[str, _FormatGroup] = {}
+
+    for line in lines:
+        if not line:
+            continue
+        parts = line.split("\t", maxsplit)
+        if cols and len(parts) < maxsplit:
+            raise ValueError(f"VCF line has fewer sample columns than the header: {line[:80]!r}")
+        row = len(positions)
+        chroms.append(parts[0])
+        positions.append(int(parts[1]))
+        if contiguous:
+            cells: Sequence[str] = parts[9 : 9 + n_s]
+        elif take is not None:
+            cells = take(parts)
+        else:
+            cells = [parts[9 + c] for c in cols]
+
+        fmt = parts[8] if len(parts) > 8 else ""
+        group = groups.get(fmt)
+        if group is None:
+            group = groups[fmt] = _FormatGroup(fmt)
+        group.add(row, cells)
+
+        if len(positions) >= batch_size:
+            yield flush(chroms, positions, groups)
+            chroms, positions, groups = [], [], {}
+
+    if positions:
+        yield flush(chroms, positions, groups)
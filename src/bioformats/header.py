@@ -0,0 +1,176 @@
+# src/bioformats/header.py
+"""
+Разобранные заголовки VCF и SAM.
+
+Заголовок читается один раз (ограниченное чтение до первой строки данных)
+и разбирается в модель:
+
+- VcfHeader — INFO/FORMAT-определения (Number, Type, Description),
+  FILTER, contig с длинами, имена сэмплов, прочие ``##key=value``;
+- SamHeader — @HD как словарь, @SQ/@RG/@PG как списки словарей, @CO.
+
+``end_offset`` — позиция начала данных (байты; для BGZF — виртуальное
+смещение): чтение записей начинается сразу с неё, без проверки каждой
+строки на символ заголовка.
+"""
+
+from __future__ import annotations
+from typing import Dict, List, NamedTuple, Optional
+import re
+
+# пары KEY=VALUE внутри <...>; значение в кавычках может содержать запятые
+_PAIR_RE = re.compile(r'([A-Za-z0-9_.]+)=("(?:[^"\\]|\\.)*"|[^,]*)')
+
+
+def parse_structured(value: str) -> Dict[str, str]:
+    """``<ID=DP,Number=1,Description="a, b">`` -> {'ID': 'DP', 'Number': '1', 'Description': 'a, b'}."""
+    body = value.strip()
+    if body.startswith("<") and body.endswith(">"):
+        body = body[1:-1]
+    out: Dict[str, str] = {}
+    for key, val in _PAIR_RE.findall(body):
+        if len(val) >= 2 and val[0] == val[-1] == '"':
+            val = val[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+        out[key] = val
+    return out
+
+
+def _reference_token(lines: List[str]) -> Optional[str]:
+    """Ссылка на референс вида ``ref=...``/``reference=...`` среди токенов строк."""
+    for line in lines:
+        if "ref=" in line or "reference=" in line:
+            for token in line.split():
+                if token.startswith(("ref=", "reference=")):
+                    return token.split("=", 1)[1]
+    return None
+
+
+class FieldDef(NamedTuple):
+    """Определение INFO/FORMAT-поля VCF."""
+
+    id: str
+    number: str  # '1', 'A', 'R', 'G', '.' ...
+    type: str  # Integer, Float, Flag, Character, String
+    description: str
+
+
+class VcfHeader:
+    """Модель заголовка VCF."""
+
+    def __init__(self, lines: List[str], end_offset: int = 0) -> None:
+        self.lines = lines
+        self.end_offset = end_offset
+        self.meta: Dict[str, List[str]] = {}  # прочие ##key=value (значения как есть)
+        self.info: Dict[str, FieldDef] = {}
+        self.format: Dict[str, FieldDef] = {}
+        self.filters: Dict[str, str] = {}  # ID -> Description
+        self.contigs: Dict[str, Optional[int]] = {}  # ID -> length
+        self.samples: List[str] = []
+
+        for line in lines:
+            if line.startswith("#CHROM"):
+                self.samples = line.split("\t")[9:]
+                continue
+            if not line.startswith("##") or "=" not in line:
+                continue
+            key, value = line[2:].split("=", 1)
+            if key in ("INFO", "FORMAT"):
+                d = parse_structured(value)
+                fd = FieldDef(d.get("ID", ""), d.get("Number", "."), d.get("Type", "String"), d.get("Description", ""))
+                (self.info if key == "INFO" else self.format)[fd.id] = fd
+            elif key == "FILTER":
+                d = parse_structured(value)
+                self.filters[d.get("ID", "")] = d.get("Description", "")
+            elif key == "contig":
+                d = parse_structured(value)
+                length = d.get("length")
+                self.contigs[d.get("ID", "")] = int(length) if length and length.isdigit() else None
+            else:
+                self.meta.setdefault(key, []).append(value)
+
+    @property
+    def fileformat(self) -> Optional[str]:
+        return self.meta.get("fileformat", [None])[0]
+
+    @property
+    def reference(self) -> Optional[str]:
+        """``##reference=...`` или токен ``ref=``/``reference=`` в строках заголовка."""
+        if "reference" in self.meta:
+            return self.meta["reference"][0]
+        return _reference_token(self.lines)
+
+    def groups(self) -> Dict[str, List[str]]:
+        """Строки по группам INFO/FILTER/FORMAT/CONTIG/META/COLUMNS (см. VcfReader.header_by_group)."""
+        groups: Dict[str, List[str]] = {}
+        for line in self.lines:
+            if line.startswith("##INFO"):
+                groups.setdefault("INFO", []).append(line)
+            elif line.startswith("##FILTER"):
+                groups.setdefault("FILTER", []).append(line)
+            elif line.startswith("##FORMAT"):
+                groups.setdefault("FORMAT", []).append(line)
+            elif line.startswith("##contig"):
+                groups.setdefault("CONTIG", []).append(line)
+            elif line.startswith("##"):
+                groups.setdefault("META", []).append(line)
+            elif line.startswith("#CHROM"):
+                groups.setdefault("COLUMNS", []).append(line)
+        return groups
+
+
+class SamHeader:
+    """Модель заголовка SAM: записи @HD/@SQ/@RG/@PG как словари тегов."""
+
+    def __init__(self, lines: List[str], end_offset: int = 0) -> None:
+        self.lines = lines
+        self.end_offset = end_offset
+        self.hd: Dict[str, str] = {}
+        self.sq: List[Dict[str, str]] = []
+        self.rg: List[Dict[str, str]] = []
+        self.pg: List[Dict[str, str]] = []
+        self.co: List[str] = []
+        self.other: Dict[str, List[Dict[str, str]]] = {}
+
+        for line in lines:
+            if len(line) < 3 or not line.startswith("@"):
+                continue
+            tag = line[1:3]
+            if tag == "CO":
+                self.co.append(line[4:])
+                continue
+            rec = dict(f.split(":", 1) for f in line.split("\t")[1:] if ":" in f)
+            if tag == "HD":
+                self.hd = rec
+            elif tag == "SQ":
+                self.sq.append(rec)
+            elif tag == "RG":
+                self.rg.append(rec)
+            elif tag == "PG":
+                self.pg.append(rec)
+            else:
+                self.other.setdefault(tag, []).append(rec)
+
+    @property
+    def references(self) -> Dict[str, Optional[int]]:
+        """SN -> LN по строкам @SQ."""
+        return {sq["SN"]: int(sq["LN"]) if sq.get("LN", "").isdigit() else None for sq in self.sq if "SN" in sq}
+
+    @property
+    def sort_order(self) -> Optional[str]:
+        return self.hd.get("SO")
+
+    @property
+    def reference(self) -> Optional[str]:
+        """Токен ``ref=``/``reference=`` в заголовке, иначе сборка (AS) из @SQ."""
+        token = _reference_token(self.lines)
+        if token is not None:
+            return token
+        return next((sq["AS"] for sq in self.sq if "AS" in sq), None)
+
+    def groups(self) -> Dict[str, List[str]]:
+        """Строки по типу записи: {"HD": [...], "SQ": [...], ...}."""
+        groups: Dict[str, List[str]] = {}
+        for line in self.lines:
+            if line.startswith("@") and len(line) >= 3:
+                groups.setdefault(line[1:3], []).append(line)
+        return groups
@@ -0,0 +1,143 @@
+# src/bioformats/inflate.py
+"""
+Распаковка обычного gzip в фоновом потоке.
+
+Обычный gzip (не BGZF) — один поток deflate, его нельзя распаковывать
+по частям параллельно. Но можно развести чтение+распаковку и разбор:
+ThreadedGzipReader распаковывает файл в отдельном потоке (zlib отпускает
+GIL) и складывает блоки данных в ограниченную очередь, а разбор в
+основном потоке забирает их по мере надобности.
+
+    raw = io.BufferedReader(ThreadedGzipReader("reads.fq.gz"))
+
+Reader использует его для ``.gz`` при ``threads > 1`` (для BGZF — пул
+распаковки блоков, см. BgzfReader). Поддерживаются многочленные gzip
+(как у ``cat a.gz b.gz``); seek вперёд — пропуском, назад —
+перезапуском распаковки с начала файла.
+"""
+
+from __future__ import annotations
+from typing import Optional, Union
+import io
+import os
+import queue
+import threading
+import zlib
+
+_GZIP_WBITS = 31  # zlib: формат gzip (заголовок + CRC)
+
+
+class ThreadedGzipReader(io.RawIOBase):
+    """
+    Несжатый поток gzip-файла с распаковкой наперёд.
+
+    chunk_size — сколько сжатых байт читать за раз;
+    prefetch   — сколько распакованных блоков держать в очереди.
+    """
+
+    def __init__(self, filename: str, *, chunk_size: int = 1 << 20, prefetch: int = 4) -> None:
+        super().__init__()
+        self.name = filename
+        self.chunk_size = chunk_size
+        self.prefetch = prefetch
+        self._thread: Optional[threading.Thread] = None
+        self._start()
+
+    # ---------- фоновая распаковка ----------
+    def _start(self) -> None:
+        self._pos = 0
+        self._buf = b""
+        self._buf_at = 0
+        self._eof = False
+        self._stop = threading.Event()
+        self._queue: "queue.Queue[Union[bytes, BaseException]]" = queue.Queue(self.prefetch)
+        self._thread = threading.Thread(target=self._produce, args=(self._stop, self._queue), daemon=True)
+        self._thread.start()
+
+    def _produce(self, stop: threading.Event, out: "queue.Queue") -> None:
+        def put(item: Union[bytes, BaseException]) -> None:
+            while not stop.is_set():
+                try:
+                    out.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        try:
+            with open(self.name, "rb") as raw:
+                d = zlib.decompressobj(_GZIP_WBITS)
+                fed = False  # текущий член gzip уже получил данные
+                while not stop.is_set():
+                    chunk = raw.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    data = d.decompress(chunk)
+                    fed = True
+                    while d.eof:  # конец члена: следующий начинается в unused_data
+                        rest = d.unused_data
+                        d = zlib.decompressobj(_GZIP_WBITS)
+                        fed = bool(rest)
+                        if not rest:
+                            break
+                        data += d.decompress(rest)
+                    if data:
+                        put(data)
+                if fed and not d.eof and not stop.is_set():
+                    raise EOFError("Compressed file ended before the end-of-stream marker was reached")
+            put(b"")
+        except Exception as exc:  # noqa: BLE001 — поднимется в читающем потоке
+            put(exc)
+
+    def _halt(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    # ---------- file-like API ----------
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:  # type: ignore[override]
+        if self._buf_at >= len(self._buf):
+            if self._eof:
+                return 0
+            item = self._queue.get()
+            if isinstance(item, BaseException):
+                self._eof = True
+                raise item
+            if not item:
+                self._eof = True
+                return 0
+            self._buf, self._buf_at = item, 0
+        n = min(len(b), len(self._buf) - self._buf_at)
+        b[:n] = self._buf[self._buf_at:self._buf_at + n]
+        self._buf_at += n
+        self._pos += n
+        return n
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, pos: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            pos += self._pos
+        elif whence != os.SEEK_SET:
+            raise io.UnsupportedOperation("gzip stream supports only SEEK_SET and SEEK_CUR")
+        if pos < self._pos:
+            self._halt()
+            self._start()
+        skip = bytearray(min(pos - self._pos, 1 << 20) or 1)
+        while self._pos < pos:
+            view = memoryview(skip)[: min(len(skip), pos - self._pos)]
+            if not self.readinto(view):
+                break
+        return self._pos
+
+    def close(self) -> None:
+        if not self.closed:
+            self._halt()
+        super().close()
@@ -0,0 +1,426 @@
+# src/bioformats/kmers.py
+"""
+Потоковый подсчёт k-меров для FASTA/FASTQ на NumPy.
+
+K-мер (k <= 31) кодируется в uint64 по 2 бита на основание (A=0, C=1,
+G=2, T=3): код окна получается сдвигом предыдущего — ``(code << 2) | base``
+— и считается сразу для всех окон буфера векторно. Канонический k-мер —
+минимум из кода и кода обратного комплемента. Окна с N (и любым
+символом, кроме ACGT) пропускаются.
+
+Последовательности склеиваются в буфер через 'N' (окна на стыке
+отбрасываются как содержащие N), так что короткие риды обрабатываются
+пачками, а не по одному.
+
+Куда считать:
+- KmerTable      — точные счётчики: хеш-таблица с открытой адресацией на
+                   массивах NumPy (ключи uint64, счётчики uint32);
+- CountMinSketch — приближённые счётчики (оценка сверху) в фиксированной
+                   памяти ``memory`` байт.
+
+    counter = KmerCounter(21).add_reader(FastqReader("reads.fq"), workers=4)
+    counter.histogram()          # спектр: hist[c] — число k-меров, встреченных c раз
+    counter["ACGTACGTACGTACGTACGTA"]
+"""
+
+from __future__ import annotations
+from functools import partial
+from typing import Any, Iterable, List, Optional, Tuple, Union
+import os
+
+import numpy as np
+
+from .packed import as_ascii
+from .parallel import ParallelReader
+
+MAX_K = 31  # 62 бита: значение 2**64 - 1 свободно под метку пустой ячейки
+
+_EMPTY = np.uint64(0xFFFFFFFFFFFFFFFF)
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)  # мультипликативный хеш (Фибоначчи)
+_BAD = 4
+
+_ENC = np.full(256, _BAD, dtype=np.uint8)
+for _code, _base in enumerate("ACGT"):
+    _ENC[ord(_base)] = _ENC[ord(_base.lower())] = _code
+
+
+def _check_k(k: int) -> None:
+    if not 1 <= k <= MAX_K:
+        raise ValueError(f"k must be in 1..{MAX_K}, got {k}")
+
+
+def encode_kmer(kmer: str) -> int:
+    """Строка k-мера -> код (A=0, C=1, G=2, T=3)."""
+    code = 0
+    for ch in kmer.upper():
+        if ch not in "ACGT":
+            raise ValueError(f"Invalid base {ch!r} in k-mer {kmer!r}")
+        code = (code << 2) | "ACGT".index(ch)
+    return code
+
+
+def reverse_complement_code(code: int, k: int) -> int:
+    """Код обратного комплемента k-мера."""
+    rc = 0
+    for _ in range(k):
+        rc = (rc << 2) | (3 - (code & 3))
+        code >>= 2
+    return rc
+
+
+def kmer_codes(sequence: Any, k: int, canonical: bool = False) -> np.ndarray:
+    """
+    uint64-коды всех k-меров последовательности (str, bytes, SequenceView,
+    PackedSequence или uint8 ASCII-массив) по порядку, без окон с N.
+    canonical=True — min(k-мер, обратный комплемент).
+    """
+    _check_k(k)
+    codes = _ENC[as_ascii(sequence)]
+    n = len(codes) - k + 1
+    if n <= 0:
+        return np.zeros(0, dtype=np.uint64)
+    bases = (codes & 3).astype(np.uint64)
+    two = np.uint64(2)
+    fwd = np.zeros(n, dtype=np.uint64)
+    for j in range(k):
+        fwd <<= two
+        fwd |= bases[j:j + n]
+    if canonical:
+        comp = np.uint64(3) - bases
+        rc = np.zeros(n, dtype=np.uint64)
+        for j in range(k):
+            rc |= comp[j:j + n] << np.uint64(2 * j)  # j-е основание окна -> (k-1-j)-е в комплементе
+        np.minimum(fwd, rc, out=fwd)
+    bad = codes == _BAD
+    if bad.any():
+        hits = np.concatenate(([0], np.cumsum(bad)))
+        fwd = fwd[hits[k:] == hits[:n]]
+    return fwd
+
+
+def _hash(keys: np.ndarray, bits: int, seed: np.uint64 = _GOLDEN) -> np.ndarray:
+    """Старшие ``bits`` бит произведения на нечётную константу — номер ячейки."""
+    with np.errstate(over="ignore"):
+        return ((keys * seed) >> np.uint64(64 - bits)).astype(np.int64)
+
+
+# ---------- точные счётчики ----------
+class KmerTable:
+    """
+    Хеш-таблица k-мер -> число (открытая адресация, линейное пробирование).
+
+    Вставка — пачками: уникальные ключи пачки (np.unique) раскладываются
+    по ячейкам за несколько векторных раундов; при заполнении больше
+    половины ёмкость удваивается.
+    """
+
+    def __init__(self, capacity: int = 1 << 16) -> None:
+        bits = max(4, int(capacity - 1).bit_length())
+        self._alloc(bits)
+        self.size = 0
+
+    def _alloc(self, bits: int) -> None:
+        self.bits = bits
+        self.keys = np.full(1 << bits, _EMPTY, dtype=np.uint64)
+        self.counts = np.zeros(1 << bits, dtype=np.uint32)
+
+    @property
+    def capacity(self) -> int:
+        return len(self.keys)
+
+    @property
+    def nbytes(self) -> int:
+        return self.keys.nbytes + self.counts.nbytes
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(self, kmers: np.ndarray, counts: Optional[np.ndarray] = None) -> None:
+        """Прибавить k-меры (или пары ключ/число, если counts задан — ключи уникальны)."""
+        if counts is None:
+            kmers, counts = np.unique(kmers, return_counts=True)
+        if not len(kmers):
+            return
+        if 2 * (self.size + len(kmers)) > self.capacity:
+            self._grow(self.size + len(kmers))
+        self._insert(kmers, counts.astype(np.uint32, copy=False))
+
+    def _grow(self, need: int) -> None:
+        keys, counts = self.items()
+        bits = self.bits
+        while (1 << bits) < 2 * need:
+            bits += 1
+        self._alloc(bits)
+        self.size = 0
+        self._insert(keys, counts)
+
+    def _insert(self, keys: np.ndarray, counts: np.ndarray) -> None:
+        mask = self.capacity - 1
+        slots = _hash(keys, self.bits)
+        pending = np.arange(len(keys))
+        while pending.size:
+            s = slots[pending]
+            current = self.keys[s]
+            hit = current == keys[pending]
+            self.counts[s[hit]] += counts[pending[hit]]  # ключи уникальны -> ячейки тоже
+            empty = current == _EMPTY
+            # в свободную ячейку попадает первый претендент, остальные — в следующий раунд
+            cand = np.flatnonzero(empty)
+            _, first = np.unique(s[cand], return_index=True)
+            won = cand[first]
+            self.keys[s[won]] = keys[pending[won]]
+            self.counts[s[won]] = counts[pending[won]]
+            self.size += len(won)
+            done = hit.copy()
+            done[won] = True
+            busy = ~hit & ~empty  # ячейка занята другим ключом — пробуем следующую
+            slots[pending[busy]] = (s[busy] + 1) & mask
+            pending = pending[~done]
+
+    def get(self, kmers: np.ndarray) -> np.ndarray:
+        """Счётчики для массива кодов (0 — k-мер не встречался)."""
+        kmers = np.asarray(kmers, dtype=np.uint64)
+        out = np.zeros(len(kmers), dtype=np.uint32)
+        mask = self.capacity - 1
+        slots = _hash(kmers, self.bits)
+        pending = np.arange(len(kmers))
+        while pending.size:
+            s = slots[pending]
+            current = self.keys[s]
+            hit = current == kmers[pending]
+            out[pending[hit]] = self.counts[s[hit]]
+            go_on = ~hit & (current != _EMPTY)
+            slots[pending[go_on]] = (s[go_on] + 1) & mask
+            pending = pending[go_on]
+        return out
+
+    def items(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(ключи, счётчики) занятых ячеек, по возрастанию ключа."""
+        used = self.keys != _EMPTY
+        keys, counts = self.keys[used], self.counts[used]
+        order = np.argsort(keys)
+        return keys[order], counts[order]
+
+    def merge(self, other: "KmerTable") -> None:
+        self.add(*other.items())
+
+    def __getstate__(self) -> dict:
+        # между процессами передаются только занятые ячейки
+        keys, counts = self.items()
+        return {"keys": keys, "counts": counts}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(2 * len(state["keys"]) + 1)  # type: ignore[misc]
+        self.add(state["keys"], state["counts"])
+
+    def histogram(self) -> np.ndarray:
+        """hist[c] — число различных k-меров, встреченных ровно c раз."""
+        return np.bincount(self.counts[self.keys != _EMPTY], minlength=1).astype(np.int64)
+
+
+# ---------- приближённые счётчики ----------
+class CountMinSketch:
+    """
+    Count-min sketch: ``depth`` строк по ``width`` счётчиков uint32.
+    Оценка — минимум по строкам, никогда не меньше истинного числа.
+    Память фиксирована (``memory`` байт -> ширина — степень двойки).
+    """
+
+    def __init__(self, memory: int = 64 << 20, depth: int = 4) -> None:
+        if depth < 1:
+            raise ValueError("depth must be at least 1")
+        width = max(16, memory // (4 * depth))
+        self.bits = width.bit_length() - 1  # округление вниз до степени двойки
+        self.depth = depth
+        self.table = np.zeros((depth, 1 << self.bits), dtype=np.uint32)
+        # свои нечётные множители на строку; одинаковы во всех процессах
+        rng = np.random.default_rng(0x6B6D6572)
+        self.seeds = rng.integers(1, 1 << 63, size=depth, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self.total = 0
+
+    @property
+    def width(self) -> int:
+        return self.table.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        return self.table.nbytes
+
+    def add(self, kmers: np.ndarray, counts: Optional[np.ndarray] = None) -> None:
+        if counts is None:
+            kmers, counts = np.unique(kmers, return_counts=True)
+        counts = counts.astype(np.uint32, copy=False)
+        for row, seed in zip(self.table, self.seeds):
+            cells, inverse = np.unique(_hash(kmers, self.bits, seed), return_inverse=True)
+            row[cells] += np.bincount(inverse, weights=counts, minlength=len(cells)).astype(np.uint32)
+        self.total += int(counts.sum())
+
+    def get(self, kmers: np.ndarray) -> np.ndarray:
+        kmers = np.asarray(kmers, dtype=np.uint64)
+        est = np.full(len(kmers), np.iinfo(np.uint32).max, dtype=np.uint32)
+        for row, seed in zip(self.table, self.seeds):
+            np.minimum(est, row[_hash(kmers, self.bits, seed)], out=est)
+        return est
+
+    def merge(self, other: "CountMinSketch") -> None:
+        if other.table.shape != self.table.shape or not np.array_equal(other.seeds, self.seeds):
+            raise ValueError("Cannot merge sketches with different width/depth")
+        self.table += other.table
+        self.total += other.total
+
+
+# ---------- счётчик ----------
+class KmerCounter:
+    """
+    Подсчёт k-меров по последовательностям и ридерам.
+
+    k         — длина k-мера (1..31);
+    canonical — считать k-мер и его обратный комплемент одним ключом;
+    memory    — None: точные счётчики (KmerTable, память растёт с числом
+                различных k-меров); число байт: CountMinSketch такого размера;
+    depth     — число строк count-min sketch;
+    batch_bases — сколько оснований склеивать в один векторный проход.
+    """
+
+    def __init__(
+        self,
+        k: int,
+        *,
+        canonical: bool = True,
+        memory: Optional[int] = None,
+        depth: int = 4,
+        batch_bases: int = 1 << 22,
+    ) -> None:
+        _check_k(k)
+        self.k = k
+        self.canonical = canonical
+        self.memory = memory
+        self.depth = depth
+        self.batch_bases = batch_bases
+        self.counts: Union[KmerTable, CountMinSketch] = (
+            KmerTable() if memory is None else CountMinSketch(memory, depth)
+        )
+        self.n_sequences = 0
+        self.n_kmers = 0
+        self._buf: List[bytes] = []
+        self._buffered = 0
+
+    @property
+    def exact(self) -> bool:
+        return isinstance(self.counts, KmerTable)
+
+    # ---------- накопление ----------
+    def add_sequence(self, sequence: Any) -> "KmerCounter":
+        """Добавить последовательность (str, bytes, SequenceView, PackedSequence)."""
+        data = sequence.encode("ascii", "replace") if isinstance(sequence, str) else bytes(sequence)
+        if len(data) >= self.k:
+            self._buf.append(data)
+            self._buffered += len(data) + 1
+        self.n_sequences += 1
+        if self._buffered >= self.batch_bases:
+            self.flush()
+        return self
+
+    def add_sequences(self, sequences: Iterable[Any]) -> "KmerCounter":
+        for seq in sequences:
+            self.add_sequence(seq)
+        self.flush()
+        return self
+
+    def flush(self) -> None:
+        """Посчитать накопленный буфер (риды склеены через N)."""
+        if not self._buf:
+            return
+        codes = kmer_codes(np.frombuffer(b"N".join(self._buf), dtype=np.uint8), self.k, self.canonical)
+        self._buf, self._buffered = [], 0
+        self.n_kmers += len(codes)
+        self.counts.add(codes)
+
+    def add_reader(self, reader, workers: int = 1, chunk_size: int = 32 << 20) -> "KmerCounter":
+        """
+        Пройти ридер (FASTA/FASTQ). workers > 1 — файл режется на диапазоны
+        байт (ParallelReader), каждый процесс считает свой диапазон в
+        отдельную таблицу/скетч, результаты сливаются. Для count-min
+        sketch каждый процесс держит свой скетч размера ``memory``.
+        """
+        if workers <= 1:
+            return self.add_sequences(seq for _, seq in reader.read())
+        self.flush()
+        pool = ParallelReader(reader, workers, chunk_size=chunk_size, ordered=False)
+        for part in pool.map_records(partial(_count_chunk, self._settings())):
+            self.merge(part)
+        return self
+
+    def _settings(self) -> dict:
+        return {
+            "k": self.k,
+            "canonical": self.canonical,
+            "memory": self.memory,
+            "depth": self.depth,
+            "batch_bases": self.batch_bases,
+        }
+
+    def merge(self, other: "KmerCounter") -> "KmerCounter":
+        """Прибавить счётчики другого KmerCounter с теми же k/canonical/memory."""
+        if (other.k, other.canonical, other.exact) != (self.k, self.canonical, self.exact):
+            raise ValueError("Cannot merge k-mer counters with different settings")
+        self.flush()
+        other.flush()
+        self.counts.merge(other.counts)  # type: ignore[arg-type]
+        self.n_sequences += other.n_sequences
+        self.n_kmers += other.n_kmers
+        return self
+
+    # ---------- результаты ----------
+    def get(self, kmers: Union[str, Iterable[str], np.ndarray]) -> np.ndarray:
+        """
+        Счётчики для k-меров: строки (с canonical=True приводятся к
+        каноническому ключу) или массив кодов (используются как есть).
+        """
+        self.flush()
+        if isinstance(kmers, str):
+            kmers = [kmers]
+        if not isinstance(kmers, np.ndarray):
+            codes = [encode_kmer(km) for km in kmers]
+            if any(len(km) != self.k for km in kmers):  # type: ignore[union-attr]
+                raise ValueError(f"All k-mers must have length {self.k}")
+            if self.canonical:
+                codes = [min(c, reverse_complement_code(c, self.k)) for c in codes]
+            kmers = np.array(codes, dtype=np.uint64)
+        return self.counts.get(kmers)
+
+    def __getitem__(self, kmer: str) -> int:
+        return int(self.get(kmer)[0])
+
+    def __len__(self) -> int:
+        """Число различных k-меров (только для точного подсчёта)."""
+        return len(self._table())
+
+    def _table(self) -> KmerTable:
+        self.flush()
+        if not isinstance(self.counts, KmerTable):
+            raise ValueError("Distinct k-mers are not stored in a count-min sketch (use memory=None)")
+        return self.counts
+
+    def items(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(коды, счётчики) по возрастанию кода — только для точного подсчёта."""
+        return self._table().items()
+
+    def histogram(self) -> np.ndarray:
+        """Спектр k-меров: hist[c] — число различных k-меров с числом c (hist[0] = 0)."""
+        return self._table().histogram()
+
+    def write_histogram(self, path: Union[str, os.PathLike]) -> int:
+        """Спектр в текстовый файл «число частота» (как ``jellyfish histo``); возвращает число строк."""
+        hist = self.histogram()
+        rows = np.flatnonzero(hist)
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.writelines(f"{c} {hist[c]}\n" for c in rows.tolist())
+        return len(rows)
+
+
+def _count_chunk(settings: dict, records: Iterable[Tuple[str, Any]]) -> KmerCounter:
+    """Посчитать k-меры одного диапазона файла (выполняется в воркере)."""
+    counter = KmerCounter(**settings)
+    counter.add_sequences(seq for _, seq in records)
+    return counter
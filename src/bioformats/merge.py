@@ -0,0 +1,232 @@
+# src/bioformats/merge.py
+"""
+Порядок записей SAM/VCF: проверка сортировки, слияние и внешняя сортировка.
+
+Порядок хромосом берётся из разобранных заголовков (@SQ у SAM,
+``##contig`` у VCF); хромосомы, которых там нет, идут после известных
+по имени, невыровненные риды SAM (``*``) — в самом конце.
+is_sorted() для хромосом без заголовка проверяет только, что каждая идёт
+одним блоком; merge() и sort_file() упорядочивают такие хромосомы по имени.
+
+    is_sorted(SamReader("a.sam"))                       # останавливается на первом нарушении
+    for rec in merge([VcfReader(p) for p in shards], lazy=True):
+        ...                                             # k-way слияние, память O(k)
+    sort_file(SamReader("big.sam"), "big.sorted.sam.gz", memory=1 << 30, index=True)
+
+sort_file() — внешняя сортировка слиянием: строки копятся до бюджета
+``memory`` байт, сортируются и сбрасываются во временные файлы-«прогоны»,
+которые затем сливаются кучей (не больше ``fan_in`` файлов за раз).
+"""
+
+from __future__ import annotations
+from heapq import merge as heap_merge
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+import os
+import tempfile
+
+from .genomic import GenomicDataReader
+from .records import enough_fields
+from .sam import SamReader
+from .writers import GenomicWriter, SamWriter, VcfWriter
+
+SortKey = Tuple[int, str, int]  # (ранг хромосомы, имя для неизвестных, позиция)
+
+_UNMAPPED = "*"
+
+
+# ---------- порядок хромосом ----------
+def _header_contigs(reader: GenomicDataReader) -> Iterable[str]:
+    header = reader.header
+    contigs = getattr(header, "references", None)
+    if contigs is None:
+        contigs = getattr(header, "contigs", {})
+    return contigs
+
+
+def contig_order(readers: Iterable[GenomicDataReader]) -> Dict[str, int]:
+    """Ранги хромосом по заголовкам: сначала порядок первого файла, новые — в конец."""
+    order: Dict[str, int] = {}
+    for reader in readers:
+        for name in _header_contigs(reader):
+            order.setdefault(name, len(order))
+    return order
+
+
+def sort_key(order: Mapping[str, int]) -> Callable[[str, int], SortKey]:
+    """Ключ (chrom, pos) -> сравнимый кортеж для порядка ``order``."""
+    unknown = len(order)
+
+    def key(chrom: str, pos: int) -> SortKey:
+        rank = order.get(chrom)
+        if rank is not None:
+            return rank, "", pos
+        if chrom == _UNMAPPED:
+            return unknown + 1, "", pos
+        return unknown, chrom, pos
+
+    return key
+
+
+def _record_key(order: Mapping[str, int]) -> Callable[[Mapping[str, Any]], SortKey]:
+    key = sort_key(order)
+    return lambda rec: key(rec["chrom"], rec["pos"])
+
+
+def _line_key(reader: GenomicDataReader, order: Mapping[str, int]) -> Callable[[str], SortKey]:
+    """Ключ по сырой строке: колонки хромосомы и позиции — из пресета tabix ридера."""
+    key = sort_key(order)
+    col_seq, col_beg, _ = reader._tabix_columns
+    i_seq, i_beg = col_seq - 1, col_beg - 1
+
+    def line_key(line: str) -> SortKey:
+        parts = line.split("\t", col_beg)
+        return key(parts[i_seq], int(parts[i_beg]))
+
+    return line_key
+
+
+# ---------- проверка сортировки ----------
+def is_sorted(reader: GenomicDataReader, order: Optional[Mapping[str, int]] = None) -> bool:
+    """
+    Отсортирован ли файл по (хромосома, позиция). Читает потоком и
+    останавливается на первом нарушении.
+
+    Хромосомы из заголовка должны идти в его порядке; остальные —
+    сплошными блоками (каждая встречается один раз), позиции внутри
+    хромосомы не убывают.
+    """
+    order = contig_order([reader]) if order is None else order
+    key = sort_key(order)
+    seen = set()
+    chrom: Optional[str] = None
+    last: Optional[SortKey] = None
+    for rec in reader.read(fields=["chrom", "pos"]):
+        k = key(rec["chrom"], rec["pos"])
+        if rec["chrom"] != chrom:
+            chrom = rec["chrom"]
+            if chrom in seen:
+                return False
+            seen.add(chrom)
+            if last is not None and k[0] < last[0]:
+                return False
+        elif last is not None and k[2] < last[2]:
+            return False
+        last = k
+    return True
+
+
+# ---------- k-way слияние ----------
+def merge(
+    readers: Sequence[GenomicDataReader],
+    *,
+    key: Optional[Callable[[Mapping[str, Any]], Any]] = None,
+    **read_kwargs: Any,
+) -> Iterator[Mapping[str, Any]]:
+    """
+    Слияние отсортированных файлов в один поток записей (heapq, память O(k)).
+
+    key         — ключ сортировки записи; по умолчанию (chrom, pos) с
+                  порядком хромосом из заголовков всех файлов;
+    read_kwargs — передаются в read() каждого ридера (например, lazy=True,
+                  чтобы писать результат исходными строками через писатель).
+
+    Входы должны быть отсортированы (см. is_sorted()); при равных ключах
+    записи идут в порядке файлов.
+    """
+    if key is None:
+        key = _record_key(contig_order(readers))
+    yield from heap_merge(*(r.read(**read_kwargs) for r in readers), key=key)
+
+
+# ---------- внешняя сортировка ----------
+def _spill(lines: List[Tuple[SortKey, str]], tmpdir: Optional[str]) -> str:
+    lines.sort(key=lambda item: item[0])
+    fd, path = tempfile.mkstemp(suffix=".run", dir=tmpdir)
+    with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as fh:
+        fh.writelines(line + "\n" for _, line in lines)
+    return path
+
+
+def _read_run(path: str) -> Iterator[str]:
+    with open(path, "r", encoding="utf-8", newline="\n") as fh:
+        for line in fh:
+            yield line[:-1]
+
+
+def _merge_runs(paths: Sequence[str], key: Callable[[str], SortKey]) -> Iterator[str]:
+    return heap_merge(*(_read_run(p) for p in paths), key=key)
+
+
+def _coordinate_header(lines: Sequence[str]) -> List[str]:
+    """Строки заголовка SAM с ``SO:coordinate`` в @HD."""
+    out = list(lines)
+    for i, line in enumerate(out):
+        if line.startswith("@HD"):
+            fields = [f for f in line.split("\t") if not f.startswith("SO:")]
+            out[i] = "\t".join(fields + ["SO:coordinate"])
+            return out
+    return ["@HD\tVN:1.6\tSO:coordinate"] + out
+
+
+def sort_file(
+    reader: GenomicDataReader,
+    out: str,
+    *,
+    memory: int = 256 << 20,
+    fan_in: int = 64,
+    tmpdir: Optional[str] = None,
+    **writer_kwargs: Any,
+) -> int:
+    """
+    Отсортировать SAM/VCF по (хромосома, позиция) в файл ``out``.
+
+    memory — бюджет памяти в байтах на накопление строк (с запасом на
+             объекты Python); сверх него строки сортируются и уходят во
+             временный файл в ``tmpdir``;
+    fan_in — сколько прогонов сливается за раз (больше — промежуточные слияния);
+    writer_kwargs — в SamWriter/VcfWriter (например, index=True для ``.gz``).
+
+    Заголовок копируется из входа; для SAM в @HD ставится SO:coordinate
+    (строка @HD добавляется, если её не было). Возвращает число записанных записей.
+    Сортировка устойчивая: при равных ключах сохраняется исходный порядок.
+    """
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2")
+    order = contig_order([reader])
+    line_key = _line_key(reader, order)
+    writer_cls = SamWriter if isinstance(reader, SamReader) else VcfWriter
+    runs: List[str] = []
+    try:
+        chunk: List[Tuple[SortKey, str]] = []
+        used = 0
+        min_fields = reader._min_fields
+        # строки короче записи пропускаются, как при read()
+        for line in reader._iter_body(lambda line: line if enough_fields(line, min_fields) else None):
+            chunk.append((line_key(line), line))
+            used += len(line) + 160  # строка + кортеж ключа и список: грубая оценка
+            if used >= memory:
+                runs.append(_spill(chunk, tmpdir))
+                chunk, used = [], 0
+
+        while len(runs) > fan_in:  # промежуточные слияния: не держать открытыми тысячи файлов
+            group = runs[:fan_in]
+            fd, path = tempfile.mkstemp(suffix=".run", dir=tmpdir)
+            with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as fh:
+                fh.writelines(line + "\n" for line in _merge_runs(group, line_key))
+            for p in group:
+                os.remove(p)
+            runs[:fan_in] = [path]  # слитые прогоны — самые ранние: порядок равных ключей сохраняется
+
+        chunk.sort(key=lambda item: item[0])
+        sources: List[Iterable[str]] = [_read_run(p) for p in runs]
+        sources.append(line for _, line in chunk)
+        lazy = reader._record_parser(lazy=True)  # писатель пишет LazyRecord исходной строкой
+        header = _coordinate_header(reader.header.lines) if writer_cls is SamWriter else reader.header
+        writer: GenomicWriter = writer_cls(out, header=header, **writer_kwargs)
+        with writer:
+            writer.write_all(lazy(line) for line in heap_merge(*sources, key=line_key))
+        return writer.count
+    finally:
+        for p in runs:
+            if os.path.exists(p):
+                os.remove(p)
@@ -0,0 +1,233 @@
+# src/bioformats/metacache.py
+"""
+Персистентный кэш производных метаданных файлов (SQLite).
+
+Значения, которые ридеры считают полным проходом (count, хромосомы,
+заголовок и т.п.), сохраняются в общий SQLite-файл в каталоге кэша и
+переживают перезапуск процесса:
+
+    from bioformats import metacache
+    metacache.enable()                      # ~/.cache/bioformats/metadata.sqlite
+    VcfReader("a.vcf").count()              # первый раз — проход по файлу
+    VcfReader("a.vcf").count()              # дальше — из кэша, файл не читается
+
+Ключ записи — абсолютный путь + размер + mtime (нс), опционально ещё
+хэш содержимого (первый и последний 1 МБ файла) — для ФС с ненадёжным
+mtime. Если файл изменился, его записи удаляются при следующем обращении.
+Имена значений можно разделить по пространствам имён (``namespace``):
+ридеры кладут туда класс и настройки, от которых зависит результат
+(алфавит, режим проверки), — ридеры одного файла с разными настройками
+не видят значений друг друга.
+
+Вытеснение — LRU по файлам: при превышении ``max_files`` или ``max_bytes``
+удаляются давно не запрошенные файлы. Один SQLite на тысячи мелких
+файлов — один индексированный запрос на обращение.
+
+Значения сериализуются pickle — кэш рассчитан на локальный каталог
+пользователя, а не на общий недоверенный ресурс.
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import os
+import pickle
+import sqlite3
+import time
+
+Signature = Tuple[int, int]  # (размер, mtime_ns)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path     TEXT PRIMARY KEY,
+    size     INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest   TEXT,
+    accessed REAL NOT NULL,
+    nbytes   INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS files_accessed ON files (accessed);
+CREATE TABLE IF NOT EXISTS items (
+    path  TEXT NOT NULL REFERENCES files (path) ON DELETE CASCADE,
+    name  TEXT NOT NULL,
+    value BLOB NOT NULL,
+    PRIMARY KEY (path, name)
+);
+"""
+
+_SAMPLE = 1 << 20  # байт с начала и с конца файла для хэша содержимого
+
+
+def default_cache_dir() -> str:
+    """Каталог кэша по умолчанию: ``$XDG_CACHE_HOME/bioformats`` или ``~/.cache/bioformats``."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "bioformats")
+
+
+def content_digest(filename: str) -> str:
+    """BLAKE2b от размера, первого и последнего 1 МБ файла."""
+    h = hashlib.blake2b(digest_size=16)
+    size = os.path.getsize(filename)
+    h.update(size.to_bytes(8, "little"))
+    with open(filename, "rb") as fh:
+        h.update(fh.read(_SAMPLE))
+        if size > _SAMPLE:
+            fh.seek(max(_SAMPLE, size - _SAMPLE))
+            h.update(fh.read(_SAMPLE))
+    return h.hexdigest()
+
+
+def _prefix(namespace: str) -> str:
+    """Префикс имён значений пространства ``namespace`` ("" — без префикса)."""
+    return f"{namespace}/" if namespace else ""
+
+
+class MetadataCache:
+    """
+    SQLite-хранилище {файл: {имя метрики: значение}}.
+
+    directory    — каталог кэша (по умолчанию default_cache_dir());
+    max_files    — сколько файлов держать (LRU);
+    max_bytes    — суммарный размер сериализованных значений (LRU);
+    content_hash — дополнительно сверять хэш содержимого (см. content_digest).
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        *,
+        max_files: int = 100_000,
+        max_bytes: int = 256 << 20,
+        content_hash: bool = False,
+    ) -> None:
+        self.directory = directory or default_cache_dir()
+        self.path = os.path.join(self.directory, "metadata.sqlite")
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.content_hash = content_hash
+        self._conn: Optional[sqlite3.Connection] = None
+
+    # ---------- соединение ----------
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(self.directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __getstate__(self) -> dict:
+        # соединение не сериализуется: в другом процессе откроется заново
+        state = self.__dict__.copy()
+        state["_conn"] = None
+        return state
+
+    # ---------- доступ ----------
+    def get(self, filename: str, signature: Signature, namespace: str = "") -> Dict[str, Any]:
+        """
+        Все сохранённые значения пространства имён ``namespace`` для версии
+        файла ``signature`` ({} — ничего нет или файл изменился; устаревшие
+        записи удаляются).
+        """
+        path = os.path.realpath(filename)
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, digest FROM files WHERE path = ?", (path,)
+        ).fetchone()
+        if row is None:
+            return {}
+        if (row[0], row[1]) != tuple(signature) or (
+            self.content_hash and row[2] != content_digest(filename)
+        ):
+            self.invalidate(filename)
+            return {}
+        self.conn.execute("UPDATE files SET accessed = ? WHERE path = ?", (time.time(), path))
+        prefix = _prefix(namespace)
+        rows = self.conn.execute(
+            "SELECT name, value FROM items WHERE path = ? AND substr(name, 1, ?) = ?",
+            (path, len(prefix), prefix),
+        )
+        return {name[len(prefix):]: pickle.loads(value) for name, value in rows}
+
+    def put(self, filename: str, signature: Signature, values: Dict[str, Any], namespace: str = "") -> None:
+        """Добавить значения для версии файла ``signature`` (записи другой версии заменяются)."""
+        if not values:
+            return
+        path = os.path.realpath(filename)
+        digest = content_digest(filename) if self.content_hash else None
+        prefix = _prefix(namespace)
+        blobs = [(path, prefix + name, pickle.dumps(v, protocol=pickle.HIGHEST_PROTOCOL)) for name, v in values.items()]
+        conn = self.conn
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT size, mtime_ns FROM files WHERE path = ?", (path,)).fetchone()
+            if row is not None and (row[0], row[1]) != tuple(signature):
+                conn.execute("DELETE FROM files WHERE path = ?", (path,))
+            conn.execute(
+                "INSERT INTO files (path, size, mtime_ns, digest, accessed) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (path) DO UPDATE SET accessed = excluded.accessed",
+                (path, signature[0], signature[1], digest, time.time()),
+            )
+            conn.executemany("INSERT OR REPLACE INTO items (path, name, value) VALUES (?, ?, ?)", blobs)
+            conn.execute(
+                "UPDATE files SET nbytes = (SELECT COALESCE(SUM(LENGTH(value)), 0) FROM items WHERE path = ?) "
+                "WHERE path = ?",
+                (path, path),
+            )
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Удалить давно не запрошенные файлы, пока не уложимся в лимиты."""
+        n_files, n_bytes = conn.execute("SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM files").fetchone()
+        if n_files <= self.max_files and n_bytes <= self.max_bytes:
+            return
+        victims = []
+        for path, nbytes in conn.execute("SELECT path, nbytes FROM files ORDER BY accessed"):
+            if n_files <= self.max_files and n_bytes <= self.max_bytes:
+                break
+            victims.append((path,))
+            n_files -= 1
+            n_bytes -= nbytes
+        conn.executemany("DELETE FROM files WHERE path = ?", victims)
+
+    def invalidate(self, filename: str) -> None:
+        """Забыть всё о файле."""
+        with self.conn:
+            self.conn.execute("DELETE FROM files WHERE path = ?", (os.path.realpath(filename),))
+
+    def clear(self) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM files")
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+
+# ---------- кэш по умолчанию (opt-in) ----------
+_default: Optional[MetadataCache] = None
+
+
+def enable(directory: Optional[str] = None, **kwargs: Any) -> MetadataCache:
+    """Включить общий кэш для всех ридеров, созданных без явного ``cache=``."""
+    global _default
+    _default = MetadataCache(directory, **kwargs)
+    return _default
+
+
+def disable() -> None:
+    global _default
+    if _default is not None:
+        _default.close()
+    _default = None
+
+
+def get_default() -> Optional[MetadataCache]:
+    """Текущий общий кэш (None — выключен)."""
+    return _default
@@ -0,0 +1,380 @@
+# src/bioformats/packed.py
+"""
+Компактное хранение нуклеотидов: 2 или 4 бита на основание.
+
+- 2 бита (как в UCSC .2bit): T=0, C=1, A=2, G=3, первое основание — в
+  старших битах байта. N и прочие неоднозначные основания хранятся как T
+  плюс список N-блоков; строчные буквы (soft-mask) — списком mask-блоков.
+  Коды IUPAC, кроме N, при упаковке становятся N.
+- 4 бита (как SEQ в BAM): ``=ACMGRSVTWYHKDBN``, два основания в байте
+  (первое — в старшем полубайте); регистр не сохраняется.
+
+    seq = PackedSequence.pack("ACGTNNacgt")        # 3 байта + блоки
+    seq[2:8]                                        # view без копирования
+    str(seq.reverse_complement())                   # 'acgtNNACGT'
+    seq.gc_count()                                  # по упакованным байтам
+    seq.kmers(3)                                    # uint64-коды k-меров (A=0 C=1 G=2 T=3)
+
+PackedBatch — много коротких последовательностей (риды FASTQ) в одном
+буфере: без отдельного объекта и массива на каждый рид.
+"""
+
+from __future__ import annotations
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .batch import StringColumn
+
+TWOBIT_BASES = "TCAG"
+IUPAC_BASES = "=ACMGRSVTWYHKDBN"
+
+Blocks = Tuple[np.ndarray, np.ndarray]  # (начала, концы) — 0-based полуинтервалы
+_NO_BLOCKS: Blocks = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+
+_PER_BYTE = {2: 4, 4: 2}
+
+
+def _lut(alphabet: str, default: int, fold_case: bool = True) -> np.ndarray:
+    lut = np.full(256, default, dtype=np.uint8)
+    for code, base in enumerate(alphabet):
+        lut[ord(base)] = code
+        if fold_case:
+            lut[ord(base.lower())] = code
+    return lut
+
+
+_ENC2 = _lut(TWOBIT_BASES, 4)  # 4 — неоднозначное основание (-> N-блок)
+_ENC4 = _lut(IUPAC_BASES, IUPAC_BASES.index("N"))
+_ENC4[ord("U")] = _ENC4[ord("u")] = IUPAC_BASES.index("T")
+_DEC2 = np.frombuffer(TWOBIT_BASES.encode("ascii"), dtype=np.uint8)
+_DEC4 = np.frombuffer(IUPAC_BASES.encode("ascii"), dtype=np.uint8)
+
+# комплемент: в 2-битном коде T<->A, C<->G — это xor 2; в 4-битном
+# (биты A=1, C=2, G=4, T=8) — разворот порядка битов полубайта
+_COMP4 = np.array([int(f"{c:04b}"[::-1], 2) for c in range(16)], dtype=np.uint8)
+
+# коды k-меров: A=0, C=1, G=2, T=3 (лексикографический порядок); 255 — неоднозначное
+_KMER2 = np.array([3, 1, 0, 2], dtype=np.uint8)
+_KMER4 = np.full(16, 255, dtype=np.uint8)
+for _base, _code in zip("ACGT", range(4)):
+    _KMER4[IUPAC_BASES.index(_base)] = _code
+
+# GC в упакованном байте: 2 бита — C=01, G=11 (младший бит пары);
+# 4 бита — полубайты C, G, S
+_GC_BYTE2 = np.array([bin(b & 0x55).count("1") for b in range(256)], dtype=np.int64)
+_GC_NIBBLE = np.zeros(16, dtype=np.int64)
+_GC_NIBBLE[[IUPAC_BASES.index(b) for b in "CGS"]] = 1
+_GC_BYTE4 = _GC_NIBBLE[np.arange(256) >> 4] + _GC_NIBBLE[np.arange(256) & 15]
+
+
+def as_ascii(seq: Any) -> np.ndarray:
+    """Последовательность (str, bytes, SequenceView, PackedSequence) -> uint8 ASCII-коды."""
+    if isinstance(seq, str):
+        return np.frombuffer(seq.encode("ascii", "replace"), dtype=np.uint8)
+    if isinstance(seq, (bytes, bytearray, memoryview)):
+        return np.frombuffer(seq, dtype=np.uint8)
+    if isinstance(seq, np.ndarray):
+        return seq
+    return seq.to_numpy()
+
+
+def _runs(flags: np.ndarray) -> Blocks:
+    """Отрезки подряд идущих True: (начала, концы)."""
+    if not flags.any():
+        return _NO_BLOCKS
+    edges = np.diff(np.concatenate(([0], flags.view(np.int8), [0])))
+    return np.flatnonzero(edges == 1).astype(np.int64), np.flatnonzero(edges == -1).astype(np.int64)
+
+
+def _pack_codes(codes: np.ndarray, bits: int) -> np.ndarray:
+    """Коды оснований (по одному на байт) -> упакованные байты."""
+    per = _PER_BYTE[bits]
+    pad = -len(codes) % per
+    if pad:
+        codes = np.concatenate((codes, np.zeros(pad, dtype=np.uint8)))
+    c = codes.reshape(-1, per)
+    if bits == 2:
+        return (c[:, 0] << 6) | (c[:, 1] << 4) | (c[:, 2] << 2) | c[:, 3]
+    return (c[:, 0] << 4) | c[:, 1]
+
+
+def _clip(blocks: Blocks, start: int, end: int) -> Blocks:
+    """Блоки, пересекающие [start, end), в координатах окна."""
+    starts, ends = blocks
+    if not len(starts):
+        return blocks
+    lo = int(np.searchsorted(ends, start, side="right"))
+    hi = int(np.searchsorted(starts, end, side="left"))
+    s = np.clip(starts[lo:hi], start, end) - start
+    e = np.clip(ends[lo:hi], start, end) - start
+    return s, e
+
+
+def _fill(arr: np.ndarray, blocks: Blocks, value: int, mode: str = "set") -> None:
+    for s, e in zip(blocks[0].tolist(), blocks[1].tolist()):
+        if mode == "set":
+            arr[s:e] = value
+        else:
+            arr[s:e] |= value
+
+
+class PackedSequence:
+    """
+    Последовательность в 2- или 4-битной упаковке.
+
+    Срез с шагом 1 — новый объект над теми же байтами (O(1)), индекс —
+    один символ. Сравнивается со str/bytes; ``str()``/``bytes()`` —
+    распаковка. ``data`` может лежать прямо в отображении .2bit-файла.
+    """
+
+    __slots__ = ("data", "bits", "_start", "_end", "_n_blocks", "_mask_blocks")
+
+    def __init__(
+        self,
+        data: np.ndarray,
+        length: int,
+        bits: int = 2,
+        n_blocks: Optional[Blocks] = None,
+        mask_blocks: Optional[Blocks] = None,
+        start: int = 0,
+        end: Optional[int] = None,
+    ) -> None:
+        if bits not in _PER_BYTE:
+            raise ValueError(f"bits must be 2 or 4, got {bits}")
+        self.data = data
+        self.bits = bits
+        self._start = start
+        self._end = length if end is None else end
+        self._n_blocks = n_blocks if n_blocks is not None else _NO_BLOCKS
+        self._mask_blocks = mask_blocks if mask_blocks is not None else _NO_BLOCKS
+
+    @classmethod
+    def pack(cls, seq: Any, bits: int = 2) -> "PackedSequence":
+        """Упаковать str/bytes/SequenceView (или перепаковать PackedSequence в другую разрядность)."""
+        if isinstance(seq, PackedSequence) and seq.bits == bits:
+            return seq
+        ascii_ = as_ascii(seq)
+        if bits == 2:
+            codes = _ENC2[ascii_]
+            ambiguous = codes == 4
+            n_blocks = _runs(ambiguous)
+            codes[ambiguous] = 0  # N хранится как T, как в .2bit
+            mask_blocks = _runs(ascii_ >= ord("a"))
+        elif bits == 4:
+            codes, n_blocks, mask_blocks = _ENC4[ascii_], None, None
+        else:
+            raise ValueError(f"bits must be 2 or 4, got {bits}")
+        return cls(_pack_codes(codes, bits), len(ascii_), bits, n_blocks, mask_blocks)
+
+    # ---------- протокол последовательности ----------
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def nbytes(self) -> int:
+        """Байт под упакованные основания окна (без блоков и заголовка объекта)."""
+        per = _PER_BYTE[self.bits]
+        return -(-self._end // per) - self._start // per if len(self) else 0
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[str, "PackedSequence"]:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                return str(self)[key]
+            return self._window(self._start + start, self._start + max(start, stop))
+        n = len(self)
+        if key < 0:
+            key += n
+        if not 0 <= key < n:
+            raise IndexError("PackedSequence index out of range")
+        return chr(self._window(self._start + key, self._start + key + 1).to_numpy()[0])
+
+    def _window(self, start: int, end: int) -> "PackedSequence":
+        return PackedSequence(self.data, end, self.bits, self._n_blocks, self._mask_blocks, start, end)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(str(self))
+
+    def __bytes__(self) -> bytes:
+        return self.tobytes()
+
+    def __str__(self) -> str:
+        return self.tobytes().decode("ascii")
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PackedSequence):
+            other = other.tobytes()
+        elif isinstance(other, str):
+            other = other.encode("ascii", "replace")
+        if not isinstance(other, (bytes, bytearray)):
+            return NotImplemented
+        return len(other) == len(self) and self.tobytes() == other
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        preview = str(self[:20]) + ("..." if len(self) > 20 else "")
+        return f"PackedSequence({preview!r}, length={len(self)}, bits={self.bits})"
+
+    # ---------- распаковка ----------
+    def codes(self) -> np.ndarray:
+        """Коды оснований окна (uint8, по одному на основание): 0..3 (TCAG) или 0..15 (IUPAC)."""
+        per = _PER_BYTE[self.bits]
+        b0 = self._start // per
+        raw = np.asarray(self.data[b0:-(-self._end // per)], dtype=np.uint8)
+        out = np.empty(len(raw) * per, dtype=np.uint8)
+        if self.bits == 2:
+            out[0::4] = raw >> 6
+            out[1::4] = (raw >> 4) & 3
+            out[2::4] = (raw >> 2) & 3
+            out[3::4] = raw & 3
+        else:
+            out[0::2] = raw >> 4
+            out[1::2] = raw & 15
+        off = self._start - b0 * per
+        return out[off:off + len(self)]
+
+    def n_blocks(self) -> Blocks:
+        """N-блоки окна (начала, концы) в его координатах; для 4 бит — пусто."""
+        return _clip(self._n_blocks, self._start, self._end)
+
+    def mask_blocks(self) -> Blocks:
+        """Блоки строчных (soft-masked) оснований окна; для 4 бит — пусто."""
+        return _clip(self._mask_blocks, self._start, self._end)
+
+    def to_numpy(self) -> np.ndarray:
+        """uint8 ASCII-коды оснований (как у SequenceView.to_numpy())."""
+        if self.bits == 4:
+            return _DEC4[self.codes()]
+        arr = _DEC2[self.codes()]
+        _fill(arr, self.n_blocks(), ord("N"))
+        _fill(arr, self.mask_blocks(), 0x20, mode="or")  # 'A' | 0x20 == 'a'
+        return arr
+
+    def tobytes(self) -> bytes:
+        return self.to_numpy().tobytes()
+
+    # ---------- операции над упакованной формой ----------
+    def reverse_complement(self) -> "PackedSequence":
+        """Обратный комплемент (новый объект; N- и mask-блоки отражаются)."""
+        n = len(self)
+        rev = self.codes()[::-1]
+        codes = rev ^ 2 if self.bits == 2 else _COMP4[rev]
+
+        def mirror(blocks: Blocks) -> Blocks:
+            s, e = blocks
+            return (n - e)[::-1].copy(), (n - s)[::-1].copy()
+
+        return PackedSequence(
+            _pack_codes(codes, self.bits), n, self.bits, mirror(self.n_blocks()), mirror(self.mask_blocks())
+        )
+
+    def gc_count(self) -> int:
+        """
+        Число G/C (для 4 бит — ещё S) без распаковки: целые байты окна
+        считаются по таблице на 256 значений, края — по кодам.
+        """
+        per = _PER_BYTE[self.bits]
+        first = -(-self._start // per)  # первый байт, целиком лежащий в окне
+        last = self._end // per
+        if first >= last:
+            return self._gc_codes(self.codes())
+        table = _GC_BYTE2 if self.bits == 2 else _GC_BYTE4
+        inner = int(table[np.asarray(self.data[first:last], dtype=np.uint8)].sum())
+        head = self._window(self._start, first * per).codes()
+        tail = self._window(last * per, self._end).codes()
+        return inner + self._gc_codes(head) + self._gc_codes(tail)
+
+    def _gc_codes(self, codes: np.ndarray) -> int:
+        if self.bits == 2:
+            return int(np.count_nonzero(codes & 1))  # C=1, G=3; N хранится как T=0
+        return int(_GC_NIBBLE[codes].sum())
+
+    def ambiguous(self) -> np.ndarray:
+        """bool-маска неоднозначных оснований окна (N-блоки или не-ACGT коды)."""
+        if self.bits == 4:
+            return _KMER4[self.codes()] == 255
+        mask = np.zeros(len(self), dtype=bool)
+        _fill(mask, self.n_blocks(), True)
+        return mask
+
+    def kmers(self, k: int) -> np.ndarray:
+        """
+        uint64-коды всех k-меров (k <= 32) по порядку, 2 бита на основание:
+        A=0, C=1, G=2, T=3 (коды сортируются лексикографически).
+        Окна с N/неоднозначными основаниями пропускаются.
+        """
+        if not 1 <= k <= 32:
+            raise ValueError(f"k must be in 1..32, got {k}")
+        n = len(self) - k + 1
+        if n <= 0:
+            return np.zeros(0, dtype=np.uint64)
+        codes = self.codes()
+        bad = self.ambiguous()
+        vals = (_KMER2 if self.bits == 2 else _KMER4)[codes].astype(np.uint64)
+        out = np.zeros(n, dtype=np.uint64)
+        two = np.uint64(2)
+        for j in range(k):
+            out = (out << two) | vals[j:j + n]
+        if bad.any():
+            hits = np.concatenate(([0], np.cumsum(bad)))
+            out = out[hits[k:] == hits[:n]]
+        return out
+
+
+def decode_kmer(code: int, k: int) -> str:
+    """Код k-мера (A=0, C=1, G=2, T=3) обратно в строку."""
+    return "".join("ACGT"[(int(code) >> (2 * (k - 1 - i))) & 3] for i in range(k))
+
+
+class PackedBatch:
+    """
+    Батч последовательностей в одном упакованном буфере:
+    i-я — ``seqs[offsets[i]:offsets[i + 1]]``, имя — ``ids[i]``.
+
+    На рид уходит len/4 (или len/2) байт и 8 байт смещения плюс имя в
+    StringColumn — вместо отдельного str-объекта.
+    """
+
+    __slots__ = ("ids", "offsets", "seqs")
+
+    def __init__(self, ids: StringColumn, offsets: np.ndarray, seqs: PackedSequence) -> None:
+        self.ids = ids
+        self.offsets = offsets
+        self.seqs = seqs
+
+    @classmethod
+    def from_records(cls, records: Iterable[Tuple[str, Any]], bits: int = 2) -> "PackedBatch":
+        """Упаковать пары (id, sequence) одним проходом NumPy по склеенным основаниям."""
+        names: List[bytes] = []
+        parts: List[bytes] = []
+        for sid, seq in records:
+            names.append(sid.encode("utf-8"))
+            parts.append(seq.encode("ascii", "replace") if isinstance(seq, str) else bytes(seq))
+        lengths = np.fromiter((len(p) for p in parts), dtype=np.int64, count=len(parts))
+        offsets = np.zeros(len(parts) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        name_offsets = np.zeros(len(names) + 1, dtype=np.int64)
+        np.cumsum([len(n) for n in names], out=name_offsets[1:])
+        seqs = PackedSequence.pack(b"".join(parts), bits)
+        return cls(StringColumn(name_offsets, b"".join(names)), offsets, seqs)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> Tuple[str, PackedSequence]:
+        if i < 0:
+            i += len(self)
+        seq = self.seqs[int(self.offsets[i]):int(self.offsets[i + 1])]
+        return self.ids[i], seq  # type: ignore[return-value]
+
+    def __iter__(self) -> Iterator[Tuple[str, PackedSequence]]:
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def nbytes(self) -> int:
+        """Память батча: упакованные основания, блоки, смещения и имена."""
+        blocks = sum(a.nbytes for a in (*self.seqs._n_blocks, *self.seqs._mask_blocks))
+        return self.seqs.nbytes + blocks + self.offsets.nbytes + self.ids.offsets.nbytes + len(self.ids.data)
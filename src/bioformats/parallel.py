@@ -0,0 +1,230 @@
+# src/bioformats/parallel.py
+"""
+Параллельный разбор больших файлов по диапазонам байт.
+
+Файл режется на диапазоны [start, end]; каждый диапазон разбирается
+в отдельном процессе. Запись принадлежит диапазону, в котором лежит
+её первый байт:
+
+- воркер с ``start > 0`` отбрасывает первую (возможно, неполную) строку
+  и синхронизируется до ближайшего начала записи;
+- читает записи, пока начало записи ``<= end`` (последнюю дочитывает
+  за границей диапазона).
+
+Начало записи зависит от формата (``_chunk_kind`` ридера):
+- "line"  — каждая строка (SAM, VCF);
+- "fasta" — строка '>';
+- "fastq" — строка '@', через одну от которой идёт строка '+'.
+
+Для BGZF диапазоны выравниваются по блокам и задаются виртуальными
+смещениями; обычный gzip не делится и разбирается одним воркером.
+
+Агрегаты (count, average_length, chrom_counts) считаются внутри воркеров —
+в родительский процесс возвращаются только числа, а не записи.
+"""
+
+from __future__ import annotations
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import gzip
+import os
+
+from .reader import Reader
+from .bgzf import BgzfReader, iter_blocks, make_virtual_offset
+
+ByteRange = Tuple[int, Optional[int]]  # (start, end); end=None — до конца файла
+
+
+def split_ranges(reader: Reader, chunk_size: int = 32 << 20) -> List[ByteRange]:
+    """Нарезать файл ридера на диапазоны примерно по ``chunk_size`` байт (сжатых для BGZF)."""
+    if reader._is_bgzf:
+        starts: List[int] = []
+        next_cut = 0
+        for offset, _bsize, isize in iter_blocks(reader.filename):
+            if isize and offset >= next_cut:
+                starts.append(offset)
+                next_cut = offset + chunk_size
+        bounds = [make_virtual_offset(o, 0) for o in starts] or [0]
+        bounds[0] = 0
+    elif reader._is_gz:
+        return [(0, None)]
+    else:
+        size = os.path.getsize(reader.filename)
+        bounds = list(range(0, max(size, 1), chunk_size))
+    return [(b, bounds[i + 1] if i + 1 < len(bounds) else None) for i, b in enumerate(bounds)]
+
+
+# ---------- воркер ----------
+def _open_binary(reader: Reader):
+    if reader._is_bgzf:
+        return BgzfReader(reader.filename)
+    if reader._is_gz:
+        return gzip.open(reader.filename, "rb")
+    return open(reader.filename, "rb")
+
+
+def _positioned_lines(fh, start: int, encoding: Optional[str]) -> Iterator[Tuple[int, Any]]:
+    """
+    (позиция начала строки, строка без пробельных краёв) от ``start``.
+    encoding=None — строки остаются bytes (для ридеров с binary=True).
+    """
+    fh.seek(start)
+    if start > 0:
+        fh.readline()  # хвост строки, начатой в предыдущем диапазоне
+    while True:
+        pos = fh.tell()
+        line = fh.readline()
+        if not line:
+            return
+        yield pos, (line.decode(encoding) if encoding else line).strip()
+
+
+def _chunk_lines(kind: str, fh, start: int, end: Optional[int], encoding: Optional[str]) -> Iterator[Any]:
+    """Строки записей, принадлежащих диапазону [start, end]."""
+    stream = _positioned_lines(fh, start, encoding)
+    gt, at, plus = (">", "@", "+") if encoding else (b">", b"@", b"+")
+
+    def past_end(pos: int) -> bool:
+        return end is not None and pos > end
+
+    if kind == "line":
+        for pos, line in stream:
+            if past_end(pos):
+                return
+            yield line
+
+    elif kind == "fasta":
+        synced = start == 0
+        for pos, line in stream:
+            if line.startswith(gt):
+                if past_end(pos):
+                    return
+                synced = True
+            if synced:
+                yield line
+
+    elif kind == "fastq":
+        window: deque = deque()
+        lines = ((p, l) for p, l in stream if l)
+        # синхронизация: '@'-строка, у которой через одну стоит '+'
+        for item in lines:
+            window.append(item)
+            if len(window) < 3:
+                continue
+            if window[0][1].startswith(at) and window[2][1].startswith(plus):
+                break
+            window.popleft()
+        else:
+            return
+        pending = list(window)
+        while True:
+            while len(pending) < 4:
+                nxt = next(lines, None)
+                if nxt is None:
+                    break
+                pending.append(nxt)
+            if not pending or past_end(pending[0][0]):
+                return
+            for _, line in pending[:4]:
+                yield line
+            if len(pending) < 4:
+                return
+            pending = pending[4:]
+
+    else:
+        raise ValueError(f"Unknown chunk kind: {kind!r}")
+
+
+Task = Union[str, Callable[[Iterable[Any]], Any]]  # имя агрегата или функция от записей диапазона
+
+
+def _run_chunk(reader: Reader, rng: ByteRange, task: Task) -> Any:
+    """Разобрать один диапазон и вернуть записи или агрегат (выполняется в воркере)."""
+    start, end = rng
+    with _open_binary(reader) as fh:
+        encoding = None if reader.binary else reader.encoding
+        lines = _chunk_lines(reader._chunk_kind, fh, start, end, encoding)  # type: ignore[attr-defined]
+        records = reader._parse_lines(lines)  # type: ignore[attr-defined]
+        if callable(task):
+            return task(records)
+        if task == "records":
+            return list(records)
+        if task == "count":
+            return sum(1 for _ in records)
+        if task == "lengths":
+            n = total = 0
+            for _, seq in records:
+                n += 1
+                total += len(seq)
+            return n, total
+        if task == "chroms":
+            return Counter(rec["chrom"] for rec in records)
+    raise ValueError(f"Unknown task: {task!r}")
+
+
+class ParallelReader:
+    """
+    Обёртка над ридером для разбора файла в пуле процессов.
+
+        with_pool = ParallelReader(FastqReader("big.fq"), workers=8)
+        n = with_pool.count()
+        for seq_id, seq in with_pool.read():   # порядок как в файле
+            ...
+
+    ordered=False — записи отдаются по мере готовности диапазонов.
+    """
+
+    def __init__(
+        self,
+        reader: Reader,
+        workers: Optional[int] = None,
+        *,
+        chunk_size: int = 32 << 20,
+        ordered: bool = True,
+    ) -> None:
+        if not hasattr(reader, "_chunk_kind") or not hasattr(reader, "_parse_lines"):
+            raise TypeError(f"{type(reader).__name__} does not support parallel parsing")
+        self.reader = reader
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.ordered = ordered
+
+    def _map(self, task: Task) -> Iterator[Any]:
+        ranges = split_ranges(self.reader, self.chunk_size)
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(ranges))) as pool:
+            futures = [pool.submit(_run_chunk, self.reader, rng, task) for rng in ranges]
+            done = futures if self.ordered else as_completed(futures)
+            for fut in done:
+                yield fut.result()
+
+    def read(self) -> Iterator[Any]:
+        """Записи всех диапазонов (в порядке файла при ordered=True)."""
+        for chunk in self._map("records"):
+            yield from chunk
+
+    def map_records(self, func: Callable[[Iterable[Any]], Any]) -> Iterator[Any]:
+        """
+        ``func(записи диапазона)`` в каждом воркере; в родительский процесс
+        возвращаются только результаты. func должна сериализоваться pickle
+        (функция модуля или functools.partial от неё).
+        """
+        return self._map(func)
+
+    def count(self) -> int:
+        return sum(self._map("count"))
+
+    def average_length(self) -> float:
+        """Средняя длина последовательностей (для FASTA/FASTQ)."""
+        n = total = 0
+        for cn, ct in self._map("lengths"):
+            n += cn
+            total += ct
+        return (total / n) if n else 0.0
+
+    def chrom_counts(self) -> Dict[str, int]:
+        """Число записей по хромосомам (для SAM/VCF)."""
+        total: Counter = Counter()
+        for part in self._map("chroms"):
+            total.update(part)
+        return dict(total)
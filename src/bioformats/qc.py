@@ -0,0 +1,166 @@
+# src/bioformats/qc.py
+"""
+Потоковый QC для FASTQ на NumPy.
+
+FastqQC накапливает статистику батчами ридов и держит в памяти только
+фиксированные матрицы размера (длина рида × 94), а не все значения:
+
+- гистограмма качества по позициям:  qual_hist[pos, phred]   (Phred 0–93)
+- состав оснований по позициям:      base_counts[pos, A/C/G/T/N]
+- распределение длин ридов:          length_counts[len]
+
+Из гистограмм считаются среднее и квартили качества по позициям —
+память O(max_len × 94) независимо от числа ридов. Риды разной длины
+и кодировки Phred+33 / Phred+64 поддерживаются.
+"""
+
+from __future__ import annotations
+from typing import Iterable, List, Sequence, Tuple, Union
+import numpy as np
+
+MAX_PHRED = 93
+N_QUAL = MAX_PHRED + 1
+BASES = ("A", "C", "G", "T", "N")
+
+# байт -> индекс основания (всё, кроме ACGT, считается N)
+_BASE_LUT = np.full(256, 4, dtype=np.uint8)
+for _i, _b in enumerate("ACGT"):
+    _BASE_LUT[ord(_b)] = _BASE_LUT[ord(_b.lower())] = _i
+
+
+def _as_bytes(items: Sequence[Union[str, bytes]]) -> bytes:
+    """Склеить строки (str или bytes) в один ASCII-буфер."""
+    if items and isinstance(items[0], bytes):
+        return b"".join(items)  # type: ignore[arg-type]
+    return "".join(items).encode("ascii")  # type: ignore[arg-type]
+
+
+def decode_qualities(qual: Union[str, bytes], phred_offset: int = 33) -> np.ndarray:
+    """Строка качества -> массив Phred (uint8), с проверкой диапазона."""
+    raw = np.frombuffer(qual if isinstance(qual, bytes) else qual.encode("ascii"), dtype=np.uint8)
+    if raw.size and (raw.min() < phred_offset or raw.max() > phred_offset + MAX_PHRED):
+        raise ValueError(
+            f"Quality string out of range for Phred+{phred_offset}: {qual!r}"
+        )
+    return raw - np.uint8(phred_offset)
+
+
+def guess_phred_offset(quals: Iterable[Union[str, bytes]]) -> int:
+    """Угадать кодировку по символам качества: есть символ < ';' -> 33, иначе 64."""
+    lo = 255
+    for q in quals:
+        if q:
+            lo = min(lo, min(q if isinstance(q, bytes) else q.encode("ascii")))
+        if lo < 59:
+            return 33
+    return 64 if lo != 255 else 33
+
+
+class FastqQC:
+    """
+    Аккумулятор QC-статистики.
+
+        qc = FastqQC()
+        qc.add_reader(FastqReader("reads.fq"))
+        qc.mean_quality()          # средний Phred по позициям
+        qc.quantiles()             # (3, L): Q1, медиана, Q3
+        qc.base_content()          # (L, 5): % A/C/G/T/N
+    """
+
+    def __init__(self, phred_offset: int = 33) -> None:
+        self.phred_offset = phred_offset
+        self.n_reads = 0
+        self.qual_hist = np.zeros((0, N_QUAL), dtype=np.int64)
+        self.base_counts = np.zeros((0, len(BASES)), dtype=np.int64)
+        self.length_counts = np.zeros(0, dtype=np.int64)
+
+    # ---------- накопление ----------
+    def _grow(self, length: int) -> None:
+        have = self.qual_hist.shape[0]
+        if length <= have:
+            return
+        self.qual_hist = np.vstack([self.qual_hist, np.zeros((length - have, N_QUAL), dtype=np.int64)])
+        self.base_counts = np.vstack([self.base_counts, np.zeros((length - have, len(BASES)), dtype=np.int64)])
+
+    def update(self, seqs: Sequence[Union[str, bytes]], quals: Sequence[Union[str, bytes]]) -> None:
+        """Добавить батч ридов (последовательности и строки качества; str или bytes)."""
+        if not seqs:
+            return
+        lens = np.fromiter((len(s) for s in seqs), dtype=np.int64, count=len(seqs))
+        total = int(lens.sum())
+        max_len = int(lens.max())
+        self._grow(max_len)
+
+        ends = np.cumsum(lens)
+        # позиция внутри рида для каждого символа склеенного батча
+        pos = np.arange(total, dtype=np.int64) - np.repeat(ends - lens, lens)
+
+        q = np.frombuffer(_as_bytes(quals), dtype=np.uint8).astype(np.int64)
+        if q.size != total:
+            raise ValueError("Sequence and quality lengths differ in batch")
+        q -= self.phred_offset
+        if total and (q.min() < 0 or q.max() > MAX_PHRED):
+            raise ValueError(f"Quality values out of range for Phred+{self.phred_offset}")
+        self.qual_hist[:max_len] += np.bincount(
+            pos * N_QUAL + q, minlength=max_len * N_QUAL
+        ).reshape(max_len, N_QUAL)
+
+        b = _BASE_LUT[np.frombuffer(_as_bytes(seqs), dtype=np.uint8)]
+        self.base_counts[:max_len] += np.bincount(
+            pos * len(BASES) + b, minlength=max_len * len(BASES)
+        ).reshape(max_len, len(BASES))
+
+        lc = np.bincount(lens)
+        if lc.size > self.length_counts.size:
+            self.length_counts = np.concatenate(
+                [self.length_counts, np.zeros(lc.size - self.length_counts.size, dtype=np.int64)]
+            )
+        self.length_counts[: lc.size] += lc
+        self.n_reads += len(seqs)
+
+    def add_records(self, records: Iterable[Tuple[str, str, str]], batch_size: int = 10000) -> "FastqQC":
+        """Добавить записи (id, seq, qual) батчами по ``batch_size``."""
+        seqs: List[str] = []
+        quals: List[str] = []
+        for _sid, seq, qual in records:
+            seqs.append(seq)
+            quals.append(qual)
+            if len(seqs) >= batch_size:
+                self.update(seqs, quals)
+                seqs, quals = [], []
+        self.update(seqs, quals)
+        return self
+
+    def add_reader(self, reader, batch_size: int = 10000) -> "FastqQC":
+        """Пройти FastqReader одним проходом."""
+        with reader:
+            return self.add_records(reader._iter_fastq_triplets(), batch_size)
+
+    # ---------- результаты ----------
+    @property
+    def max_length(self) -> int:
+        return self.qual_hist.shape[0]
+
+    def coverage(self) -> np.ndarray:
+        """Сколько ридов покрывает каждую позицию."""
+        return self.qual_hist.sum(axis=1)
+
+    def mean_quality(self) -> np.ndarray:
+        """Средний Phred по позициям."""
+        cov = self.coverage()
+        sums = self.qual_hist @ np.arange(N_QUAL)
+        return np.divide(sums, cov, out=np.zeros(len(cov)), where=cov > 0)
+
+    def quantiles(self, qs: Sequence[float] = (0.25, 0.5, 0.75)) -> np.ndarray:
+        """Квантили Phred по позициям из гистограмм, форма (len(qs), L)."""
+        cum = self.qual_hist.cumsum(axis=1)
+        cov = cum[:, -1] if cum.size else np.zeros(0, dtype=np.int64)
+        out = np.empty((len(qs), self.max_length), dtype=np.int64)
+        for i, q in enumerate(qs):
+            out[i] = (cum < np.ceil(q * cov)[:, None]).sum(axis=1)
+        return out
+
+    def base_content(self) -> np.ndarray:
+        """Доля оснований A/C/G/T/N по позициям (в процентах), форма (L, 5)."""
+        tot = self.base_counts.sum(axis=1, keepdims=True)
+        return np.divide(100.0 * self.base_counts, tot, out=np.zeros(self.base_counts.shape), where=tot > 0)
@@ -1,35 +1,79 @@
 # src/bioformats/reader.py
 from __future__ import annotations
-from typing import Iterator, Optional, Callable, TextIO
+from typing import Iterator, Optional, Callable, TextIO, Tuple
 from contextlib import contextmanager
 import io
 import os
 import gzip
 
+from .bgzf import BgzfReader, is_bgzf
+from .inflate import ThreadedGzipReader
+
 class Reader:
     """
     Универсальный базовый ридер с «курсором» (self._fh).
     - Управляет ресурсом (open/close, контекстный менеджер)
     - Даёт итераторы строк (лениво), peek следующей строки,
       позиционирование (seek/tell), пропуск хедеров и т.д.
-    - Прозрачно работает с .gz (text mode)
+    - Прозрачно работает с .gz (text mode); для BGZF (bgzip) — с
+      произвольным доступом: tell()/seek() работают с виртуальными смещениями
+    - binary=True — байтовый режим: строки отдаются как bytes без
+      декодирования UTF-8, iter_lines() режет крупные блоки (read + split)
+    - threads=N (N > 1) — распаковка сжатых файлов в потоках: блоки BGZF
+      распаковываются наперёд в пуле из N потоков, обычный gzip —
+      в фоновом потоке с очередью предвыборки (см. inflate.py)
     """
 
-    def __init__(self, filename: str, encoding: str = "utf-8", gz: Optional[bool] = None):
+    # атрибуты ридера, от которых зависят кэшируемые метрики (см. StatsCache)
+    _cache_settings: Tuple[str, ...] = ()
+
+    def __init__(
+        self,
+        filename: str,
+        encoding: str = "utf-8",
+        gz: Optional[bool] = None,
+        binary: bool = False,
+        threads: int = 1,
+    ):
         self.filename = filename
         self.encoding = encoding
+        self.binary = binary
+        self.threads = threads
         # auto-detect gzip by extension, unless forced via gz=
-        self._is_gz = gz if gz is not None else filename.endswith(".gz")
+        self._is_gz = gz if gz is not None else filename.endswith((".gz", ".bgz"))
+        # BGZF — частный случай gzip, определяется по заголовку первого блока
+        self._is_bgzf = self._is_gz and is_bgzf(filename)
         self._fh: Optional[TextIO] = None
         self._peek_buf: Optional[str] = None  # буфер для peek_line()
 
+    def _cache_namespace(self) -> str:
+        """Пространство имён в кэше метаданных: класс ридера и настройки из ``_cache_settings``."""
+        parts = []
+        for name in self._cache_settings:
+            value = getattr(self, name)
+            if isinstance(value, (set, frozenset)):
+                value = "".join(sorted(value))
+            parts.append(f"{name}={value!r}")
+        return f"{type(self).__name__}({', '.join(parts)})"
+
     # ---------- lifecycle ----------
     def open(self) -> None:
         if self._fh is not None and not self._fh.closed:
             return
-        if self._is_gz:
-            # gzip в текстовом режиме с нужной кодировкой
-            self._fh = io.TextIOWrapper(gzip.open(self.filename, "rb"), encoding=self.encoding)
+        if self._is_bgzf:
+            # поблочное чтение: seek/tell за O(block) по виртуальным смещениям
+            self._fh = BgzfReader(  # type: ignore[assignment]
+                self.filename, text=not self.binary, encoding=self.encoding, threads=self.threads
+            )
+        elif self._is_gz:
+            if self.threads > 1:
+                raw = io.BufferedReader(ThreadedGzipReader(self.filename, prefetch=2 * self.threads))
+            else:
+                raw = gzip.open(self.filename, "rb")
+            # gzip: байты как есть или текстовый режим с нужной кодировкой
+            self._fh = raw if self.binary else io.TextIOWrapper(raw, encoding=self.encoding)  # type: ignore[assignment]
+        elif self.binary:
+            self._fh = open(self.filename, "rb")  # type: ignore[assignment]
         else:
             self._fh = open(self.filename, "r", encoding=self.encoding)
 
@@ -52,14 +96,37 @@ class Reader:
     def __exit__(self, exc_type, exc, tb) -> None:
         self.close()
 
+    def __getstate__(self) -> dict:
+        # открытый файл не сериализуется: копия ридера (например, в другом
+        # процессе) откроет файл заново сама
+        state = self.__dict__.copy()
+        state["_fh"] = None
+        state["_peek_buf"] = None
+        return state
+
+    @contextmanager
+    def _session(self):
+        """
+        Открыть файл на время блока, если он ещё не открыт.
+        Закрывает файл только если сам его открыл — удобно для
+        точечных запросов (seek + read) внутри внешнего ``with reader:``.
+        """
+        was_open = self._fh is not None and not self._fh.closed
+        self.open()
+        try:
+            yield self
+        finally:
+            if not was_open:
+                self.close()
+
     # ---------- cursor utils ----------
     def tell(self) -> int:
-        """Текущая позиция курсора (байты)."""
+        """Текущая позиция курсора (байты; для BGZF — виртуальное смещение)."""
         assert self._fh is not None, "Reader is not open"
         return self._fh.tell()
 
     def seek(self, pos: int, whence: int = os.SEEK_SET) -> None:
-        """Переместить курсор (байты). Сбрасывает peek-буфер."""
+        """Переместить курсор (байты; для BGZF — виртуальное смещение). Сбрасывает peek-буфер."""
         assert self._fh is not None, "Reader is not open"
         self._fh.seek(pos, whence)
         self._peek_buf = None
@@ -72,7 +139,7 @@ class Reader:
             line, self._peek_buf = self._peek_buf, None
             return line
         line = self._fh.readline()
-        if line == "":
+        if not line:
             return None
         return line
 
@@ -81,7 +148,7 @@ class Reader:
         assert self._fh is not None, "Reader is not open"
         if self._peek_buf is None:
             self._peek_buf = self._fh.readline()
-            if self._peek_buf == "":
+            if not self._peek_buf:
                 self._peek_buf = None
         return self._peek_buf
 
@@ -89,14 +156,40 @@ class Reader:
         """
         Ленивый генератор строк от текущей позиции.
         Учитывает peek-буфер. Ничего не грузит целиком в память.
+
+        В байтовом режиме со strip=True файл читается блоками по 1 МБ и
+        режется на строки в C (bytes.split) — tell() внутри такого цикла
+        не отражает позицию текущей строки.
         """
         self.open()
+        if self.binary and strip:
+            return self._iter_lines_binary()
+        return self._iter_lines_text(strip)
+
+    def _iter_lines_text(self, strip: bool) -> Iterator[str]:
         while True:
             line = self._readline()
             if line is None:
                 break
             yield line.strip() if strip else line
 
+    def _iter_lines_binary(self, size: int = 1 << 20) -> Iterator[bytes]:
+        """Строки (bytes, без пробельных краёв) из крупных блоков."""
+        assert self._fh is not None
+        if self._peek_buf is not None:
+            line, self._peek_buf = self._peek_buf, None
+            yield line.strip()  # type: ignore[misc]
+        tail = b""
+        while True:
+            chunk = self._fh.read(size)
+            if not chunk:
+                break
+            lines = (tail + chunk).split(b"\n")  # type: ignore[operator]
+            tail = lines.pop()
+            yield from map(bytes.strip, lines)
+        if tail:
+            yield tail.strip()
+
     def iter_until(self, stop_pred: Callable[[str], bool], include_stop: bool = False) -> Iterator[str]:
         """
         Идём по строкам, пока stop_pred(line) == False.
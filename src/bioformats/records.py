@@ -0,0 +1,117 @@
+# src/bioformats/records.py
+"""
+Проекция полей и ленивые записи для табличных форматов (SAM, VCF).
+
+Схема полей ридера (``_fields``) — упорядоченный словарь:
+    имя -> (индекс колонки, функция декодирования)
+
+- make_projection() — парсер, который режет строку только до последней
+  нужной колонки и декодирует только запрошенные поля;
+- LazyRecord        — Mapping поверх сырой строки: split и декодирование
+  происходят при первом обращении к полю (результат кэшируется).
+
+Оба парсера, как и полный разбор ридера, отбрасывают (None) строки, где
+колонок меньше ``min_fields`` (``_min_fields`` ридера): набор записей не
+зависит от режима чтения.
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+FieldSpec = Tuple[int, Callable[[str], Any]]  # (индекс колонки, декодер)
+
+
+def _select(schema: Dict[str, FieldSpec], fields: Optional[Sequence[str]]) -> List[Tuple[str, int, Callable[[str], Any]]]:
+    names = list(schema) if fields is None else list(fields)
+    unknown = [f for f in names if f not in schema]
+    if unknown:
+        raise KeyError(f"Unknown fields: {unknown}; available: {list(schema)}")
+    return [(name, *schema[name]) for name in names]
+
+
+def enough_fields(line: str, min_fields: int) -> bool:
+    """Есть ли в строке хотя бы ``min_fields`` колонок (счёт табуляций, без split)."""
+    return min_fields <= 1 or line.count("\t") >= min_fields - 1
+
+
+def make_projection(
+    schema: Dict[str, FieldSpec], fields: Sequence[str], min_fields: int = 0
+) -> Callable[[str], Optional[Dict[str, Any]]]:
+    """
+    Парсер строки -> словарь только с полями ``fields``.
+    Строка режется не дальше последней нужной колонки; строки,
+    в которых этой колонки нет или колонок меньше ``min_fields``,
+    отбрасываются (None).
+    """
+    specs = _select(schema, fields)
+    need = max(idx for _, idx, _ in specs) + 1
+
+    def parse(line: str) -> Optional[Dict[str, Any]]:
+        if not enough_fields(line, min_fields):
+            return None
+        parts = line.split("\t", need)
+        if len(parts) < need:
+            return None
+        return {name: conv(parts[idx]) for name, idx, conv in specs}
+
+    return parse
+
+
+class LazyRecord(Mapping[str, Any]):
+    """
+    Запись, которая хранит сырую строку и декодирует поля по требованию.
+
+        rec = LazyRecord(line, schema)
+        rec["pos"]     # split (один раз) + int() только для pos
+        rec.raw        # исходная строка без изменений
+        dict(rec)      # материализовать все поля
+
+    Ведёт себя как обычный dict-рекорд ридера (get, in, keys, ...).
+    """
+
+    __slots__ = ("raw", "_schema", "_maxsplit", "_parts", "_cache")
+
+    def __init__(self, raw: str, schema: Dict[str, FieldSpec], maxsplit: int = -1) -> None:
+        self.raw = raw
+        self._schema = schema
+        self._maxsplit = maxsplit  # split не дальше последней колонки схемы
+        self._parts: Optional[List[str]] = None
+        self._cache: Dict[str, Any] = {}
+
+    def __getitem__(self, name: str) -> Any:
+        cache = self._cache
+        if name in cache:
+            return cache[name]
+        idx, conv = self._schema[name]
+        if self._parts is None:
+            self._parts = self.raw.split("\t", self._maxsplit)
+        if idx >= len(self._parts):
+            raise ValueError(f"Malformed record (no column {idx + 1}): {self.raw!r}")
+        value = cache[name] = conv(self._parts[idx])
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._schema)
+
+    def __len__(self) -> int:
+        return len(self._schema)
+
+    def __repr__(self) -> str:
+        return f"LazyRecord({self.raw!r})"
+
+
+def make_lazy(
+    schema: Dict[str, FieldSpec], fields: Optional[Sequence[str]] = None, min_fields: int = 0
+) -> Callable[[str], Optional[LazyRecord]]:
+    """
+    Фабрика ленивых записей (опционально — только с полями ``fields``);
+    строки, где колонок меньше ``min_fields`` или нет колонок схемы, — None.
+    """
+    sub = {name: (idx, conv) for name, idx, conv in _select(schema, fields)}
+    maxsplit = max(idx for idx, _ in sub.values()) + 1
+    need = max(min_fields, maxsplit)
+
+    def parse(line: str) -> Optional[LazyRecord]:
+        return LazyRecord(line, sub, maxsplit) if enough_fields(line, need) else None
+
+    return parse
@@ -0,0 +1,100 @@
+# src/bioformats/regions.py
+"""
+Наборы геномных регионов: чтение BED, сортировка и слияние интервалов.
+
+Координаты регионов — как у filter_by_region(): 1-based, включительно
+(``start <= pos <= end``). BED (0-based, полуинтервал) переводится при чтении.
+"""
+
+from __future__ import annotations
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Tuple, Union
+import bisect
+import os
+
+
+class Region(NamedTuple):
+    """Регион chrom:start-end (1-based, включительно)."""
+
+    chrom: str
+    start: int
+    end: int
+
+
+def read_bed(path: Union[str, os.PathLike]) -> Iterator[Region]:
+    """Прочитать регионы из BED (первые три колонки; track/browser/# пропускаются)."""
+    with open(path, "r", encoding="utf-8") as fh:
+        for line in fh:
+            if not line.strip() or line.startswith(("#", "track", "browser")):
+                continue
+            chrom, start, end = line.split("\t", 3)[:3]
+            yield Region(chrom, int(start) + 1, int(end))
+
+
+class RegionSet:
+    """
+    Отсортированные и слитые регионы по хромосомам.
+
+    Исходные регионы сохраняются, чтобы для каждой позиции можно было
+    сказать, в какие именно из них она попала.
+    """
+
+    def __init__(self, regions: Iterable[Tuple[str, int, int]]) -> None:
+        by_chrom: Dict[str, List[Region]] = {}
+        for r in regions:
+            r = Region(*r)
+            if r.end >= r.start:
+                by_chrom.setdefault(r.chrom, []).append(r)
+
+        # слитые интервалы: [start, end, [исходные регионы (по возрастанию start)]]
+        self._merged: Dict[str, List[Tuple[int, int, List[Region]]]] = {}
+        self._starts: Dict[str, List[int]] = {}
+        for chrom, items in by_chrom.items():
+            items.sort(key=lambda r: (r.start, r.end))
+            merged: List[Tuple[int, int, List[Region]]] = []
+            for r in items:
+                if merged and r.start <= merged[-1][1] + 1:
+                    start, end, members = merged[-1]
+                    members.append(r)
+                    merged[-1] = (start, max(end, r.end), members)
+                else:
+                    merged.append((r.start, r.end, [r]))
+            self._merged[chrom] = merged
+            self._starts[chrom] = [m[0] for m in merged]
+
+    def __contains__(self, chrom: object) -> bool:
+        return chrom in self._merged
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._merged.values())
+
+    @property
+    def chromosomes(self) -> List[str]:
+        return list(self._merged)
+
+    def intervals(self, chrom: str) -> List[Tuple[int, int]]:
+        """Слитые интервалы хромосомы (1-based, включительно), по возрастанию."""
+        return [(s, e) for s, e, _ in self._merged.get(chrom, ())]
+
+    def hits(self, chrom: str, pos: int) -> List[Region]:
+        """Исходные регионы, содержащие позицию (пустой список — промах)."""
+        return self.overlapping(chrom, pos, pos)
+
+    def overlapping(self, chrom: str, start: int, end: int) -> List[Region]:
+        """Исходные регионы, пересекающие [start, end] (1-based, включительно)."""
+        starts = self._starts.get(chrom)
+        if not starts:
+            return []
+        merged = self._merged[chrom]
+        # слитые интервалы не пересекаются: идём назад от последнего с началом <= end
+        hi = bisect.bisect_right(starts, end)
+        lo = hi
+        while lo > 0 and merged[lo - 1][1] >= start:
+            lo -= 1
+        out = []
+        for _, _, members in merged[lo:hi]:
+            for r in members:
+                if r.start > end:
+                    break
+                if r.end >= start:
+                    out.append(r)
+        return out
@@ -1,14 +1,101 @@
 # sam.py
 from __future__ import annotations
-from typing import Iterator, Dict, Any
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
 
+from .cigar import cigar_reference_length, reference_end
+from .coverage import CoverageRun, coverage_runs, depth
 from .genomic import GenomicDataReader
+from .header import SamHeader
+
+# декодеры значений опциональных тегов по типу (TAG:TYPE:VALUE); B и прочие — строкой
+_TAG_TYPES: Dict[str, Callable[[str], Any]] = {"i": int, "f": float}
+
+TagPredicate = Any  # значение для сравнения или callable(value) -> bool
+
+
+def parse_tag(token: str) -> Tuple[str, Any]:
+    """'NM:i:3' -> ('NM', 3); значение декодируется по типу (i, f; остальные — str)."""
+    tag, typ, value = token.split(":", 2)
+    return tag, _TAG_TYPES.get(typ, str)(value)
+
+
+def alignment_filter(
+    require_flags: int = 0,
+    exclude_flags: int = 0,
+    min_mapq: int = 0,
+    tags: Optional[Mapping[str, TagPredicate]] = None,
+) -> Optional[Callable[[List[str]], bool]]:
+    """
+    Предикат по колонкам строки SAM (None — фильтров нет).
+
+    Флаг и MAPQ — int() и битовые проверки, без построения записи.
+    Опциональные теги (колонки с 12-й) разбираются, только если задан
+    ``tags`` и запись прошла флаги/MAPQ: значение сравнивается на
+    равенство или передаётся в callable. Запись без нужного тега
+    отбрасывается. Без ``tags`` достаточно ``line.split("\\t", 5)``.
+    """
+    if not (require_flags or exclude_flags or min_mapq or tags):
+        return None
+    wanted = dict(tags or {})
+
+    def keep(parts: List[str]) -> bool:
+        flag = int(parts[1])
+        if flag & require_flags != require_flags or flag & exclude_flags:
+            return False
+        if min_mapq and int(parts[4]) < min_mapq:
+            return False
+        if wanted:
+            found = dict(parse_tag(token) for token in parts[11:] if token[:2] in wanted)
+            for name, expected in wanted.items():
+                if name not in found:
+                    return False
+                value = found[name]
+                if not (expected(value) if callable(expected) else value == expected):
+                    return False
+        return True
+
+    return keep
 
 
 class SamReader(GenomicDataReader):
     """Класс для чтения SAM файлов."""
 
-    def read(self) -> Iterator[Dict[str, Any]]:
+    # пресет tabix: формат SAM, колонки RNAME/POS, конец — по CIGAR
+    _tabix_format = 1
+    _tabix_columns = (3, 4, 0)
+    _meta_char = "@"
+    _batch_schema = {
+        "qname": (0, "str"),
+        "flag": (1, "uint16"),
+        "chrom": (2, "category"),
+        "pos": (3, "int32"),
+        "mapq": (4, "uint8"),
+        "cigar": (5, "str"),
+        "seq": (9, "str"),
+    }
+    _header_class = SamHeader
+    _min_fields = 11
+
+    _fields = {
+        "qname": (0, str),
+        "flag": (1, int),
+        "chrom": (2, str),
+        "pos": (3, int),
+        "mapq": (4, int),
+        "cigar": (5, str),
+        "seq": (9, str),
+    }
+
+    def read(
+        self,
+        fields: Optional[List[str]] = None,
+        lazy: bool = False,
+        *,
+        require_flags: int = 0,
+        exclude_flags: int = 0,
+        min_mapq: int = 0,
+        tags: Optional[Mapping[str, TagPredicate]] = None,
+    ) -> Iterator[Dict[str, Any]]:
         """
         Ленивое чтение выравниваний из SAM файла.
 
@@ -17,39 +104,90 @@ class SamReader(GenomicDataReader):
           - flag:  флаг
           - chrom: референсная последовательность
           - pos:   позиция (1-based)
+          - mapq:  качество картирования
           - cigar: CIGAR-строка
           - seq:   нуклеотидная последовательность
+
+        read(fields=["chrom", "pos"]) — только эти ключи (строка режется
+        до 4-й колонки); read(lazy=True) — LazyRecord с разбором по требованию.
+
+        Фильтры проверяются по сырой строке до построения записи:
+          - require_flags — все эти биты FLAG выставлены;
+          - exclude_flags — ни один из этих битов (0x704: unmapped,
+            secondary, QC fail, duplicate);
+          - min_mapq      — MAPQ не меньше;
+          - tags          — {"NM": 0, "AS": lambda v: v > 50}: равенство
+            значению или callable; теги разбираются только при этом фильтре.
         """
-        with self:
-            for line in self.iter_lines(strip=True):
-                # пропускаем заголовки и пустые строки
-                if not line or line.startswith("@"):
-                    continue
-
-                fields = line.split("\t")
-                if len(fields) < 11:
-                    continue
-
-                yield {
-                    "qname": fields[0],
-                    "flag": int(fields[1]),
-                    "chrom": fields[2],
-                    "pos": int(fields[3]),
-                    "cigar": fields[5],
-                    "seq": fields[9],
-                }
+        parse = self._record_parser(fields, lazy)
+        keep = alignment_filter(require_flags, exclude_flags, min_mapq, tags)
+        if keep is None:
+            yield from self._iter_body(parse)
+            return
+        check = keep  # для замыканий ниже (mypy: уже не Optional)
+
+        if parse == self._parse_line:
+            # полная запись: строка режется один раз и для фильтра, и для словаря
+            def filtered(line: str) -> Optional[Mapping[str, Any]]:
+                parts = line.split("\t")
+                if len(parts) < 11 or not check(parts):
+                    return None
+                return self._record_from_fields(parts)
+
+        else:
+            maxsplit = -1 if tags else 5  # без тегов хватает колонок до MAPQ
+
+            def filtered(line: str) -> Optional[Mapping[str, Any]]:
+                parts = line.split("\t", maxsplit)
+                if len(parts) < 6 or not check(parts):
+                    return None
+                return parse(line)
+
+        yield from self._iter_body(filtered)
+
+    def _parse_line(self, line: str) -> Optional[Dict[str, Any]]:
+        """Разобрать одну строку выравнивания (None — строка некорректна)."""
+        fields = line.split("\t")
+        if len(fields) < 11:
+            return None
+        return self._record_from_fields(fields)
+
+    @staticmethod
+    def _record_from_fields(fields: List[str]) -> Dict[str, Any]:
+        return {
+            "qname": fields[0],
+            "flag": int(fields[1]),
+            "chrom": fields[2],
+            "pos": int(fields[3]),
+            "mapq": int(fields[4]),
+            "cigar": fields[5],
+            "seq": fields[9],
+        }
+
+    def _record_interval(self, fields: list[str]) -> Tuple[str, int, int]:
+        """Интервал выравнивания на референсе (0-based, полуинтервал) — по CIGAR."""
+        beg = int(fields[3]) - 1
+        return fields[2], beg, beg + max(1, cigar_reference_length(fields[5]))
+
+    def _record_span(self, rec: Mapping[str, Any]) -> Tuple[int, int]:
+        """Выравнивание на референсе (1-based, включительно): конец — по CIGAR."""
+        pos = rec["pos"]
+        return pos, reference_end(pos, rec["cigar"])
+
+    def coverage(self, chrom: Optional[str] = None, **kwargs: Any) -> Iterator[CoverageRun]:
+        """Отрезки глубины покрытия (bedGraph-стиль), см. coverage.coverage_runs()."""
+        return coverage_runs(self, chrom, **kwargs)
+
+    def depth(self, chrom: Optional[str] = None, **kwargs: Any) -> Dict[str, Any]:
+        """Глубина по позициям {chrom: int32-массив}, см. coverage.depth()."""
+        return depth(self, chrom, **kwargs)
 
     def get_header(self) -> list[str]:
         """
         Вернуть строки заголовка SAM файла (начинаются с '@').
+        Берутся из разобранного заголовка (self.header), без повторного чтения.
         """
-        header_lines: list[str] = []
-        with self:
-            for line in self.iter_lines(strip=False):
-                if not line.startswith("@"):
-                    break
-                header_lines.append(line.rstrip("\n"))
-        return header_lines
+        return list(self.header.lines)
 
     def header_by_group(self) -> dict[str, list[str]]:
         """
@@ -58,9 +196,4 @@ class SamReader(GenomicDataReader):
         Возвращает словарь:
             {"HD": [...], "SQ": [...], "RG": [...], "PG": [...], ...}
         """
-        groups: dict[str, list[str]] = {}
-        for line in self.get_header():
-            if line.startswith("@") and len(line) >= 3:
-                tag = line[1:3]
-                groups.setdefault(tag, []).append(line)
-        return groups
+        return self.header.groups()
@@ -1,9 +1,13 @@
 # src/bioformats/sequences.py
 from __future__ import annotations
-from typing import Iterator, Tuple, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Optional, Union
 from abc import ABC, abstractmethod
 
 from .reader import Reader
+from .stats import AggregatorLike, Stats, StatsCache
+from .metacache import MetadataCache
+from .packed import PackedBatch, PackedSequence
+from .validation import VALIDATION_MODES, AlphabetValidator, InvalidSequenceError, ValidationReport
 
 SequencePair = Tuple[str, str]  # (seq_id, sequence)
 
@@ -15,8 +19,34 @@ class SequenceReader(Reader, ABC):
 
     Общие методы (get_sequence, validate_sequence, count, average_length)
     работают полиморфно для всех наследников.
+
+    binary=True — последовательности отдаются как bytes (без декодирования),
+    их можно без копирования передать в ``np.frombuffer``; seq_id — str.
+
+    packed=2 или 4 — последовательности отдаются как PackedSequence
+    (2 бита + N-блоки или 4-битный IUPAC, см. packed.py); для множества
+    коротких ридов — read_packed(), батчи в одном буфере.
+
+    validate — проверка по алфавиту (см. validation.py): "off", "fast"
+    (некорректные записи пропускаются, отчёты за последний проход read() —
+    в ``invalid_records``, не больше ``max_invalid_reports``; всего
+    пропущено — ``invalid_count``) или "strict" (InvalidSequenceError
+    с позициями). None — режим формата по умолчанию (``_default_validation``).
+
+    Статистика считается одним проходом и кэшируется до изменения файла
+    (см. stats.py): count() и average_length() подряд читают файл один раз.
+    cache — персистентный кэш метаданных (см. metacache.py); по умолчанию
+    общий кэш, если он включён через metacache.enable().
     """
 
+    # метрики, которые считаются «впрок» при любом проходе stats() — дешёвые
+    _default_stats = ("count", "total_length", "average_length")
+    _default_validation = "off"
+    max_invalid_reports = 1000  # отчётов за проход в режиме "fast"
+    # настройки, меняющие count()/stats(): алфавит и режим проверки решают,
+    # какие записи пропускаются (а "strict" — бросает исключение)
+    _cache_settings = ("alphabet", "validate")
+
     def __init__(
         self,
         filename: str,
@@ -24,9 +54,25 @@ class SequenceReader(Reader, ABC):
         alphabet: str = "ACGTNacgtn",
         encoding: str = "utf-8",
         gz: Optional[bool] = None,
+        binary: bool = False,
+        cache: Optional[MetadataCache] = None,
+        threads: int = 1,
+        packed: Optional[int] = None,
+        validate: Optional[str] = None,
     ) -> None:
-        super().__init__(filename, encoding=encoding, gz=gz)
+        super().__init__(filename, encoding=encoding, gz=gz, binary=binary, threads=threads)
+        if packed not in (None, 2, 4):
+            raise ValueError(f"packed must be None, 2 or 4, got {packed!r}")
+        validate = validate or self._default_validation
+        if validate not in VALIDATION_MODES:
+            raise ValueError(f"validate must be one of {VALIDATION_MODES}, got {validate!r}")
+        self.packed = packed
+        self.validate = validate
+        self._reset_validation()
         self.alphabet = set(alphabet)
+        self._alphabet_bytes = alphabet.encode("ascii")
+        self._validator = AlphabetValidator(alphabet)
+        self._stats = StatsCache(cache)
 
     # ----- обязателен к реализации в наследниках -----
     @abstractmethod
@@ -42,26 +88,71 @@ class SequenceReader(Reader, ABC):
     def __iter__(self) -> Iterator[SequencePair]:
         return self.read()
 
-    def get_sequence(self, seq_id: str) -> str:
-        """Найти и вернуть последовательность по идентификатору (O(n))."""
+    def read_packed(self, bits: int = 2, batch_size: int = 65536) -> Iterator[PackedBatch]:
+        """Последовательности батчами PackedBatch по ``batch_size`` записей (один буфер на батч)."""
+        batch: list = []
+        for pair in self.read():
+            batch.append(pair)
+            if len(batch) >= batch_size:
+                yield PackedBatch.from_records(batch, bits)
+                batch = []
+        if batch:
+            yield PackedBatch.from_records(batch, bits)
+
+    def _pack_pairs(self, pairs: Iterable[SequencePair]) -> Iterator[Any]:
+        """При packed=2/4 — упаковать последовательности пар (id, sequence)."""
+        if self.packed is None:
+            return iter(pairs)
+        bits = self.packed
+        return ((sid, PackedSequence.pack(seq, bits)) for sid, seq in pairs)
+
+    def get_sequence(self, seq_id: str) -> Any:
+        """Найти и вернуть последовательность по идентификатору (O(n)); тип — как в read()."""
         for sid, seq in self.read():
             if sid == seq_id:
                 return seq
         raise KeyError(f"Sequence {seq_id!r} not found in {self.filename}")
 
-    def validate_sequence(self, sequence: str) -> bool:
+    def validate_sequence(self, sequence: Union[str, bytes]) -> bool:
         """Базовая валидация по алфавиту (можно переопределить в наследнике)."""
-        return all(ch in self.alphabet for ch in sequence)
+        return self._validator.is_valid(sequence)
+
+    def validation_report(self, seq_id: str, sequence: Any, limit: int = 20) -> ValidationReport:
+        """Позиции (первые ``limit``) и символы, не входящие в алфавит."""
+        return self._validator.report(seq_id, sequence, limit)
+
+    def _reset_validation(self) -> None:
+        """Начало прохода: отчёты прошлого прохода сбрасываются."""
+        self.invalid_records: List[ValidationReport] = []  # пропущенные в режиме "fast"
+        self.invalid_count = 0
+
+    def _accept(self, seq_id: str, sequence: Any) -> bool:
+        """Пропускать ли запись дальше — по режиму validate."""
+        if self.validate == "off" or self.validate_sequence(sequence):
+            return True
+        report = self.validation_report(seq_id, sequence)
+        if self.validate == "strict":
+            raise InvalidSequenceError(report)
+        self.invalid_count += 1
+        if len(self.invalid_records) < self.max_invalid_reports:
+            self.invalid_records.append(report)
+        return False
+
+    def stats(self, *names: AggregatorLike) -> Dict[str, Any]:
+        """
+        Несколько метрик за один проход: stats("count", "n50", "gc").
+        Имена — из stats.AGGREGATORS (результаты кэшируются по размеру/mtime
+        файла), экземпляры Aggregator считаются каждый раз заново.
+        Без аргументов — метрики по умолчанию (count, total_length, average_length).
+        """
+        if any(not isinstance(n, str) for n in names):
+            return Stats(*names).run(self)
+        return self._stats.get(self, names or self._default_stats, extra=self._default_stats)
 
     def count(self) -> int:
         """Количество последовательностей в файле."""
-        return sum(1 for _ in self.read())
+        return self.stats("count")["count"]
 
     def average_length(self) -> float:
         """Средняя длина последовательностей (0.0, если пусто)."""
-        total = 0
-        n = 0
-        for _, seq in self.read():
-            total += len(seq)
-            n += 1
-        return (total / n) if n else 0.0
\ No newline at end of file
+        return self.stats("average_length")["average_length"]
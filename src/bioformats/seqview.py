@@ -0,0 +1,186 @@
+# src/bioformats/seqview.py
+"""
+Отображение FASTA в память (mmap) и «ленивые» последовательности.
+
+SequenceView — последовательность из FAI-записи поверх mmap-буфера:
+len() и срезы считаются арифметически по индексу, байты читаются
+только при материализации (str(), bytes(), to_numpy()).
+
+    view = reader.get_sequence("chr1")     # FastaReader(mmap=True)
+    len(view)                              # без чтения файла
+    sub = view[1_000_000:1_000_100]        # новый view, без копирования
+    str(sub)                               # 'ACGT...' — читаются 100 байт
+
+Страницы файла берутся из общего page cache ОС: несколько процессов,
+открывших один и тот же геном, не держат по приватной копии. View
+сериализуется (pickle) как (путь, запись, диапазон) — в процессе-воркере
+файл отображается заново, одно отображение на процесс.
+"""
+
+from __future__ import annotations
+from typing import Dict, Iterator, Optional, Tuple, Union
+import mmap
+import os
+
+import numpy as np
+
+from .fai import FaiRecord
+
+_MAPS: Dict[str, Tuple[Tuple[int, float], mmap.mmap]] = {}  # путь -> ((size, mtime), отображение)
+
+
+def map_file(filename: str) -> Union[mmap.mmap, bytes]:
+    """
+    Отобразить файл в память только для чтения (одно отображение на процесс).
+    Пустой файл отображать нельзя — для него возвращается ``b""``.
+    """
+    path = os.path.realpath(filename)
+    st = os.stat(path)
+    key = (st.st_size, st.st_mtime)
+    cached = _MAPS.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    if st.st_size == 0:
+        return b""
+    with open(path, "rb") as fh:
+        mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    _MAPS[path] = (key, mm)
+    return mm
+
+
+class SequenceView:
+    """
+    Последовательность ``rec[start:end]`` поверх буфера файла (без копирования).
+
+    Поддерживает len(), срезы с шагом 1 (возвращают новый view), индекс
+    (один символ), итерацию, сравнение со str/bytes. Для остального —
+    ``str(view)`` / ``bytes(view)``.
+    """
+
+    __slots__ = ("filename", "_buf", "_rec", "_start", "_end")
+
+    def __init__(
+        self,
+        buf: Union[mmap.mmap, bytes],
+        rec: FaiRecord,
+        start: int = 0,
+        end: Optional[int] = None,
+        filename: Optional[str] = None,
+    ) -> None:
+        self.filename = filename
+        self._buf = buf
+        self._rec = rec
+        self._start = start
+        self._end = rec.length if end is None else end
+
+    @classmethod
+    def open(cls, filename: str, rec: FaiRecord, start: int = 0, end: Optional[int] = None) -> "SequenceView":
+        """View записи ``rec`` файла ``filename`` (через общее отображение процесса)."""
+        return cls(map_file(filename), rec, start, end, filename)
+
+    @property
+    def name(self) -> str:
+        return self._rec.name
+
+    # ---------- байтовые диапазоны ----------
+    @property
+    def is_contiguous(self) -> bool:
+        """Лежат ли нуклеотиды в файле одним куском (без переводов строк внутри)."""
+        rec = self._rec
+        return (
+            self._end - self._start <= 1
+            or rec.line_bases == 0
+            or self._start // rec.line_bases == (self._end - 1) // rec.line_bases
+        )
+
+    def _raw_range(self) -> Tuple[int, int]:
+        """Байтовый диапазон файла от первого до последнего нуклеотида view (с переводами строк)."""
+        if not len(self):
+            return 0, 0
+        return self._rec.byte_offset(self._start), self._rec.byte_offset(self._end - 1) + 1
+
+    def _spans(self) -> Iterator[Tuple[int, int]]:
+        """Байтовые диапазоны [a, b) по строкам файла, покрывающие view."""
+        rec = self._rec
+        pos, end = self._start, self._end
+        while pos < end:
+            line_end = min(end, (pos // rec.line_bases + 1) * rec.line_bases)
+            a = rec.byte_offset(pos)
+            yield a, a + (line_end - pos)
+            pos = line_end
+
+    # ---------- протокол последовательности ----------
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[str, "SequenceView"]:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                return str(self)[key]
+            stop = max(start, stop)
+            return SequenceView(self._buf, self._rec, self._start + start, self._start + stop, self.filename)
+        n = len(self)
+        if key < 0:
+            key += n
+        if not 0 <= key < n:
+            raise IndexError("SequenceView index out of range")
+        a = self._rec.byte_offset(self._start + key)
+        return chr(self._buf[a])
+
+    def __iter__(self) -> Iterator[str]:
+        for a, b in self._spans():
+            yield from self._buf[a:b].decode("ascii")
+
+    def __bytes__(self) -> bytes:
+        return self.tobytes()
+
+    def __str__(self) -> str:
+        return self.tobytes().decode("ascii")
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SequenceView):
+            other = other.tobytes()
+        elif isinstance(other, str):
+            other = other.encode("ascii", "replace")
+        if not isinstance(other, (bytes, bytearray)):
+            return NotImplemented
+        return len(other) == len(self) and self.tobytes() == other
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"SequenceView({self._rec.name!r}, {self._start}, {self._end})"
+
+    def __reduce__(self):
+        # в другой процесс передаём координаты, а не байты
+        if self.filename is None:
+            return (str, (str(self),))
+        return (SequenceView.open, (self.filename, self._rec, self._start, self._end))
+
+    # ---------- материализация ----------
+    def tobytes(self) -> bytes:
+        """Нуклеотиды view одним bytes (копия только нужного диапазона)."""
+        a, b = self._raw_range()
+        raw = self._buf[a:b]
+        if self.is_contiguous:
+            return bytes(raw)
+        return raw.replace(b"\n", b"").replace(b"\r", b"")
+
+    def to_numpy(self) -> np.ndarray:
+        """
+        uint8-массив кодов нуклеотидов. Если view лежит в одной строке
+        файла — это окно в отображение без копирования (только чтение).
+        """
+        a, b = self._raw_range()
+        arr = np.frombuffer(self._buf, dtype=np.uint8, count=b - a, offset=a) if b > a else np.zeros(0, np.uint8)
+        if self.is_contiguous:
+            return arr
+        return arr[(arr != ord("\n")) & (arr != ord("\r"))]
+
+    def validate(self, alphabet: bytes, window: int = 1 << 20) -> bool:
+        """Все ли нуклеотиды из ``alphabet`` (проверка окнами по ``window`` байт, без склейки)."""
+        allowed = alphabet + b"\r\n"
+        a, b = self._raw_range()
+        buf = self._buf
+        return not any(buf[i:min(i + window, b)].translate(None, allowed) for i in range(a, b, window))
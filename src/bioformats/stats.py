@@ -0,0 +1,284 @@
+# src/bioformats/stats.py
+"""
+Однопроходная статистика по файлу.
+
+Aggregator — накопитель одной метрики: add(item) для каждой записи ридера,
+result() в конце. Несколько накопителей прогоняются через один проход
+read() (Stats.run), так что count, средняя длина, N50, GC% и т.п.
+не требуют отдельного чтения файла каждая.
+
+    stats = Stats("count", "n50", "gc").run(FastaReader("ref.fa"))
+    # {'count': 24, 'n50': 155270560, 'gc': 40.9}
+
+Ридеры кэшируют результаты (reader.stats()) по размеру и mtime файла:
+повторные вызовы count(), average_length(), get_chromosomes() и
+validate_coordinate() не читают файл, пока он не изменился. Если включён
+персистентный кэш (metacache.py), значения сохраняются и между процессами.
+
+Элементы, которые получают накопители, — записи read() ридера:
+(seq_id, sequence) для FASTA/FASTQ, словари (chrom, pos, ...) для SAM/VCF.
+"""
+
+from __future__ import annotations
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type, Union
+import os
+
+import numpy as np
+
+from . import metacache
+
+
+class Aggregator:
+    """Базовый накопитель: наследники задают ``name``, add() и result()."""
+
+    name = ""
+
+    def add(self, item: Any) -> None:
+        raise NotImplementedError
+
+    def result(self) -> Any:
+        raise NotImplementedError
+
+
+# ---------- последовательности: (seq_id, sequence) ----------
+class Count(Aggregator):
+    """Число записей."""
+
+    name = "count"
+
+    def __init__(self) -> None:
+        self.n = 0
+
+    def add(self, item: Any) -> None:
+        self.n += 1
+
+    def result(self) -> int:
+        return self.n
+
+
+class TotalLength(Aggregator):
+    """Суммарная длина последовательностей."""
+
+    name = "total_length"
+
+    def __init__(self) -> None:
+        self.total = 0
+
+    def add(self, item: Any) -> None:
+        self.total += len(item[1])
+
+    def result(self) -> int:
+        return self.total
+
+
+class AverageLength(Aggregator):
+    """Средняя длина последовательностей (0.0, если записей нет)."""
+
+    name = "average_length"
+
+    def __init__(self) -> None:
+        self.n = self.total = 0
+
+    def add(self, item: Any) -> None:
+        self.n += 1
+        self.total += len(item[1])
+
+    def result(self) -> float:
+        return (self.total / self.n) if self.n else 0.0
+
+
+class LengthHistogram(Aggregator):
+    """Гистограмма длин: {длина: число последовательностей}."""
+
+    name = "length_hist"
+
+    def __init__(self) -> None:
+        self.counts: Counter = Counter()
+
+    def add(self, item: Any) -> None:
+        self.counts[len(item[1])] += 1
+
+    def result(self) -> Dict[int, int]:
+        return dict(sorted(self.counts.items()))
+
+
+class N50(LengthHistogram):
+    """
+    N50: длина, при которой последовательности не короче неё покрывают
+    не меньше половины суммарной длины. Память — O(число разных длин).
+    """
+
+    name = "n50"
+
+    def result(self) -> int:
+        total = sum(length * n for length, n in self.counts.items())
+        acc = 0
+        for length in sorted(self.counts, reverse=True):
+            acc += length * self.counts[length]
+            if 2 * acc >= total:
+                return length
+        return 0
+
+
+def _as_codes(seq: Any) -> np.ndarray:
+    """Последовательность (str, bytes, SequenceView) -> uint8-коды без лишних копий."""
+    if isinstance(seq, str):
+        return np.frombuffer(seq.encode("ascii", "replace"), dtype=np.uint8)
+    if isinstance(seq, (bytes, bytearray, memoryview)):
+        return np.frombuffer(seq, dtype=np.uint8)
+    return seq.to_numpy()
+
+
+_GC = [ord(c) for c in "GCgc"]
+_ACGT = [ord(c) for c in "ACGTacgt"]
+
+
+class GCContent(Aggregator):
+    """GC-состав в процентах от однозначных оснований (N и прочее не учитываются)."""
+
+    name = "gc"
+
+    def __init__(self) -> None:
+        self.hist = np.zeros(256, dtype=np.int64)
+
+    def add(self, item: Any) -> None:
+        self.hist += np.bincount(_as_codes(item[1]), minlength=256)
+
+    def result(self) -> float:
+        called = int(self.hist[_ACGT].sum())
+        return 100.0 * int(self.hist[_GC].sum()) / called if called else 0.0
+
+
+# ---------- геномные записи: словари ----------
+class ChromCounts(Aggregator):
+    """Число записей по хромосомам, в порядке первого появления."""
+
+    name = "chrom_counts"
+
+    def __init__(self) -> None:
+        self.counts: Dict[str, int] = {}
+
+    def add(self, item: Any) -> None:
+        chrom = item.get("chrom") or item.get("CHR")
+        if chrom:
+            self.counts[chrom] = self.counts.get(chrom, 0) + 1
+
+    def result(self) -> Dict[str, int]:
+        return dict(self.counts)
+
+
+AGGREGATORS: Dict[str, Type[Aggregator]] = {
+    cls.name: cls
+    for cls in (Count, TotalLength, AverageLength, LengthHistogram, N50, GCContent, ChromCounts)
+}
+
+AggregatorLike = Union[str, Aggregator]
+
+
+def _make(agg: AggregatorLike) -> Aggregator:
+    if isinstance(agg, Aggregator):
+        return agg
+    if agg not in AGGREGATORS:
+        raise KeyError(f"Unknown statistic {agg!r}; available: {list(AGGREGATORS)}")
+    return AGGREGATORS[agg]()
+
+
+class Stats:
+    """
+    Набор накопителей, которые считаются за один проход.
+
+        Stats("count", "gc").add(MyAggregator()).run(reader)
+
+    Накопители задаются именем из AGGREGATORS или экземпляром Aggregator.
+    """
+
+    def __init__(self, *aggregators: AggregatorLike) -> None:
+        self.aggregators: List[Aggregator] = []
+        for agg in aggregators:
+            self.add(agg)
+
+    def add(self, agg: AggregatorLike) -> "Stats":
+        """Зарегистрировать ещё один накопитель."""
+        self.aggregators.append(_make(agg))
+        return self
+
+    def feed(self, items: Iterable[Any]) -> Dict[str, Any]:
+        """Прогнать записи через все накопители; {имя: результат}."""
+        adds = [agg.add for agg in self.aggregators]
+        for item in items:
+            for add in adds:
+                add(item)
+        return {agg.name: agg.result() for agg in self.aggregators}
+
+    def run(self, reader: Any) -> Dict[str, Any]:
+        """Один проход ``reader.read()``."""
+        return self.feed(reader.read())
+
+
+# ---------- кэш на ридере ----------
+def file_signature(filename: str) -> Tuple[int, int]:
+    """(размер, mtime в нс) — ключ актуальности кэша."""
+    st = os.stat(filename)
+    return st.st_size, st.st_mtime_ns
+
+
+class StatsCache:
+    """
+    Результаты накопителей по именам для одной версии файла и настроек
+    ридера (Reader._cache_namespace). При смене размера/mtime или настроек
+    кэш сбрасывается.
+
+    store — персистентное хранилище (MetadataCache); None — общее из
+    metacache.get_default(), если оно включено.
+    """
+
+    def __init__(self, store: Optional["metacache.MetadataCache"] = None) -> None:
+        self._store = store
+        self._key: Optional[Tuple[Tuple[int, int], str]] = None
+        self._values: Dict[str, Any] = {}
+
+    @property
+    def store(self) -> Optional["metacache.MetadataCache"]:
+        return self._store if self._store is not None else metacache.get_default()
+
+    def _refresh(self, reader: Any) -> Tuple[Tuple[int, int], str]:
+        """
+        Сбросить значения, если изменился файл или настройки ридера
+        (и подтянуть сохранённые из store для этой пары).
+        """
+        key = (file_signature(reader.filename), reader._cache_namespace())
+        if key != self._key:
+            store = self.store
+            self._key = key
+            self._values = store.get(reader.filename, *key) if store is not None else {}
+        return key
+
+    def _remember(self, reader: Any, key: Tuple[Tuple[int, int], str], values: Dict[str, Any]) -> None:
+        self._values.update(values)
+        store = self.store
+        if store is not None:
+            store.put(reader.filename, key[0], values, key[1])
+
+    def get(self, reader: Any, names: Iterable[str], extra: Iterable[str] = ()) -> Dict[str, Any]:
+        """
+        Значения ``names``. Если чего-то нет в кэше, недостающие ``names``
+        вместе с недостающими ``extra`` (дешёвые метрики «впрок») считаются
+        одним проходом по ``reader``.
+        """
+        names = list(names)
+        key = self._refresh(reader)
+        if any(n not in self._values for n in names):
+            todo = dict.fromkeys(n for n in (*names, *extra) if n not in self._values)
+            self._remember(reader, key, Stats(*todo).run(reader))
+        return {n: self._values[n] for n in names}
+
+    def value(self, reader: Any, name: str, compute: Callable[[], Any]) -> Any:
+        """Произвольное производное значение (например, заголовок) под тем же ключом."""
+        key = self._refresh(reader)
+        if name not in self._values:
+            self._remember(reader, key, {name: compute()})
+        return self._values[name]
+
+    def clear(self) -> None:
+        self._key, self._values = None, {}
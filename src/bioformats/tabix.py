@@ -0,0 +1,262 @@
+# src/bioformats/tabix.py
+"""
+Tabix-индекс (``.tbi``) для отсортированных BGZF-файлов SAM/VCF.
+
+Схема как в htslib/UCSC:
+
+- иерархические бины: 1 бин на 512 Мб, 8 на 64 Мб, ..., 37449 бинов по 16 Кб;
+  запись кладётся в наименьший бин, целиком её содержащий (reg2bin);
+- у каждого бина — список «чанков» (vbeg, vend) виртуальных смещений BGZF;
+- линейный индекс: для каждого 16-Кб окна — наименьшее смещение записи,
+  пересекающей окно. Позволяет отбросить чанки, заканчивающиеся раньше.
+
+Запрос региона = reg2bins + линейный индекс -> несколько чанков -> seek + чтение
+только этих блоков. Файл индекса совместим с ``tabix``.
+"""
+
+from __future__ import annotations
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import os
+import struct
+
+from .bgzf import BgzfReader, BgzfWriter
+
+MIN_SHIFT = 14   # окно линейного индекса: 16 Кб
+DEPTH = 5        # уровней бинов (как в BAI/TBI)
+
+Chunk = Tuple[int, int]  # (vbeg, vend)
+
+# формат в заголовке .tbi
+FORMAT_GENERIC, FORMAT_SAM, FORMAT_VCF = 0, 1, 2
+
+
+def reg2bin(beg: int, end: int) -> int:
+    """Наименьший бин, целиком содержащий [beg, end) (0-based)."""
+    end -= 1
+    if beg >> 14 == end >> 14:
+        return ((1 << 15) - 1) // 7 + (beg >> 14)
+    if beg >> 17 == end >> 17:
+        return ((1 << 12) - 1) // 7 + (beg >> 17)
+    if beg >> 20 == end >> 20:
+        return ((1 << 9) - 1) // 7 + (beg >> 20)
+    if beg >> 23 == end >> 23:
+        return ((1 << 6) - 1) // 7 + (beg >> 23)
+    if beg >> 26 == end >> 26:
+        return ((1 << 3) - 1) // 7 + (beg >> 26)
+    return 0
+
+
+def reg2bins(beg: int, end: int) -> List[int]:
+    """Все бины, которые могут пересекаться с [beg, end) (0-based)."""
+    end -= 1
+    bins = [0]
+    for offset, shift in ((1, 26), (9, 23), (73, 20), (585, 17), (4681, 14)):
+        bins.extend(range(offset + (beg >> shift), offset + (end >> shift) + 1))
+    return bins
+
+
+def merge_chunks(chunks: Iterable[Chunk]) -> List[Chunk]:
+    """Отсортировать чанки и склеить перекрывающиеся/смежные."""
+    merged: List[Chunk] = []
+    for beg, end in sorted(chunks):
+        if merged and beg <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((beg, end))
+    return merged
+
+
+class _RefIndex:
+    """Индекс одной последовательности: бины + линейный индекс."""
+
+    __slots__ = ("bins", "linear")
+
+    def __init__(self) -> None:
+        self.bins: Dict[int, List[Chunk]] = {}
+        self.linear: List[int] = []
+
+    def add(self, beg: int, end: int, vbeg: int, vend: int) -> None:
+        chunks = self.bins.setdefault(reg2bin(beg, end), [])
+        if chunks and chunks[-1][1] == vbeg:
+            chunks[-1] = (chunks[-1][0], vend)  # продолжение того же чанка
+        else:
+            chunks.append((vbeg, vend))
+
+        first, last = beg >> MIN_SHIFT, (max(end, beg + 1) - 1) >> MIN_SHIFT
+        if len(self.linear) <= last:
+            self.linear.extend([0] * (last + 1 - len(self.linear)))
+        for w in range(first, last + 1):
+            if self.linear[w] == 0:
+                self.linear[w] = vbeg
+
+    def finish(self) -> None:
+        # пустые окна наследуют смещение предыдущего (как в htslib)
+        for i in range(1, len(self.linear)):
+            if self.linear[i] == 0:
+                self.linear[i] = self.linear[i - 1]
+
+
+class TabixIndex:
+    """
+    Tabix-индекс: имена последовательностей + бины/линейный индекс для каждой.
+
+    Построение:
+        idx = TabixIndex.build(records, fmt=FORMAT_VCF, columns=(1, 2, 0), meta="#")
+    где records — (chrom, beg, end, vbeg, vend) в порядке файла.
+    """
+
+    def __init__(
+        self,
+        *,
+        fmt: int = FORMAT_GENERIC,
+        columns: Tuple[int, int, int] = (1, 2, 0),
+        meta: str = "#",
+        skip: int = 0,
+    ) -> None:
+        self.fmt = fmt
+        self.columns = columns
+        self.meta = meta
+        self.skip = skip
+        self.names: List[str] = []
+        self._refs: Dict[str, _RefIndex] = {}
+        # состояние построения (add/finish)
+        self._cur: Optional[_RefIndex] = None
+        self._cur_chrom: Optional[str] = None
+        self._last_beg = -1
+
+    def __contains__(self, chrom: object) -> bool:
+        return chrom in self._refs
+
+    # ---------- построение ----------
+    @classmethod
+    def build(
+        cls,
+        records: Iterable[Tuple[str, int, int, int, int]],
+        **kwargs,
+    ) -> "TabixIndex":
+        """Построить индекс по отсортированным интервалам (иначе ValueError)."""
+        idx = cls(**kwargs)
+        for chrom, beg, end, vbeg, vend in records:
+            idx.add(chrom, beg, end, vbeg, vend)
+        return idx.finish()
+
+    def add(self, chrom: str, beg: int, end: int, vbeg: int, vend: int) -> None:
+        """
+        Добавить запись (в порядке файла) — для построения на лету, например
+        при записи BGZF; после последней записи нужен finish().
+        """
+        if chrom != self._cur_chrom:
+            if chrom in self._refs:
+                raise ValueError(f"File is not sorted: {chrom!r} appears in several blocks")
+            if self._cur is not None:
+                self._cur.finish()
+            self._cur = self._refs[chrom] = _RefIndex()
+            self.names.append(chrom)
+            self._cur_chrom, self._last_beg = chrom, -1
+        if beg < self._last_beg:
+            raise ValueError(f"File is not sorted: {chrom}:{beg + 1} after {chrom}:{self._last_beg + 1}")
+        self._last_beg = beg
+        assert self._cur is not None
+        self._cur.add(beg, end, vbeg, vend)
+
+    def finish(self) -> "TabixIndex":
+        """Завершить построение (линейный индекс последней последовательности)."""
+        if self._cur is not None:
+            self._cur.finish()
+            self._cur = None
+        return self
+
+    # ---------- запросы ----------
+    def query(self, chrom: str, beg: int, end: int) -> List[Chunk]:
+        """Чанки, которые могут содержать записи, пересекающие [beg, end) (0-based)."""
+        ref = self._refs.get(chrom)
+        if ref is None or end <= beg:
+            return []
+        w = beg >> MIN_SHIFT
+        min_off = ref.linear[w] if w < len(ref.linear) else (ref.linear[-1] if ref.linear else 0)
+        chunks = [
+            c
+            for b in reg2bins(beg, end)
+            for c in ref.bins.get(b, ())
+            if c[1] > min_off
+        ]
+        return merge_chunks(chunks)
+
+    # ---------- (де)сериализация: формат .tbi ----------
+    def save(self, path: str) -> None:
+        names = b"".join(n.encode("utf-8") + b"\0" for n in self.names)
+        col_seq, col_beg, col_end = self.columns
+        with BgzfWriter(path) as out:
+            out.write(b"TBI\1")
+            out.write(struct.pack(
+                "<8i", len(self.names), self.fmt, col_seq, col_beg, col_end,
+                ord(self.meta), self.skip, len(names),
+            ))
+            out.write(names)
+            for name in self.names:
+                ref = self._refs[name]
+                out.write(struct.pack("<i", len(ref.bins)))
+                for b, chunks in sorted(ref.bins.items()):
+                    out.write(struct.pack("<Ii", b, len(chunks)))
+                    for cbeg, cend in chunks:
+                        out.write(struct.pack("<QQ", cbeg, cend))
+                out.write(struct.pack("<i", len(ref.linear)))
+                if ref.linear:
+                    out.write(struct.pack(f"<{len(ref.linear)}Q", *ref.linear))
+
+    @classmethod
+    def load(cls, path: str) -> "TabixIndex":
+        with BgzfReader(path) as fh:
+            data = fh.read()
+        if data[:4] != b"TBI\1":
+            raise ValueError(f"Not a tabix index: {path}")
+        n_ref, fmt, col_seq, col_beg, col_end, meta, skip, l_nm = struct.unpack_from("<8i", data, 4)
+        off = 36
+        names = data[off:off + l_nm].split(b"\0")[:n_ref]
+        off += l_nm
+
+        idx = cls(fmt=fmt & 0xFFFF, columns=(col_seq, col_beg, col_end), meta=chr(meta), skip=skip)
+        for raw_name in names:
+            name = raw_name.decode("utf-8")
+            ref = _RefIndex()
+            (n_bin,) = struct.unpack_from("<i", data, off)
+            off += 4
+            for _ in range(n_bin):
+                b, n_chunk = struct.unpack_from("<Ii", data, off)
+                off += 8
+                vals = struct.unpack_from(f"<{2 * n_chunk}Q", data, off)
+                off += 16 * n_chunk
+                ref.bins[b] = list(zip(vals[::2], vals[1::2]))
+            (n_intv,) = struct.unpack_from("<i", data, off)
+            off += 4
+            ref.linear = list(struct.unpack_from(f"<{n_intv}Q", data, off))
+            off += 8 * n_intv
+            idx.names.append(name)
+            idx._refs[name] = ref
+        return idx
+
+    @staticmethod
+    def is_fresh(filename: str, path: Optional[str] = None) -> bool:
+        """Есть ли ``.tbi`` и не старше ли он самого файла."""
+        path = path or tbi_path(filename)
+        try:
+            return os.path.getmtime(path) >= os.path.getmtime(filename)
+        except OSError:
+            return False
+
+
+def tbi_path(filename: str) -> str:
+    """Путь к tabix-индексу для файла."""
+    return filename + ".tbi"
+
+
+def iter_chunk_lines(fh: BgzfReader, chunks: Iterable[Chunk]) -> Iterator[str]:
+    """Прочитать строки, начинающиеся внутри заданных чанков (в порядке файла)."""
+    for vbeg, vend in chunks:
+        fh.seek(vbeg)
+        while fh.tell() < vend:
+            line = fh.readline()
+            if not line:
+                break
+            yield line
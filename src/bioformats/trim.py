@@ -0,0 +1,333 @@
+# src/bioformats/trim.py
+"""
+Тримминг и фильтрация ридов FASTQ батчами.
+
+FastqReader.read_batches() отдаёт FastqBatch: списки id/seq/qual и матрица
+Phred (риды × максимальная длина), декодируемая один раз на батч. Обрезка
+по качеству считается векторно по всей матрице и даёт новый конец каждого
+рида; шаги применяются по очереди, каждый может только укоротить рид.
+
+Шаги FastqTrimmer (в этом порядке):
+- adapter        — адаптер целиком или его начало (>= min_overlap) на 3′-конце;
+- window         — (ширина, порог): рид режется в начале первого окна,
+                   средний Phred в котором ниже порога (как SLIDINGWINDOW
+                   в Trimmomatic);
+- quality_cutoff — 3′-обрезка по алгоритму BWA/cutadapt ``-q``;
+- min_length / max_n — фильтры после обрезки.
+
+    trimmer = FastqTrimmer(adapter="AGATCGGAAGAGC", quality_cutoff=20, min_length=30)
+    trimmer.run(FastqReader("r.fq.gz"), "trimmed.fq.gz")
+    trimmer.run_paired(FastqReader("r1.fq"), FastqReader("r2.fq"), "o1.fq", "o2.fq")
+
+В парном режиме R1 и R2 читаются синхронно теми же батчами: id сверяются
+(без описания и суффиксов /1, /2) на том же проходе, пара сохраняется,
+только если оба рида прошли фильтры.
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .qc import MAX_PHRED, _as_bytes
+from .writers import FastqWriter
+
+FastqRecord = Tuple[str, str, str]  # (id, sequence, quality)
+
+
+class FastqBatch:
+    """
+    Батч ридов: ``ids``, ``seqs``, ``quals`` (списки) и ленивые массивы
+    ``lengths`` (int64) и ``phred`` (uint8, риды × max длина, хвосты — 0).
+    """
+
+    __slots__ = ("ids", "seqs", "quals", "phred_offset", "_lengths", "_phred")
+
+    def __init__(self, ids: List[str], seqs: List[Any], quals: List[Any], phred_offset: int = 33) -> None:
+        self.ids = ids
+        self.seqs = seqs
+        self.quals = quals
+        self.phred_offset = phred_offset
+        self._lengths: Optional[np.ndarray] = None
+        self._phred: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_records(cls, records: Iterable[FastqRecord], phred_offset: int = 33) -> "FastqBatch":
+        ids: List[str] = []
+        seqs: List[Any] = []
+        quals: List[Any] = []
+        for sid, seq, qual in records:
+            ids.append(sid)
+            seqs.append(seq)
+            quals.append(qual)
+        return cls(ids, seqs, quals, phred_offset)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[FastqRecord]:
+        return zip(self.ids, self.seqs, self.quals)
+
+    @property
+    def lengths(self) -> np.ndarray:
+        if self._lengths is None:
+            self._lengths = np.fromiter((len(s) for s in self.seqs), dtype=np.int64, count=len(self.seqs))
+        return self._lengths
+
+    @property
+    def phred(self) -> np.ndarray:
+        """Phred-матрица (декодируется один раз): строки — риды, за концом рида — 0."""
+        if self._phred is None:
+            lens = self.lengths
+            width = int(lens.max()) if len(lens) else 0
+            q = np.frombuffer(_as_bytes(self.quals), dtype=np.uint8) if len(lens) else np.zeros(0, np.uint8)
+            if q.size != int(lens.sum()):
+                raise ValueError("Sequence and quality lengths differ in batch")
+            if q.size and (q.min() < self.phred_offset or q.max() > self.phred_offset + MAX_PHRED):
+                raise ValueError(f"Quality values out of range for Phred+{self.phred_offset}")
+            ends = np.cumsum(lens)
+            rows = np.repeat(np.arange(len(lens)), lens)
+            cols = np.arange(q.size, dtype=np.int64) - np.repeat(ends - lens, lens)
+            mat = np.zeros((len(lens), width), dtype=np.uint8)
+            mat[rows, cols] = q - np.uint8(self.phred_offset)
+            self._phred = mat
+        return self._phred
+
+    def truncate(self, ends: np.ndarray) -> "FastqBatch":
+        """Новый батч: i-й рид обрезан до ``ends[i]`` оснований."""
+        e = ends.tolist()
+        out = FastqBatch(
+            self.ids,
+            [s[:n] for s, n in zip(self.seqs, e)],
+            [q[:n] for q, n in zip(self.quals, e)],
+            self.phred_offset,
+        )
+        out._lengths = np.asarray(ends, dtype=np.int64)
+        return out
+
+    def select(self, keep: np.ndarray) -> "FastqBatch":
+        """Новый батч только из ридов с ``keep[i] == True``."""
+        idx = np.flatnonzero(keep).tolist()
+        out = FastqBatch(
+            [self.ids[i] for i in idx],
+            [self.seqs[i] for i in idx],
+            [self.quals[i] for i in idx],
+            self.phred_offset,
+        )
+        if self._lengths is not None:
+            out._lengths = self._lengths[idx]
+        return out
+
+
+# ---------- векторные шаги ----------
+def quality_trim_3p(phred: np.ndarray, lengths: np.ndarray, cutoff: int) -> np.ndarray:
+    """
+    Новые длины после 3′-обрезки по качеству (BWA, cutadapt ``-q``): с конца
+    копится сумма (cutoff - Q), пока не станет отрицательной; рид режется
+    в точке её максимума.
+    """
+    n, width = phred.shape
+    if not width:
+        return lengths.copy()
+    pad = np.arange(width) >= lengths[:, None]
+    contrib = cutoff - phred.astype(np.int32)
+    contrib[pad] = 0  # хвосты-заполнители не влияют на сумму
+    cs = np.cumsum(contrib[:, ::-1], axis=1)
+    neg = cs < 0
+    stop = np.where(neg.any(axis=1), neg.argmax(axis=1), width)
+    cs = np.where(np.arange(width) < stop[:, None], cs, -1)
+    best = cs.argmax(axis=1)
+    cut = np.where(cs[np.arange(n), best] > 0, best + 1 - (width - lengths), 0)
+    return lengths - np.clip(cut, 0, None)
+
+
+def sliding_window_trim(phred: np.ndarray, lengths: np.ndarray, window: int, threshold: float) -> np.ndarray:
+    """Новые длины: рид режется в начале первого окна ``window`` со средним Phred < threshold."""
+    n, width = phred.shape
+    if width < window:
+        return lengths.copy()
+    cs = np.zeros((n, width + 1), dtype=np.int64)
+    np.cumsum(phred, axis=1, out=cs[:, 1:])
+    sums = cs[:, window:] - cs[:, :-window]  # [i] — окно, начинающееся в i
+    inside = np.arange(width - window + 1) <= (lengths - window)[:, None]
+    low = (sums < threshold * window) & inside
+    return np.where(low.any(axis=1), low.argmax(axis=1), lengths)
+
+
+def adapter_trim(seqs: Sequence[Any], adapters: Sequence[str], min_overlap: int = 3) -> np.ndarray:
+    """
+    Новые длины после отрезания адаптера: первое вхождение целиком или
+    начало адаптера (не короче ``min_overlap``) в самом конце рида.
+    Совпадение — точное.
+    """
+    ends = np.empty(len(seqs), dtype=np.int64)
+    for i, seq in enumerate(seqs):
+        if isinstance(seq, bytes):
+            seq = seq.decode("ascii")
+        end = len(seq)
+        for adapter in adapters:
+            end = min(end, _adapter_start(seq, adapter, min_overlap))
+        ends[i] = end
+    return ends
+
+
+def _adapter_start(seq: str, adapter: str, min_overlap: int) -> int:
+    hit = seq.find(adapter)
+    if hit >= 0:
+        return hit
+    # частичный адаптер на 3′-конце: ищем его начало в последних len(adapter)-1 основаниях
+    tail_start = max(0, len(seq) - len(adapter) + 1)
+    prefix = adapter[:min_overlap]
+    j = seq.find(prefix, tail_start)
+    while j >= 0:
+        if adapter.startswith(seq[j:]):
+            return j
+        j = seq.find(prefix, j + 1)
+    return len(seq)
+
+
+def _count_n(seqs: Sequence[Any]) -> np.ndarray:
+    return np.fromiter(
+        (s.count("N") + s.count("n") if isinstance(s, str) else s.count(b"N") + s.count(b"n") for s in seqs),
+        dtype=np.int64,
+        count=len(seqs),
+    )
+
+
+# ---------- пары ----------
+def _pair_id(sid: str) -> str:
+    name = sid.split(None, 1)[0] if sid else sid
+    return name[:-2] if name.endswith(("/1", "/2")) else name
+
+
+def iter_paired(r1, r2, batch_size: int = 10000) -> Iterator[Tuple[FastqBatch, FastqBatch]]:
+    """
+    Батчи R1/R2 синхронно. Разное число ридов или несовпадающие id
+    (без описания и /1, /2) -> ValueError с номером рида.
+    """
+    done = 0
+    it1 = r1.read_batches(batch_size)
+    it2 = r2.read_batches(batch_size)
+    while True:
+        b1 = next(it1, None)
+        b2 = next(it2, None)
+        if b1 is None and b2 is None:
+            return
+        if b1 is None or b2 is None or len(b1) != len(b2):
+            n1 = done + (len(b1) if b1 is not None else 0)
+            n2 = done + (len(b2) if b2 is not None else 0)
+            raise ValueError(f"Paired files have different numbers of reads ({n1}+ vs {n2}+)")
+        for i, (a, b) in enumerate(zip(b1.ids, b2.ids)):
+            if a != b and _pair_id(a) != _pair_id(b):
+                raise ValueError(f"Read ids differ at pair {done + i + 1}: {a!r} vs {b!r}")
+        done += len(b1)
+        yield b1, b2
+
+
+# ---------- конвейер ----------
+class TrimStats:
+    """Счётчики конвейера: риды/основания на входе и выходе, причины отбраковки."""
+
+    __slots__ = ("reads_in", "reads_out", "bases_in", "bases_out", "adapter_trimmed", "quality_trimmed", "too_short", "too_many_n")
+
+    def __init__(self) -> None:
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def as_dict(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"TrimStats({self.as_dict()})"
+
+
+class FastqTrimmer:
+    """
+    Конвейер тримминга FASTQ (см. модуль).
+
+    adapter        — строка или список адаптеров (точное совпадение);
+    min_overlap    — минимальная длина частичного адаптера на 3′-конце;
+    window         — (ширина, средний Phred) для скользящего окна;
+    quality_cutoff — порог 3′-обрезки по качеству;
+    min_length     — минимальная длина после обрезки;
+    max_n          — максимум N в риде (None — без ограничения).
+    """
+
+    def __init__(
+        self,
+        *,
+        adapter: Union[None, str, Sequence[str]] = None,
+        min_overlap: int = 3,
+        window: Optional[Tuple[int, float]] = None,
+        quality_cutoff: Optional[int] = None,
+        min_length: int = 0,
+        max_n: Optional[int] = None,
+    ) -> None:
+        self.adapters = [adapter] if isinstance(adapter, str) else list(adapter or [])
+        self.min_overlap = min_overlap
+        self.window = window
+        self.quality_cutoff = quality_cutoff
+        self.min_length = min_length
+        self.max_n = max_n
+        self.stats = TrimStats()
+
+    def trim(self, batch: FastqBatch) -> Tuple[FastqBatch, np.ndarray]:
+        """Обрезанный батч (все риды) и маска прошедших фильтры; обновляет stats."""
+        lengths = batch.lengths
+        ends = lengths.copy()
+        if self.adapters:
+            ends = np.minimum(ends, adapter_trim(batch.seqs, self.adapters, self.min_overlap))
+            self.stats.adapter_trimmed += int(np.count_nonzero(ends < lengths))
+        before = ends.copy()
+        if self.window is not None or self.quality_cutoff is not None:
+            phred = batch.phred
+            if self.window is not None:
+                size, threshold = self.window
+                ends = np.minimum(ends, sliding_window_trim(phred, ends, size, threshold))
+            if self.quality_cutoff is not None:
+                ends = np.minimum(ends, quality_trim_3p(phred, ends, self.quality_cutoff))
+            self.stats.quality_trimmed += int(np.count_nonzero(ends < before))
+        out = batch.truncate(ends) if (ends < lengths).any() else batch
+        keep = ends >= self.min_length
+        self.stats.too_short += int(np.count_nonzero(~keep))
+        if self.max_n is not None:
+            few_n = _count_n(out.seqs) <= self.max_n
+            self.stats.too_many_n += int(np.count_nonzero(keep & ~few_n))
+            keep &= few_n
+        self.stats.reads_in += len(batch)
+        self.stats.bases_in += int(lengths.sum())
+        return out, keep
+
+    def _count_out(self, batch: FastqBatch) -> FastqBatch:
+        self.stats.reads_out += len(batch)
+        self.stats.bases_out += int(batch.lengths.sum())
+        return batch
+
+    def process(self, batches: Iterable[FastqBatch]) -> Iterator[FastqBatch]:
+        """Обрезанные и отфильтрованные батчи."""
+        for batch in batches:
+            out, keep = self.trim(batch)
+            yield self._count_out(out.select(keep))
+
+    def process_paired(self, pairs: Iterable[Tuple[FastqBatch, FastqBatch]]) -> Iterator[Tuple[FastqBatch, FastqBatch]]:
+        """Пары батчей; пара остаётся, только если оба рида прошли фильтры."""
+        for b1, b2 in pairs:
+            o1, k1 = self.trim(b1)
+            o2, k2 = self.trim(b2)
+            keep = k1 & k2
+            yield self._count_out(o1.select(keep)), self._count_out(o2.select(keep))
+
+    def run(self, reader, out: str, batch_size: int = 10000, **writer_kwargs: Any) -> TrimStats:
+        """Прочитать FastqReader, обрезать и записать в ``out`` через FastqWriter."""
+        with FastqWriter(out, **writer_kwargs) as w:
+            for batch in self.process(reader.read_batches(batch_size)):
+                w.write_all(batch)
+        return self.stats
+
+    def run_paired(self, r1, r2, out1: str, out2: str, batch_size: int = 10000, **writer_kwargs: Any) -> TrimStats:
+        """Парный режим: R1/R2 синхронно, с проверкой id на том же проходе."""
+        with FastqWriter(out1, **writer_kwargs) as w1, FastqWriter(out2, **writer_kwargs) as w2:
+            for b1, b2 in self.process_paired(iter_paired(r1, r2, batch_size)):
+                w1.write_all(b1)
+                w2.write_all(b2)
+        return self.stats
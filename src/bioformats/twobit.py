@@ -0,0 +1,222 @@
+# src/bioformats/twobit.py
+"""
+Файлы UCSC .2bit: чтение с произвольным доступом и запись.
+
+Формат (все целые — uint32 в порядке байт записавшей машины):
+
+    заголовок:  signature 0x1A412743, version (0; 1 — 64-битные смещения),
+                sequenceCount, reserved
+    индекс:     nameSize (uint8), name, offset — на каждую последовательность
+    запись:     dnaSize, nBlockCount, nBlockStarts[], nBlockSizes[],
+                maskBlockCount, maskBlockStarts[], maskBlockSizes[],
+                reserved, packedDna (4 основания в байте, T=0 C=1 A=2 G=3)
+
+TwoBitReader отображает файл в память: при открытии читается только
+индекс имён, последовательность — PackedSequence прямо над байтами
+отображения (без распаковки и копирования).
+
+    with TwoBitWriter("hg.2bit") as w:
+        w.write_all(FastaReader("hg.fa").read())
+    tb = TwoBitReader("hg.2bit")
+    tb["chr1"][1_000_000:1_000_100]        # PackedSequence, читаются ~25 байт
+    tb.fetch("chr1", 100, 200)             # str
+"""
+
+from __future__ import annotations
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+import shutil
+import struct
+import tempfile
+
+import numpy as np
+
+from .packed import PackedSequence
+from .seqview import map_file
+
+TWOBIT_SIGNATURE = 0x1A412743
+
+
+class TwoBitReader:
+    """Чтение .2bit: имена и длины — из индекса, основания — по требованию."""
+
+    def __init__(self, filename: str) -> None:
+        self.filename = filename
+        self._buf = map_file(filename)
+        if len(self._buf) < 16:
+            raise ValueError(f"Not a .2bit file: {filename}")
+        sig = struct.unpack_from("<I", self._buf, 0)[0]
+        if sig == TWOBIT_SIGNATURE:
+            self._endian = "<"
+        elif sig == struct.unpack("<I", struct.pack(">I", TWOBIT_SIGNATURE))[0]:
+            self._endian = ">"
+        else:
+            raise ValueError(f"Not a .2bit file (bad signature): {filename}")
+        version, count, _ = struct.unpack_from(self._endian + "III", self._buf, 4)
+        if version not in (0, 1):
+            raise ValueError(f"Unsupported .2bit version {version}: {filename}")
+        offset_fmt = self._endian + ("Q" if version == 1 else "I")
+        offset_size = struct.calcsize(offset_fmt)
+        self._offsets: Dict[str, int] = {}
+        pos = 16
+        for _ in range(count):
+            size = self._buf[pos]
+            name = bytes(self._buf[pos + 1:pos + 1 + size]).decode("ascii")
+            pos += 1 + size
+            self._offsets[name] = struct.unpack_from(offset_fmt, self._buf, pos)[0]
+            pos += offset_size
+
+    # ---------- индекс ----------
+    @property
+    def names(self) -> List[str]:
+        return list(self._offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._offsets
+
+    def length(self, name: str) -> int:
+        """Длина последовательности (одно чтение uint32, без блоков)."""
+        return struct.unpack_from(self._endian + "I", self._buf, self._offset(name))[0]
+
+    def lengths(self) -> Dict[str, int]:
+        return {name: self.length(name) for name in self._offsets}
+
+    def _offset(self, name: str) -> int:
+        try:
+            return self._offsets[name]
+        except KeyError:
+            raise KeyError(f"Sequence {name!r} not found in {self.filename}") from None
+
+    # ---------- последовательности ----------
+    def __getitem__(self, name: str) -> PackedSequence:
+        """Последовательность ``name`` поверх отображения файла."""
+        u4 = np.dtype(self._endian + "u4")
+        buf, pos = self._buf, self._offset(name)
+        length, n_count = struct.unpack_from(self._endian + "II", buf, pos)
+        pos += 8
+
+        def blocks(count: int, at: int) -> Tuple[np.ndarray, np.ndarray]:
+            starts = np.frombuffer(buf, dtype=u4, count=count, offset=at).astype(np.int64)
+            sizes = np.frombuffer(buf, dtype=u4, count=count, offset=at + 4 * count).astype(np.int64)
+            return starts, starts + sizes
+
+        n_blocks = blocks(n_count, pos)
+        pos += 8 * n_count
+        m_count = struct.unpack_from(self._endian + "I", buf, pos)[0]
+        mask_blocks = blocks(m_count, pos + 4)
+        pos += 4 + 8 * m_count + 4  # + reserved
+        data = np.frombuffer(buf, dtype=np.uint8, count=(length + 3) // 4, offset=pos)
+        return PackedSequence(data, length, 2, n_blocks, mask_blocks)
+
+    def fetch(self, name: str, start: Optional[int] = None, end: Optional[int] = None) -> str:
+        """Подпоследовательность ``name[start:end]`` строкой (0-based, полуинтервал)."""
+        seq = self[name]
+        start, end, _ = slice(start, end).indices(len(seq))
+        return str(seq[start:max(start, end)])
+
+    def read(self) -> Iterator[Tuple[str, PackedSequence]]:
+        """(имя, PackedSequence) в порядке файла."""
+        for name in self._offsets:
+            yield name, self[name]
+
+    def __iter__(self) -> Iterator[Tuple[str, PackedSequence]]:
+        return self.read()
+
+
+class TwoBitWriter:
+    """
+    Запись .2bit. Индекс стоит в начале файла, а смещения известны только
+    в конце, поэтому записи копятся во временном файле и при close()
+    копируются за заголовком и индексом. Больше 4 ГиБ — версия 1
+    (64-битные смещения).
+    """
+
+    def __init__(self, filename: str) -> None:
+        self.filename = filename
+        self._names: List[str] = []
+        self._seen: set = set()
+        self._sizes: List[int] = []
+        self._tmp: Optional[BinaryIO] = None
+        self.count = 0
+
+    def open(self) -> None:
+        if self._tmp is None:
+            self._tmp = tempfile.TemporaryFile()  # type: ignore[assignment]
+
+    def __enter__(self) -> "TwoBitWriter":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        elif self._tmp is not None:
+            self._tmp.close()
+            self._tmp = None
+
+    def write(self, record: Tuple[str, Any]) -> None:
+        """Записать (имя, последовательность): str, bytes, SequenceView или PackedSequence."""
+        name, seq = record
+        raw_name = name.encode("ascii")
+        if not 0 < len(raw_name) < 256:
+            raise ValueError(f".2bit sequence names must be 1..255 bytes: {name!r}")
+        if name in self._seen:
+            raise ValueError(f"Duplicate sequence name: {name!r}")
+        self.open()
+        assert self._tmp is not None
+        packed = PackedSequence.pack(seq, 2)
+        n_starts, n_ends = packed.n_blocks()
+        m_starts, m_ends = packed.mask_blocks()
+        parts = [
+            struct.pack("<II", len(packed), len(n_starts)),
+            n_starts.astype("<u4").tobytes(),
+            (n_ends - n_starts).astype("<u4").tobytes(),
+            struct.pack("<I", len(m_starts)),
+            m_starts.astype("<u4").tobytes(),
+            (m_ends - m_starts).astype("<u4").tobytes(),
+            struct.pack("<I", 0),
+            _packed_bytes(packed),
+        ]
+        data = b"".join(parts)
+        self._tmp.write(data)
+        self._names.append(name)
+        self._seen.add(name)
+        self._sizes.append(len(data))
+        self.count += 1
+
+    def write_all(self, records: Iterable[Tuple[str, Any]]) -> int:
+        before = self.count
+        for rec in records:
+            self.write(rec)
+        return self.count - before
+
+    def close(self) -> None:
+        if self._tmp is None:
+            return
+        tmp, self._tmp = self._tmp, None
+        try:
+            index_size = sum(1 + len(n) + 4 for n in self._names)
+            version = 1 if 16 + index_size + sum(self._sizes) >= 1 << 32 else 0
+            if version:
+                index_size += 4 * len(self._names)
+            offset_fmt = "<Q" if version else "<I"
+            with open(self.filename, "wb") as out:
+                out.write(struct.pack("<IIII", TWOBIT_SIGNATURE, version, len(self._names), 0))
+                pos = 16 + index_size
+                for name, size in zip(self._names, self._sizes):
+                    raw = name.encode("ascii")
+                    out.write(struct.pack("<B", len(raw)) + raw + struct.pack(offset_fmt, pos))
+                    pos += size
+                tmp.seek(0)
+                shutil.copyfileobj(tmp, out, 1 << 20)
+        finally:
+            tmp.close()
+
+
+def _packed_bytes(seq: PackedSequence) -> bytes:
+    """Упакованные байты с позиции 0: целая последовательность — без перепаковки."""
+    if seq._start == 0 and len(seq.data) == (len(seq) + 3) // 4:
+        return np.asarray(seq.data, dtype=np.uint8).tobytes()
+    return PackedSequence.pack(seq.to_numpy(), 2).data.tobytes()
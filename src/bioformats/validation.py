@@ -0,0 +1,86 @@
+# src/bioformats/validation.py
+"""
+Проверка последовательностей по алфавиту — на уровне байтов, без цикла
+Python по символам.
+
+- быстрая проверка: ``bytes.translate(None, alphabet)`` удаляет все
+  допустимые байты; если что-то осталось — в записи есть чужие символы;
+- отчёт: таблица на 256 значений (NumPy) -> позиции и символы нарушений.
+
+Режимы ридера (``validate=``):
+
+    "off"    — не проверять;
+    "fast"   — некорректные записи пропускаются, отчёты копятся в
+               ``reader.invalid_records``;
+    "strict" — первая некорректная запись -> InvalidSequenceError с отчётом.
+"""
+
+from __future__ import annotations
+from typing import Any, NamedTuple, Optional
+
+import numpy as np
+
+VALIDATION_MODES = ("off", "fast", "strict")
+
+
+class ValidationReport(NamedTuple):
+    """Нарушения в одной записи: первые ``len(positions)`` позиций из ``count``."""
+
+    seq_id: str
+    length: int
+    count: int  # всего недопустимых символов
+    positions: np.ndarray  # 0-based, не больше limit первых
+    chars: str  # различные недопустимые символы
+
+    def __str__(self) -> str:
+        shown = ", ".join(str(p) for p in self.positions.tolist())
+        more = ", ..." if self.count > len(self.positions) else ""
+        return (
+            f"{self.seq_id}: {self.count} invalid character(s) {self.chars!r} "
+            f"of {self.length} at positions [{shown}{more}]"
+        )
+
+
+class InvalidSequenceError(ValueError):
+    """Запись не прошла проверку алфавита (validate="strict"); отчёт — в ``report``."""
+
+    def __init__(self, report: ValidationReport) -> None:
+        super().__init__(str(report))
+        self.report = report
+
+
+def _as_bytes(sequence: Any) -> Optional[bytes]:
+    """str/bytes/SequenceView -> bytes; None — в строке есть не-ASCII символы."""
+    if isinstance(sequence, str):
+        return sequence.encode("ascii") if sequence.isascii() else None
+    if isinstance(sequence, (bytes, bytearray)):
+        return sequence
+    return sequence.tobytes()
+
+
+class AlphabetValidator:
+    """Проверка по алфавиту: ``is_valid()`` — bool, ``report()`` — позиции нарушений."""
+
+    def __init__(self, alphabet: str) -> None:
+        self.alphabet = alphabet.encode("ascii")
+        self.table = np.zeros(256, dtype=bool)
+        self.table[np.frombuffer(self.alphabet, dtype=np.uint8)] = True
+
+    def is_valid(self, sequence: Any) -> bool:
+        data = _as_bytes(sequence)
+        return data is not None and not data.translate(None, self.alphabet)
+
+    def invalid_positions(self, sequence: Any) -> np.ndarray:
+        """Позиции (0-based) недопустимых символов."""
+        if isinstance(sequence, str) and not sequence.isascii():
+            # не-ASCII: позиции по символам, а не по байтам UTF-8
+            codes = np.frombuffer(sequence.encode("utf-32-le"), dtype=np.uint32)
+            return np.flatnonzero((codes > 127) | ~self.table[np.minimum(codes, 255)])
+        data = _as_bytes(sequence)
+        return np.flatnonzero(~self.table[np.frombuffer(data, dtype=np.uint8)])
+
+    def report(self, seq_id: str, sequence: Any, limit: int = 20) -> ValidationReport:
+        positions = self.invalid_positions(sequence)
+        text = sequence if isinstance(sequence, str) else _as_bytes(sequence).decode("latin-1")
+        chars = "".join(sorted({text[p] for p in positions.tolist()}))
+        return ValidationReport(seq_id, len(sequence), len(positions), positions[:limit], chars)
@@ -1,14 +1,54 @@
 # vcf.py
 from __future__ import annotations
-from typing import Iterator, Dict, Any
+from typing import Iterator, Dict, Any, Optional, Sequence, Tuple, List, Union
 
 from .genomic import GenomicDataReader
+from .header import VcfHeader
+from .genotypes import GenotypeBatch, iter_genotypes, make_info_parser
+
+
+def _parse_qual(value: str) -> Optional[float]:
+    """QUAL: число или '.' (нет значения)."""
+    return float(value) if value != "." else None
 
 
 class VcfReader(GenomicDataReader):
     """Класс для чтения VCF файлов."""
 
-    def read(self) -> Iterator[Dict[str, Any]]:
+    # пресет tabix: формат VCF, колонки CHROM/POS, конец — по длине REF
+    _tabix_format = 2
+    _tabix_columns = (1, 2, 0)
+    _meta_char = "#"
+    _batch_schema = {
+        "chrom": (0, "category"),
+        "pos": (1, "int32"),
+        "id": (2, "str"),
+        "ref": (3, "str"),
+        "alt": (4, "str"),
+        "qual": (5, "float64"),
+        "filter": (6, "category"),
+        "info": (7, "str"),
+    }
+    _header_class = VcfHeader
+    _min_fields = 8
+
+    _fields = {
+        "chrom": (0, str),
+        "pos": (1, int),
+        "id": (2, str),
+        "ref": (3, str),
+        "alt": (4, str),
+        "qual": (5, _parse_qual),
+        "filter": (6, str),
+        "info": (7, str),
+    }
+
+    def read(
+        self,
+        fields: Optional[List[str]] = None,
+        lazy: bool = False,
+        info: Union[bool, Sequence[str]] = False,
+    ) -> Iterator[Dict[str, Any]]:
         """
         Ленивое чтение вариантов из VCF файла.
 
@@ -21,39 +61,87 @@ class VcfReader(GenomicDataReader):
           - qual
           - filter
           - info
+
+        read(fields=["chrom", "pos"]) — только эти ключи (без float(qual) и
+        разбора остальных колонок); read(lazy=True) — LazyRecord.
+
+        info=True — INFO декодируется в словарь по определениям ##INFO
+        (типы и Number из заголовка); список ключей — только эти ключи.
+        """
+        schema = None
+        if info is not False:
+            keys = None if info is True else list(info)  # type: ignore[arg-type]
+            schema = dict(self._fields, info=(7, make_info_parser(self.header.info, keys)))
+        yield from self._iter_body(self._record_parser(fields, lazy, schema))
+
+    def read_genotypes(
+        self,
+        samples: Optional[Sequence[str]] = None,
+        fields: Sequence[str] = ("GT",),
+        *,
+        ploidy: int = 2,
+        batch_size: int = 4096,
+    ) -> Iterator[GenotypeBatch]:
         """
+        Генотипы батчами по ``batch_size`` вариантов (см. genotypes.py).
+
+        samples — подмножество сэмплов (по умолчанию все из #CHROM);
+        fields  — FORMAT-поля: "GT" -> int8-матрица (варианты × сэмплы ×
+        ploidy) и phased, Integer/Float-поля (DP, GQ) -> int32/float32.
+        Колонки после последнего нужного сэмпла не режутся и не разбираются.
+        """
+        header = self.header
+        start = header.end_offset
         with self:
-            for line in self.iter_lines(strip=True):
-                # пропускаем заголовок
-                if not line or line.startswith("#"):
-                    continue
-
-                fields = line.split("\t")
-                if len(fields) < 8:
-                    continue
-
-                yield {
-                    "chrom": fields[0],
-                    "pos": int(fields[1]),
-                    "id": fields[2],
-                    "ref": fields[3],
-                    "alt": fields[4],
-                    "qual": float(fields[5]) if fields[5] != "." else None,
-                    "filter": fields[6],
-                    "info": fields[7],
-                }
+            self.seek(start)
+            yield from iter_genotypes(
+                self.iter_lines(strip=True),
+                header.samples,
+                header.format,
+                samples=samples,
+                fields=fields,
+                ploidy=ploidy,
+                batch_size=batch_size,
+            )
+
+    def genotypes(
+        self, samples: Optional[Sequence[str]] = None, fields: Sequence[str] = ("GT",), *, ploidy: int = 2
+    ) -> GenotypeBatch:
+        """Все генотипы файла одним GenotypeBatch (для небольших файлов/подмножеств)."""
+        batches = list(self.read_genotypes(samples, fields, ploidy=ploidy))
+        if not batches:
+            names = list(samples) if samples is not None else self.header.samples
+            return GenotypeBatch.empty(names, fields, ploidy)
+        return GenotypeBatch.concat(batches)
+
+    def _parse_line(self, line: str) -> Optional[Dict[str, Any]]:
+        """Разобрать одну строку варианта (None — строка некорректна)."""
+        fields = line.split("\t")
+        if len(fields) < 8:
+            return None
+
+        return {
+            "chrom": fields[0],
+            "pos": int(fields[1]),
+            "id": fields[2],
+            "ref": fields[3],
+            "alt": fields[4],
+            "qual": _parse_qual(fields[5]),
+            "filter": fields[6],
+            "info": fields[7],
+        }
+
+    def _record_interval(self, fields: list[str]) -> Tuple[str, int, int]:
+        """Интервал варианта на референсе (0-based, полуинтервал) — по длине REF."""
+        beg = int(fields[1]) - 1
+        return fields[0], beg, beg + max(1, len(fields[3]))
 
     def get_header(self) -> list[str]:
         """
         Вернуть строки заголовка VCF (все строки, начинающиеся с '#').
+        Берутся из разобранного заголовка (self.header), без повторного чтения.
         """
-        header_lines: list[str] = []
-        with self:
-            for line in self.iter_lines(strip=False):
-                if not line.startswith("#"):
-                    break
-                header_lines.append(line.rstrip("\n"))
-        return header_lines
+        return list(self.header.lines)
 
     def header_by_group(self) -> dict[str, list[str]]:
         """
@@ -68,18 +156,4 @@ class VcfReader(GenomicDataReader):
 
         Это даёт "информацию по отдельным группам заголовков".
         """
-        groups: dict[str, list[str]] = {}
-        for line in self.get_header():
-            if line.startswith("##INFO"):
-                groups.setdefault("INFO", []).append(line)
-            elif line.startswith("##FILTER"):
-                groups.setdefault("FILTER", []).append(line)
-            elif line.startswith("##FORMAT"):
-                groups.setdefault("FORMAT", []).append(line)
-            elif line.startswith("##contig"):
-                groups.setdefault("CONTIG", []).append(line)
-            elif line.startswith("##"):
-                groups.setdefault("META", []).append(line)
-            elif line.startswith("#CHROM"):
-                groups.setdefault("COLUMNS", []).append(line)
-        return groups
+        return self.header.groups()
@@ -0,0 +1,386 @@
+# src/bioformats/writers.py
+"""
+Потоковая запись FASTA/FASTQ/SAM/VCF.
+
+Писатели принимают то, что отдают ридеры, и пишут крупными кусками:
+записи копятся в буфере (``buffer_size`` байт) и сбрасываются одним
+write(). Память не зависит от размера файла, поэтому ридер и писатель
+складываются в потоковый фильтр:
+
+    with VcfReader("in.vcf.gz") as r, VcfWriter("out.vcf.gz", header=r.header, index=True) as w:
+        w.write_all(rec for rec in r.read(lazy=True) if rec["filter"] == "PASS")
+
+- ``.gz``/``.bgz`` (или ``bgzf=True``) — вывод в BGZF (читается и обычным gzip);
+- ``index=True`` — индекс строится на лету, во время записи:
+  FASTA -> ``.fai`` (для BGZF ещё ``.gzi``), SAM/VCF -> tabix ``.tbi``
+  (только BGZF; вход должен быть отсортирован, иначе ValueError);
+- LazyRecord (``read(lazy=True)``) пишется исходной строкой без изменений —
+  так сохраняются все колонки, которых нет в dict-записях ридера
+  (QUAL для SAM, FORMAT/сэмплы для VCF);
+- write_batch() принимает RecordBatch из ``read_batches()``.
+"""
+
+from __future__ import annotations
+from typing import Any, BinaryIO, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+import math
+
+from .batch import CategoricalColumn, RecordBatch, StringColumn
+from .bgzf import BgzfWriter, GzipIndex
+from .fai import FaiRecord, FastaIndex, fai_path
+from .records import LazyRecord
+from .cigar import cigar_reference_length
+from .sam import SamReader
+from .seqview import SequenceView
+from .tabix import TabixIndex, tbi_path
+from .vcf import VcfReader
+
+HeaderLike = Union[None, Sequence[str], Any]  # строки или модель заголовка (.lines)
+
+
+class Writer:
+    """
+    Базовый буферизованный писатель.
+
+    filename      — путь; ``.gz``/``.bgz`` включает BGZF (если bgzf не задан явно);
+    bgzf          — сжимать ли вывод в BGZF;
+    compresslevel — уровень сжатия BGZF;
+    buffer_size   — сколько байт копить перед записью;
+    index         — строить индекс на лету (см. наследников).
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        *,
+        bgzf: Optional[bool] = None,
+        compresslevel: int = 6,
+        buffer_size: int = 1 << 20,
+        index: bool = False,
+        encoding: str = "utf-8",
+    ) -> None:
+        self.filename = filename
+        self.bgzf = bgzf if bgzf is not None else filename.endswith((".gz", ".bgz"))
+        self.compresslevel = compresslevel
+        self.buffer_size = buffer_size
+        self.index = index
+        self.encoding = encoding
+        self._out: Optional[BinaryIO] = None
+        self._buf: List[bytes] = []
+        self._buffered = 0
+        self._upos = 0  # несжатая позиция следующего байта (с учётом буфера)
+        self.count = 0  # записано записей
+
+    # ---------- lifecycle ----------
+    def open(self) -> None:
+        if self._out is not None:
+            return
+        if self.bgzf:
+            self._out = BgzfWriter(self.filename, compresslevel=self.compresslevel)  # type: ignore[assignment]
+        else:
+            self._out = open(self.filename, "wb")
+        self._write_header()
+
+    def close(self) -> None:
+        if self._out is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self._out.close()
+            self._out = None
+        self._finish()
+
+    def __enter__(self) -> "Writer":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # ---------- запись ----------
+    def write(self, record: Any) -> None:
+        """Записать одну запись (формат — см. наследника)."""
+        self._emit(self._format(record).encode(self.encoding))
+        self.count += 1
+
+    def write_all(self, records: Iterable[Any]) -> int:
+        """Записать все записи итератора; возвращает их число."""
+        self.open()
+        before = self.count
+        for rec in records:
+            self.write(rec)
+        return self.count - before
+
+    def write_batch(self, batch: RecordBatch) -> int:
+        """Записать RecordBatch (строки батча как dict-записи)."""
+        columns = {name: _column_values(col) for name, col in batch.columns.items()}
+        names = list(columns)
+        return self.write_all(dict(zip(names, row)) for row in zip(*columns.values()))
+
+    def flush(self) -> None:
+        """Сбросить буфер в файл."""
+        if self._buf:
+            assert self._out is not None
+            self._write_buffer(self._buf)
+            self._buf = []
+            self._buffered = 0
+
+    def _emit(self, data: bytes) -> None:
+        if self._out is None:
+            self.open()
+        self._buf.append(data)
+        self._buffered += len(data)
+        self._upos += len(data)
+        if self._buffered >= self.buffer_size:
+            self.flush()
+
+    def _write_buffer(self, chunks: List[bytes]) -> None:
+        assert self._out is not None
+        self._out.write(b"".join(chunks))
+
+    # ---------- точки расширения ----------
+    def _write_header(self) -> None:
+        """Записать заголовок (вызывается при открытии)."""
+
+    def _format(self, record: Any) -> str:
+        raise NotImplementedError
+
+    def _finish(self) -> None:
+        """Действия после закрытия файла (сохранение индексов)."""
+
+
+def _column_values(col: Any) -> List[Any]:
+    if isinstance(col, (StringColumn, CategoricalColumn)):
+        return col.to_list()
+    return col.tolist()
+
+
+def _header_lines(header: HeaderLike) -> List[str]:
+    if header is None:
+        return []
+    lines = getattr(header, "lines", header)
+    return [line.rstrip("\r\n") for line in lines]
+
+
+def _fmt_number(value: Any) -> str:
+    """Число для текстовой колонки: 30.0 -> '30', NaN/None -> '.'."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return "."
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+# ---------- последовательности ----------
+class FastaWriter(Writer):
+    """
+    Запись FASTA: записи ``(seq_id, sequence)`` — как у FastaReader.read()
+    (sequence — str, bytes или SequenceView). Строки по ``line_width``
+    символов; ``index=True`` — ``.fai`` (и ``.gzi`` для BGZF) по смещениям,
+    посчитанным при записи.
+    """
+
+    def __init__(self, filename: str, *, line_width: int = 60, **kwargs: Any) -> None:
+        super().__init__(filename, **kwargs)
+        if line_width < 1:
+            raise ValueError("line_width must be positive")
+        self.line_width = line_width
+        self._fai: Dict[str, FaiRecord] = {}
+
+    def write(self, record: Tuple[str, Any]) -> None:
+        name, seq = record[0], record[1]
+        if isinstance(seq, SequenceView):
+            data = seq.tobytes()
+        elif isinstance(seq, str):
+            data = seq.encode("ascii")
+        else:
+            data = bytes(seq)
+        w = self.line_width
+        head = b">" + name.encode(self.encoding) + b"\n"
+        body = b"\n".join([data[i:i + w] for i in range(0, len(data), w)])
+        if self.index:
+            key = name.split()[0] if name.split() else ""
+            if key in self._fai:
+                raise ValueError(f"Duplicate sequence name {key!r} in {self.filename}")
+            bases = min(len(data), w)
+            self._fai[key] = FaiRecord(key, len(data), self._upos + len(head), bases, bases + 1 if bases else 0)
+        self._emit(head + body + b"\n" if data else head)
+        self.count += 1
+
+    def _finish(self) -> None:
+        if self.index:
+            FastaIndex(self._fai).save(fai_path(self.filename))
+            if self.bgzf:
+                GzipIndex.build(self.filename).save(self.filename + ".gzi")
+
+
+class FastqWriter(Writer):
+    """
+    Запись FASTQ: записи ``(seq_id, sequence, quality)`` — как у
+    FastqReader.read_records(); sequence/quality — str или bytes.
+    """
+
+    def _format(self, record: Any) -> str:
+        if len(record) < 3:
+            raise ValueError(f"FASTQ record needs a quality string: {record[0]!r}")
+        sid, seq, qual = record[0], record[1], record[2]
+        if isinstance(seq, bytes):
+            seq = seq.decode("ascii")
+        if isinstance(qual, bytes):
+            qual = qual.decode("ascii")
+        if len(seq) != len(qual):
+            raise ValueError(f"Sequence and quality lengths differ for {sid!r}")
+        return f"@{sid}\n{seq}\n+\n{qual}\n"
+
+
+# ---------- геномные форматы ----------
+class GenomicWriter(Writer):
+    """
+    Общая часть SamWriter/VcfWriter: заголовок из ридера (``header=reader.header``
+    или список строк) и tabix-индекс на лету (``index=True``, только BGZF).
+    """
+
+    _reader: Any = None  # класс ридера формата: пресет tabix
+
+    def __init__(self, filename: str, *, header: HeaderLike = None, **kwargs: Any) -> None:
+        super().__init__(filename, **kwargs)
+        if self.index and not self.bgzf:
+            raise ValueError(f"Tabix index requires BGZF output: {filename}")
+        self.header_lines = _header_lines(header)
+        self._tabix: Optional[TabixIndex] = None
+        self._intervals: List[Optional[Tuple[str, int, int]]] = []
+        if self.index:
+            self._tabix = TabixIndex(
+                fmt=self._reader._tabix_format,
+                columns=self._reader._tabix_columns,
+                meta=self._reader._meta_char,
+            )
+
+    def _write_header(self) -> None:
+        assert self._out is not None
+        if self.header_lines:
+            data = ("\n".join(self.header_lines) + "\n").encode(self.encoding)
+            self._out.write(data)
+            self._upos += len(data)
+
+    def write(self, record: Mapping[str, Any]) -> None:
+        line = self._format(record)
+        if self._tabix is not None:
+            self._intervals.append(self._interval(line.split("\t", 6)))
+        self._emit(line.encode(self.encoding))
+        self.count += 1
+
+    def _write_buffer(self, chunks: List[bytes]) -> None:
+        if self._tabix is None:
+            super()._write_buffer(chunks)
+            return
+        # виртуальные смещения известны только в момент записи в BGZF
+        out = self._out
+        assert out is not None
+        for data, iv in zip(chunks, self._intervals):
+            vbeg = out.tell()
+            out.write(data)
+            if iv is not None:
+                self._tabix.add(iv[0], iv[1], iv[2], vbeg, out.tell())
+        self._intervals = []
+
+    def _finish(self) -> None:
+        if self._tabix is not None:
+            self._tabix.finish().save(tbi_path(self.filename))
+
+    def _interval(self, fields: List[str]) -> Optional[Tuple[str, int, int]]:
+        raise NotImplementedError
+
+
+class SamWriter(GenomicWriter):
+    """
+    Запись SAM: LazyRecord — исходной строкой; dict — по колонкам SAM
+    (qname, flag, chrom, pos, mapq, cigar, rnext, pnext, tlen, seq, qual,
+    tags — список ``TAG:TYPE:VALUE``); недостающие колонки — значения
+    «нет данных» (``*``, 0, MAPQ 255).
+    """
+
+    _reader = SamReader
+
+    def _format(self, record: Mapping[str, Any]) -> str:
+        if isinstance(record, LazyRecord):
+            return record.raw + "\n"
+        g = record.get
+        cols = [
+            g("qname", "*"),
+            g("flag", 0),
+            g("chrom", "*"),
+            g("pos", 0),
+            g("mapq", 255),
+            g("cigar", "*"),
+            g("rnext", "*"),
+            g("pnext", 0),
+            g("tlen", 0),
+            g("seq", "*") or "*",
+            g("qual", "*") or "*",
+        ]
+        cols.extend(g("tags") or ())
+        return "\t".join(map(str, cols)) + "\n"
+
+    def _interval(self, fields: List[str]) -> Optional[Tuple[str, int, int]]:
+        if fields[2] == "*":
+            return None  # невыровненные риды в индекс не попадают
+        beg = int(fields[3]) - 1
+        return fields[2], beg, beg + max(1, cigar_reference_length(fields[5]))
+
+
+class VcfWriter(GenomicWriter):
+    """
+    Запись VCF: LazyRecord — исходной строкой; dict — колонки chrom…info
+    (info — строка или словарь из ``read(info=True)``), опционально
+    ``format`` и ``samples`` (список ячеек). Без ``header`` пишется
+    минимальный заголовок (``##fileformat`` + ``#CHROM``).
+    """
+
+    _reader = VcfReader
+
+    def __init__(self, filename: str, *, header: HeaderLike = None, **kwargs: Any) -> None:
+        super().__init__(filename, header=header, **kwargs)
+        if not self.header_lines:
+            self.header_lines = ["##fileformat=VCFv4.2", "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO"]
+
+    def _format(self, record: Mapping[str, Any]) -> str:
+        if isinstance(record, LazyRecord):
+            return record.raw + "\n"
+        g = record.get
+        info = g("info", ".")
+        if isinstance(info, Mapping):
+            info = _format_info(info)
+        cols = [
+            g("chrom"),
+            g("pos"),
+            g("id", ".") or ".",
+            g("ref"),
+            g("alt", ".") or ".",
+            _fmt_number(g("qual")),
+            g("filter", ".") or ".",
+            info or ".",
+        ]
+        if "format" in record:
+            cols.append(record["format"])
+            cols.extend(record.get("samples") or ())
+        return "\t".join(map(str, cols)) + "\n"
+
+    def _interval(self, fields: List[str]) -> Optional[Tuple[str, int, int]]:
+        beg = int(fields[1]) - 1
+        return fields[0], beg, beg + max(1, len(fields[3]))
+
+
+def _format_info(info: Mapping[str, Any]) -> str:
+    """Словарь INFO обратно в строку: флаги — ключом, списки — через запятую."""
+    items = []
+    for key, value in info.items():
+        if value is True:
+            items.append(key)
+        elif value is False:
+            continue
+        elif isinstance(value, (list, tuple)):
+            items.append(f"{key}={','.join(_fmt_number(v) for v in value)}")
+        else:
+            items.append(f"{key}={_fmt_number(value)}")
+    return ";".join(items) or "."
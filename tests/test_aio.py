@@ -0,0 +1,86 @@
+import asyncio
+import random
+
+import pytest
+
+from bioformats import FastqReader, VcfReader
+from bioformats.aio import AsyncReader
+
+
+def write_fastq(path, n):
+    rnd = random.Random(0)
+    with open(path, "w") as fh:
+        for i in range(n):
+            seq = "".join(rnd.choice("ACGT") for _ in range(20))
+            fh.write(f"@r{i}\n{seq}\n+\n{'I' * 20}\n")
+
+
+def test_aread_matches_sync_and_runs_concurrently(tmp_path):
+    paths = []
+    for k in range(5):
+        p = tmp_path / f"r{k}.fq"
+        write_fastq(p, 300 + k)
+        paths.append(str(p))
+
+    async def collect(path):
+        async with AsyncReader(FastqReader(path), batch_size=7, max_batches=2) as r:
+            return [rec async for rec in r.aread()]
+
+    async def main():
+        return await asyncio.gather(*(collect(p) for p in paths))
+
+    results = asyncio.run(main())
+    for path, recs in zip(paths, results):
+        assert recs == list(FastqReader(path).read())
+
+    async def counts():
+        return await asyncio.gather(*(AsyncReader(FastqReader(p)).call("count") for p in paths))
+
+    assert asyncio.run(counts()) == [300, 301, 302, 303, 304]
+
+
+def test_early_break_stops_producer(tmp_path):
+    p = tmp_path / "big.fq"
+    write_fastq(p, 5000)
+
+    async def main():
+        r = AsyncReader(FastqReader(str(p)), batch_size=10, max_batches=1)
+        seen = []
+        async for seq_id, _seq in r.aread():
+            seen.append(seq_id)
+            if len(seen) == 25:
+                break
+        # следующий проход начинается с начала файла
+        first = [rec async for rec in r.aread()][:1]
+        return seen, first
+
+    seen, first = asyncio.run(main())
+    assert seen[0] == "r0" and len(seen) == 25
+    assert first[0][0] == "r0"
+
+
+def test_errors_propagate_and_vcf_arguments_pass_through(tmp_path):
+    vcf = tmp_path / "v.vcf"
+    vcf.write_text(
+        "##fileformat=VCFv4.2\n"
+        '##INFO=<ID=DP,Number=1,Type=Integer,Description="depth">\n'
+        "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\n"
+        "chr1\t5\t.\tA\tG\t30\tPASS\tDP=7\n",
+        encoding="utf-8",
+    )
+
+    async def main():
+        return [rec async for rec in AsyncReader(VcfReader(str(vcf))).aread(fields=["pos", "info"], info=True)]
+
+    assert asyncio.run(main()) == [{"pos": 5, "info": {"DP": 7}}]
+
+    bad = tmp_path / "bad.fq"
+    bad.write_text("@r1\nACGT\n+\n", encoding="utf-8")
+
+    async def broken():
+        return [rec async for rec in AsyncReader(FastqReader(str(bad))).aread()]
+
+    with pytest.raises(ValueError):
+        asyncio.run(broken())
+    with pytest.raises(ValueError):
+        AsyncReader(FastqReader(str(bad)), max_batches=0)
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from bioformats import SamReader, VcfReader
+from bioformats.batch import CategoricalColumn, StringColumn
+
+SAM = (
+    "@HD\tVN:1.6\n"
+    "r1\t0\tchr1\t100\t60\t10M\t*\t0\t0\tACGTACGTAC\t*\n"
+    "r2\t16\tchr2\t200\t60\t5M\t*\t0\t0\tACGTA\t*\n"
+    "r3\t4\tchr1\t300\t0\t*\t*\t0\t0\tNNNN\t*\tNM:i:0\n"
+)
+
+
+def test_sam_read_batches_columns(tmp_path):
+    p = tmp_path / "a.sam"
+    p.write_text(SAM, encoding="utf-8")
+
+    batches = list(SamReader(str(p)).read_batches(batch_size=2))
+    assert [len(b) for b in batches] == [2, 1]
+
+    b0, b1 = batches
+    assert b0["pos"].dtype == np.int32 and b0["flag"].dtype == np.uint16
+    assert b0["pos"].tolist() == [100, 200]
+    assert b0["mapq"].dtype == np.uint8 and b0["mapq"].tolist() == [60, 60]
+    assert b1["mapq"].tolist() == [0]
+    assert sorted(b0.column_names) == sorted(next(SamReader(str(p)).read()))
+    assert isinstance(b0["chrom"], CategoricalColumn)
+    # коды категорий стабильны между батчами
+    assert b1["chrom"].codes.tolist() == [0] and b1["chrom"][0] == "chr1"
+    assert isinstance(b0["qname"], StringColumn) and b0["qname"].to_list() == ["r1", "r2"]
+    assert b1["seq"][0] == "NNNN"
+
+    only = next(SamReader(str(p)).read_batches(columns=["chrom", "pos"]))
+    assert only.column_names == ["chrom", "pos"]
+
+
+def test_to_dataframe_from_batches(tmp_path):
+    p = tmp_path / "v.vcf"
+    p.write_text(
+        "##fileformat=VCFv4.2\n"
+        "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\n"
+        "chr1\t100\trs1\tA\tG\t50\tPASS\tDP=3\n"
+        "chr1\t150\t.\tC\tT\t.\tq10\t.\n"
+        "chr2\t250\t.\tG\tA\t99\tPASS\t.\n",
+        encoding="utf-8",
+    )
+    r = VcfReader(str(p))
+    df = r.to_dataframe()
+    assert list(df.columns) == ["chrom", "pos", "id", "ref", "alt", "qual", "filter", "info"]
+    assert df["chrom"].dtype == "category"
+    assert df["pos"].tolist() == [100, 150, 250]
+    assert np.isnan(df["qual"][1]) and df["qual"][2] == 99.0
+    assert df["id"].tolist() == ["rs1", ".", "."]
+    assert len(r.to_dataframe(limit=2)) == 2
+
+
+def test_dataframe_chunks_columns_and_dtypes(tmp_path):
+    p = tmp_path / "a.sam"
+    p.write_text(SAM, encoding="utf-8")
+    r = SamReader(str(p))
+
+    df = r.to_dataframe(columns=["chrom", "pos"], dtypes={"pos": "int64", "chrom": "str"})
+    assert list(df.columns) == ["chrom", "pos"]
+    assert df["pos"].dtype == np.int64 and df["chrom"].dtype != "category"
+
+    chunks = list(r.to_dataframe(chunksize=2, columns=["chrom", "flag"]))
+    assert [len(c) for c in chunks] == [2, 1]
+    assert chunks[1]["chrom"].tolist() == ["chr1"] and chunks[1]["chrom"].dtype == "category"
+    assert [len(c) for c in r.iter_dataframes(1)] == [1, 1, 1]
+
+    with pytest.raises(KeyError):
+        r.to_dataframe(dtypes={"nope": "int64"})
+
+
+def test_to_parquet_roundtrip(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    p = tmp_path / "a.sam"
+    p.write_text(SAM, encoding="utf-8")
+    out = tmp_path / "a.parquet"
+    assert SamReader(str(p)).to_parquet(str(out), batch_size=2) == 3
+    table = pq.read_table(str(out))
+    assert table.column("pos").to_pylist() == [100, 200, 300]
+    assert table.column("qname").to_pylist() == ["r1", "r2", "r3"]
+    assert table.column("chrom").to_pylist() == ["chr1", "chr2", "chr1"]
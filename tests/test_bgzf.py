@@ -0,0 +1,113 @@
+import gzip
+from bioformats import FastaReader, VcfReader
+from bioformats.bgzf import BgzfReader, BgzfWriter, bgzip, is_bgzf, split_virtual_offset
+
+
+def test_bgzf_roundtrip_and_virtual_offsets(tmp_path):
+    path = tmp_path / "lines.txt.gz"
+    lines = [f"line{i}\t{'A' * (i % 50)}\n" for i in range(20000)]
+
+    offsets = []
+    with BgzfWriter(str(path), text=True) as w:
+        for line in lines:
+            offsets.append(w.tell())
+            w.write(line)
+
+    assert is_bgzf(str(path))
+    # совместимо с обычным gzip (многочленный поток)
+    assert gzip.decompress(path.read_bytes()).decode() == "".join(lines)
+    # данных больше одного блока
+    assert split_virtual_offset(offsets[-1])[0] > 0
+
+    with BgzfReader(str(path), text=True) as r:
+        for i in (15000, 3, 19999, 7777):
+            r.seek(offsets[i])
+            assert r.readline() == lines[i]
+        r.seek(offsets[100])
+        assert r.tell() == offsets[100]
+        r.readline()
+        assert r.tell() == offsets[101]
+
+
+def test_reader_on_bgzf_vcf(tmp_path):
+    plain = tmp_path / "v.vcf"
+    plain.write_text(
+        "##fileformat=VCFv4.2\n"
+        "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\n"
+        "chr1\t100\t.\tA\tG\t50\tPASS\t.\n"
+        "chr2\t200\t.\tC\tT\t.\tPASS\t.\n",
+        encoding="utf-8",
+    )
+    gz = bgzip(str(plain))
+
+    r = VcfReader(gz)
+    assert [v["pos"] for v in r.read()] == [100, 200]
+
+    with r:
+        lines = r.iter_lines()
+        next(lines), next(lines)  # две строки заголовка
+        pos = r.tell()
+        assert next(lines).startswith("chr1")
+        r.seek(pos)
+        assert r.peek_line().startswith("chr1")
+
+
+def test_fasta_fetch_bgzf(tmp_path):
+    plain = tmp_path / "ref.fa"
+    plain.write_text(">a\nACGTACGTAC\nGT\n>b\nTTTT\n", encoding="utf-8")
+    gz = bgzip(str(plain))
+
+    r = FastaReader(gz)
+    r.build_index()
+    r2 = FastaReader(gz)
+    assert r2.index is not None
+    assert r2.fetch("a", 8, 12) == "ACGT"
+    assert r2.get_sequence("b") == "TTTT"
+
+
+def test_threaded_bgzf_matches_sequential(tmp_path):
+    path = tmp_path / "lines.txt.gz"
+    lines = [f"line{i}\t{'C' * (i % 70)}\n" for i in range(30000)]
+    offsets = []
+    with BgzfWriter(str(path), text=True) as w:
+        for line in lines:
+            offsets.append(w.tell())
+            w.write(line)
+
+    with BgzfReader(str(path), text=True, threads=4) as r:
+        assert r.read() == "".join(lines)
+        # seek назад и вперёд сбрасывает очередь предвыборки
+        for i in (5, 29999, 12345, 12346):
+            r.seek(offsets[i])
+            assert r.readline() == lines[i]
+        r.seek(offsets[20000])
+        assert list(r) == lines[20000:]
+
+
+def test_threaded_plain_gzip_reader(tmp_path):
+    import pytest
+    from bioformats import FastqReader
+    from bioformats.inflate import ThreadedGzipReader
+
+    records = [f"@r{i}\n{'ACGT' * 10}\n+\n{'I' * 40}\n" for i in range(5000)]
+    path = tmp_path / "reads.fq.gz"
+    # многочленный gzip: два члена подряд
+    path.write_bytes(gzip.compress("".join(records[:2000]).encode()) + gzip.compress("".join(records[2000:]).encode()))
+
+    expected = list(FastqReader(str(path)).read())
+    assert len(expected) == 5000
+    assert list(FastqReader(str(path), threads=4).read()) == expected
+    assert list(FastqReader(str(path), threads=4, binary=True).read())[-1] == ("r4999", b"ACGT" * 10)
+
+    data = "".join(records).encode()
+    with ThreadedGzipReader(str(path), chunk_size=1000, prefetch=2) as raw:
+        raw.seek(50000)
+        assert raw.read(20) == data[50000:50020]
+        raw.seek(10)
+        assert raw.tell() == 10
+        assert raw.read(10) == data[10:20]
+
+    truncated = tmp_path / "cut.fq.gz"
+    truncated.write_bytes(path.read_bytes()[:-100])
+    with pytest.raises(EOFError):
+        list(FastqReader(str(truncated), threads=2).read())
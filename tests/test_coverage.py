@@ -0,0 +1,99 @@
+import random
+
+import numpy as np
+import pytest
+
+from bioformats import SamReader
+from bioformats.bgzf import bgzip
+from bioformats.cigar import aligned_blocks, parse_cigar, reference_end
+from bioformats.coverage import iter_runs, write_bedgraph
+
+
+def test_cigar_arrays_and_spans():
+    ops, lengths = parse_cigar("5S10M2I5M3D4M100N6M")
+    assert ops.dtype == np.uint8 and ops.tolist() == [4, 0, 1, 0, 2, 0, 3, 0]
+    assert lengths.tolist() == [5, 10, 2, 5, 3, 4, 100, 6]
+    assert parse_cigar("*")[0].size == 0
+    assert reference_end(100, "10M2I5M3D4M") == 121
+    assert reference_end(100, "*") == 100
+    assert aligned_blocks("5S10M2I5M3D4M100N6M") == ((0, 15), (18, 22), (122, 128))
+    assert aligned_blocks("5M3D4M", deletions=True) == ((0, 12),)
+
+
+def random_sam(path, n=400, seed=0):
+    rnd = random.Random(seed)
+    reads = []
+    for chrom, size in (("chr1", 3000), ("chr2", 2000)):
+        for _ in range(n):
+            pos = rnd.randint(1, size - 300)
+            cigar = rnd.choice(["50M", "20M5I30M", "10S40M", "25M10D25M", "20M200N30M", "30M2D5M1I10M"])
+            flag = rnd.choice([0, 16, 0, 1024, 256])
+            mapq = rnd.randint(0, 60)
+            reads.append((chrom, pos, flag, mapq, cigar))
+    reads.sort(key=lambda r: (r[0], r[1]))
+    with open(path, "w") as fh:
+        fh.write("@HD\tVN:1.6\tSO:coordinate\n@SQ\tSN:chr1\tLN:3000\n@SQ\tSN:chr2\tLN:2000\n@SQ\tSN:chr3\tLN:500\n")
+        for i, (chrom, pos, flag, mapq, cigar) in enumerate(reads):
+            fh.write(f"r{i}\t{flag}\t{chrom}\t{pos}\t{mapq}\t{cigar}\t*\t0\t0\tACGT\tIIII\n")
+    return reads
+
+
+def naive_depth(reads, min_mapq=0):
+    out = {"chr1": np.zeros(3000, np.int32), "chr2": np.zeros(2000, np.int32)}
+    for chrom, pos, flag, mapq, cigar in reads:
+        if flag & 0x704 or mapq < min_mapq:
+            continue
+        for b, e in aligned_blocks(cigar):
+            out[chrom][pos - 1 + b:pos - 1 + e] += 1
+    return out
+
+
+def test_depth_matches_naive_and_processes(tmp_path):
+    sam = tmp_path / "a.sam"
+    reads = random_sam(sam)
+    r = SamReader(str(sam))
+    for min_mapq in (0, 30):
+        expected = naive_depth(reads, min_mapq)
+        got = r.depth(min_mapq=min_mapq)
+        assert set(got) == {"chr1", "chr2", "chr3"}
+        assert not got["chr3"].any()
+        for chrom in expected:
+            assert np.array_equal(got[chrom], expected[chrom])
+
+    runs = list(r.coverage())
+    assert all(run.depth > 0 and run.start < run.end for run in runs)
+    # соседние отрезки одной глубины склеены
+    assert all(not (a.end == b.start and a.depth == b.depth) for a, b in zip(runs, runs[1:]))
+
+    gz = bgzip(str(sam))
+    indexed = SamReader(gz)
+    indexed.build_index()
+    assert list(indexed.coverage(processes=2)) == runs
+    assert list(indexed.coverage("chr2")) == [run for run in runs if run.chrom == "chr2"]
+
+    n = write_bedgraph(r.coverage(zeros=True), tmp_path / "cov.bedgraph")
+    lines = (tmp_path / "cov.bedgraph").read_text().splitlines()
+    assert len(lines) == n and lines[0].startswith("chr1\t0\t")
+    # нулевые отрезки доходят до конца хромосомы (LN из @SQ)
+    chr2_last = [line for line in lines if line.startswith("chr2\t")][-1]
+    assert chr2_last.split("\t")[2:] == ["2000", "0"]
+
+
+def test_overlap_filter_and_unsorted_input(tmp_path):
+    sam = tmp_path / "b.sam"
+    sam.write_text(
+        "@SQ\tSN:chr1\tLN:1000\n"
+        "early\t0\tchr1\t50\t60\t30M200N30M\t*\t0\t0\tA\tI\n"
+        "inside\t0\tchr1\t120\t60\t10M\t*\t0\t0\tA\tI\n"
+        "late\t0\tchr1\t400\t60\t10M\t*\t0\t0\tA\tI\n",
+        encoding="utf-8",
+    )
+    r = SamReader(str(sam))
+    # 'early' начинается до региона, но по CIGAR (конец 309) его пересекает
+    assert [a["qname"] for a in r.filter_by_region("chr1", 100, 150)] == ["early", "inside"]
+    assert [a["qname"] for a in r.filter_by_region("chr1", 310, 399)] == []
+
+    with pytest.raises(ValueError):
+        list(iter_runs([("chr1", 100, "10M"), ("chr1", 50, "10M")]))
+    with pytest.raises(ValueError):
+        list(iter_runs([("chr1", 1, "10M"), ("chr2", 1, "10M"), ("chr1", 5, "10M")]))
@@ -29,3 +29,169 @@ def test_fasta_basic(tmp_path):
     assert r.count() == 2
     assert r.average_length() == 7.0
     assert r.validate_sequence("ACGTN")
+
+
+def test_fasta_fai_index_and_fetch(tmp_path):
+    fasta = write(
+        tmp_path,
+        "ref.fasta",
+        """
+        >chr1 first contig
+        ACGTA
+        CGTAC
+        GT
+        >chr2
+        NNNNA
+        """,
+    )
+
+    r = FastaReader(str(fasta))
+    idx = r.build_index()
+    assert (tmp_path / "ref.fasta.fai").read_text().splitlines()[0] == "chr1\t12\t19\t5\t6"
+    assert idx.names == ["chr1", "chr2"]
+
+    # свежий reader подхватывает sidecar автоматически
+    r2 = FastaReader(str(fasta))
+    assert r2.index is not None
+    assert r2.get_sequence("chr1") == "ACGTACGTACGT"
+    assert r2.get_sequence("chr2") == "NNNNA"
+    assert r2.fetch("chr1", 3, 11) == "TACGTACG"
+    assert r2.fetch("chr1", 10) == "GT"
+    assert r2.fetch("chr2", 4, 100) == "A"
+
+
+def test_fasta_fetch_crlf(tmp_path):
+    fasta = tmp_path / "crlf.fasta"
+    fasta.write_bytes(b">s\r\nACG\r\nTTA\r\nC\r\n")
+
+    r = FastaReader(str(fasta))
+    assert r.fetch("s") == "ACGTTAC"
+    assert r.fetch("s", 2, 5) == "GTT"
+
+
+def test_fasta_binary_mode(tmp_path):
+    fasta = write(
+        tmp_path,
+        "bin.fasta",
+        """
+        >chr1 first
+        ACGTA
+        CCGGT
+        >bad
+        ACXX
+        >chr2
+        TTTT
+        """,
+    )
+    r = FastaReader(str(fasta), binary=True)
+    assert list(r.read()) == [("chr1", b"ACGTACCGGT"), ("chr2", b"TTTT")]
+
+    r.build_index(save=False)
+    assert r.fetch("chr1", 3, 8) == b"TACCG"
+    assert r.fetch("chr1", 5, 5) == b""
+
+
+def test_fasta_mmap_views(tmp_path):
+    import gzip
+    import pickle
+    import numpy as np
+    import pytest
+    from bioformats.seqview import SequenceView
+
+    fasta = write(
+        tmp_path,
+        "mm.fasta",
+        """
+        >chr1 first
+        ACGTA
+        CCGGT
+        TT
+        >bad
+        ACXX
+        >chr2
+        GGGG
+        """,
+    )
+    plain = list(FastaReader(str(fasta)).read())
+    r = FastaReader(str(fasta), mmap=True)
+    mapped = list(r.read())
+
+    assert [sid for sid, _ in mapped] == [sid for sid, _ in plain]
+    assert all(isinstance(v, SequenceView) for _, v in mapped)
+    assert [str(v) for _, v in mapped] == [s for _, s in plain]
+
+    view = r.get_sequence("chr1")
+    assert len(view) == 12 and view == "ACGTACCGGTTT"
+    sub = view[3:11]
+    assert isinstance(sub, SequenceView) and str(sub) == "TACCGGTT"
+    assert sub[0] == "T" and sub[-1] == "T" and view[::4] == "AAG"
+    assert bytes(r.fetch("chr1", 4, 9)) == b"ACCGG"
+
+    arr = view[5:10].to_numpy()  # одна строка файла — окно без копирования
+    assert arr.tobytes() == b"CCGGT" and not arr.flags.owndata
+    assert np.array_equal(view.to_numpy(), np.frombuffer(b"ACGTACCGGTTT", dtype=np.uint8))
+
+    clone = pickle.loads(pickle.dumps(sub))
+    assert isinstance(clone, SequenceView) and clone == sub
+
+    gz = tmp_path / "mm.fasta.gz"
+    gz.write_bytes(gzip.compress(fasta.read_bytes()))
+    with pytest.raises(ValueError):
+        FastaReader(str(gz), mmap=True)
+
+
+def test_validation_modes(tmp_path):
+    import pytest
+    from bioformats.validation import InvalidSequenceError
+
+    fasta = write(
+        tmp_path,
+        "bad.fasta",
+        """
+        >ok
+        ACGTN
+        >bad
+        ACXGT
+        AC*T
+        >ok2
+        acgt
+        """,
+    )
+    fast = FastaReader(str(fasta))
+    assert [sid for sid, _ in fast.read()] == ["ok", "ok2"]
+    report = fast.invalid_records[0]
+    assert (report.seq_id, report.count, report.positions.tolist(), report.chars) == ("bad", 2, [2, 7], "*X")
+    assert "bad: 2 invalid" in str(report)
+    # отчёты — за последний проход, без дублей; список ограничен
+    list(fast.read())
+    assert fast.count() == 2
+    assert [r.seq_id for r in fast.invalid_records] == ["bad"]
+    capped = FastaReader(str(fasta), alphabet="ACGTacgt")
+    capped.max_invalid_reports = 1
+    assert [sid for sid, _ in capped.read()] == ["ok2"]
+    assert len(capped.invalid_records) == 1 and capped.invalid_count == 2
+
+    assert [sid for sid, _ in FastaReader(str(fasta), validate="off").read()] == ["ok", "bad", "ok2"]
+    assert [sid for sid, _ in FastaReader(str(fasta), mmap=True).read()] == ["ok", "ok2"]
+
+    with pytest.raises(InvalidSequenceError) as err:
+        list(FastaReader(str(fasta), validate="strict", binary=True).read())
+    assert err.value.report.positions.tolist() == [2, 7]
+    with pytest.raises(InvalidSequenceError):
+        list(FastaReader(str(fasta), validate="strict", mmap=True).read())
+    with pytest.raises(ValueError):
+        FastaReader(str(fasta), validate="maybe")
+
+    # get_sequence проверяет одинаково с индексом и без
+    for indexed in (False, True):
+        if indexed:
+            FastaReader(str(fasta)).build_index()
+        with pytest.raises(InvalidSequenceError):
+            FastaReader(str(fasta), validate="strict").get_sequence("bad")
+        with pytest.raises(KeyError):
+            FastaReader(str(fasta)).get_sequence("bad")
+        assert FastaReader(str(fasta), validate="off").get_sequence("bad") == "ACXGTAC*T"
+
+    r = FastaReader(str(fasta))
+    assert not r.validate_sequence("ACGTé")
+    assert r.validation_report("x", "AéCZ").positions.tolist() == [1, 3]
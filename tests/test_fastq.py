@@ -57,3 +57,55 @@ def test_fastq_iterates_records(tmp_path):
     assert items[0][1] == "ACT"
     assert items[1][0] == "b"
     assert items[1][1] == "GGGG"
+
+
+def test_fastq_binary_mode(tmp_path):
+    import numpy as np
+    from bioformats.qc import FastqQC
+
+    fastq = write(
+        tmp_path,
+        "b.fastq",
+        """
+        @r1 desc
+        ACGT
+        +
+        IIII
+        @r2
+        ACAA
+        +
+        !!!!
+        """,
+    )
+    text = list(FastqReader(str(fastq)).read())
+    binary = list(FastqReader(str(fastq), binary=True).read())
+
+    assert [sid for sid, _ in binary] == [sid for sid, _ in text]
+    assert all(isinstance(seq, bytes) for _, seq in binary)
+    assert [seq.decode() for _, seq in binary] == [seq for _, seq in text]
+    assert np.frombuffer(binary[0][1], dtype=np.uint8).tolist() == list(b"ACGT")
+
+    qc = FastqQC().add_reader(FastqReader(str(fastq), binary=True))
+    assert qc.n_reads == 2
+    assert qc.mean_quality().tolist() == [20.0] * 4
+
+
+def test_fastq_validation_opt_in(tmp_path):
+    fastq = write(
+        tmp_path,
+        "v.fastq",
+        """
+        @r1
+        ACGT
+        +
+        IIII
+        @r2
+        AC.A
+        +
+        IIII
+        """,
+    )
+    assert [sid for sid, _ in FastqReader(str(fastq)).read()] == ["r1", "r2"]  # по умолчанию — без проверки
+    r = FastqReader(str(fastq), validate="fast")
+    assert [sid for sid, _ in r.read()] == ["r1"]
+    assert r.invalid_records[0].positions.tolist() == [2]
@@ -0,0 +1,87 @@
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from bioformats import FastaReader, FastqReader
+from bioformats.kmers import KmerCounter, encode_kmer, kmer_codes, reverse_complement_code
+from bioformats.packed import PackedSequence, decode_kmer
+
+COMP = str.maketrans("ACGT", "TGCA")
+
+
+def _canonical(kmer):
+    return min(kmer, kmer.translate(COMP)[::-1])
+
+
+def _naive(seqs, k, canonical=True):
+    out = Counter()
+    for s in seqs:
+        s = s.upper()
+        for i in range(len(s) - k + 1):
+            w = s[i:i + k]
+            if set(w) <= set("ACGT"):
+                out[_canonical(w) if canonical else w] += 1
+    return out
+
+
+def test_kmer_codes():
+    seq = "ACGTNACGTTGCAacgt"
+    assert [decode_kmer(c, 3) for c in kmer_codes(seq, 3)] == ["ACG", "CGT", "ACG", "CGT", "GTT", "TTG", "TGC", "GCA", "CAA", "AAC", "ACG", "CGT"]
+    canon = kmer_codes(seq, 3, canonical=True)
+    assert [decode_kmer(c, 3) for c in canon] == [_canonical(decode_kmer(c, 3)) for c in kmer_codes(seq, 3)]
+    assert reverse_complement_code(encode_kmer("AACG"), 4) == encode_kmer("CGTT")
+    assert np.array_equal(kmer_codes(PackedSequence.pack(seq), 5), kmer_codes(seq, 5))
+    assert kmer_codes("ACGTACGTACGTACGTACGTACGTACGTACGT", 31).dtype == np.uint64
+    with pytest.raises(ValueError):
+        kmer_codes(seq, 32)
+
+
+def test_exact_table_sketch_and_histogram(tmp_path):
+    rnd = random.Random(4)
+    seqs = ["".join(rnd.choices("ACGTN", weights=[30, 30, 30, 30, 1], k=rnd.randint(5, 120))) for _ in range(400)]
+    k = 6
+    naive = _naive(seqs, k)
+    counter = KmerCounter(k, batch_bases=2000).add_sequences(seqs)
+    keys, counts = counter.items()
+    assert {decode_kmer(c, k): int(n) for c, n in zip(keys, counts)} == dict(naive)
+    assert counter["ACGTAC"] == naive[_canonical("ACGTAC")]
+    assert counter.n_kmers == sum(naive.values())
+
+    hist = counter.histogram()
+    assert hist.tolist() == np.bincount(list(naive.values())).tolist()
+    lines = counter.write_histogram(tmp_path / "h.txt")
+    assert (tmp_path / "h.txt").read_text().splitlines()[0] == f"{np.flatnonzero(hist)[0]} {hist[hist > 0][0]}"
+    assert lines == np.count_nonzero(hist)
+
+    forward = KmerCounter(k, canonical=False).add_sequences(seqs)
+    assert forward["ACGTAC"] == _naive(seqs, k, canonical=False)["ACGTAC"]
+
+    sketch = KmerCounter(k, memory=4096, depth=3).add_sequences(seqs[:200])
+    sketch.merge(KmerCounter(k, memory=4096, depth=3).add_sequences(seqs[200:]))
+    assert sketch.counts.nbytes <= 4096
+    est = sketch.get(list(naive))
+    assert (est >= np.array(list(naive.values()))).all()  # count-min не занижает
+    with pytest.raises(ValueError):
+        sketch.histogram()
+    with pytest.raises(ValueError):
+        sketch.merge(counter)
+
+
+def test_parallel_matches_serial(tmp_path):
+    rnd = random.Random(8)
+    genome = "".join(rnd.choices("ACGT", k=3000))
+    fq = tmp_path / "r.fastq"
+    with open(fq, "w") as fh:
+        for i in range(300):
+            p = rnd.randint(0, len(genome) - 80)
+            fh.write(f"@r{i}\n{genome[p:p + 80]}\n+\n{'I' * 80}\n")
+    serial = KmerCounter(15).add_reader(FastqReader(str(fq)))
+    parallel = KmerCounter(15).add_reader(FastqReader(str(fq)), workers=2, chunk_size=4096)
+    assert all(np.array_equal(a, b) for a, b in zip(serial.items(), parallel.items()))
+    assert parallel.n_sequences == 300
+
+    fa = tmp_path / "g.fa"
+    fa.write_text(">g\n" + "\n".join(genome[i:i + 60] for i in range(0, len(genome), 60)) + "\n")
+    assert len(KmerCounter(11).add_reader(FastaReader(str(fa)))) == len(_naive([genome], 11))
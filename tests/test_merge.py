@@ -0,0 +1,75 @@
+import random
+
+from bioformats import SamReader, VcfReader
+from bioformats.merge import is_sorted, merge, sort_file
+
+VCF_HEADER = (
+    "##fileformat=VCFv4.2\n"
+    "##contig=<ID=chr2,length=1000>\n"
+    "##contig=<ID=chr1,length=1000>\n"
+    "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\n"
+)
+
+
+def _vcf(path, rows):
+    path.write_text(VCF_HEADER + "".join(f"{c}\t{p}\t.\tA\tG\t50\tPASS\t.\n" for c, p in rows))
+    return VcfReader(str(path))
+
+
+def test_is_sorted_uses_header_contig_order(tmp_path):
+    assert is_sorted(_vcf(tmp_path / "a.vcf", [("chr2", 5), ("chr2", 9), ("chr1", 1)]))
+    assert not is_sorted(_vcf(tmp_path / "b.vcf", [("chr1", 1), ("chr2", 5)]))
+    assert not is_sorted(_vcf(tmp_path / "c.vcf", [("chr2", 9), ("chr2", 5)]))
+    # хромосомы без ##contig: достаточно, чтобы каждая шла одним блоком
+    assert is_sorted(_vcf(tmp_path / "d.vcf", [("chrY", 3), ("chrX", 1)]))
+    assert not is_sorted(_vcf(tmp_path / "e.vcf", [("chrY", 3), ("chrX", 1), ("chrY", 4)]))
+
+
+def test_merge_shards(tmp_path):
+    a = _vcf(tmp_path / "a.vcf", [("chr2", 1), ("chr2", 50), ("chr1", 7)])
+    b = _vcf(tmp_path / "b.vcf", [("chr2", 20), ("chr1", 3), ("chr1", 7), ("chrM", 1)])
+    merged = [(r["chrom"], r["pos"]) for r in merge([a, b], fields=["chrom", "pos"])]
+    assert merged == [("chr2", 1), ("chr2", 20), ("chr2", 50), ("chr1", 3), ("chr1", 7), ("chr1", 7), ("chrM", 1)]
+    lazy = list(merge([a, b], lazy=True))
+    assert lazy[0].raw.startswith("chr2\t1\t")
+    c = _vcf(tmp_path / "c.vcf", [("chrX", 9), ("chrX", 2)])
+    d = _vcf(tmp_path / "d.vcf", [("chrX", 5)])
+    desc = merge([c, d], key=lambda rec: -rec["pos"], fields=["pos"])
+    assert [r["pos"] for r in desc] == [9, 5, 2]
+
+
+def test_external_sort_spills_runs(tmp_path):
+    rnd = random.Random(3)
+    rows = [(rnd.choice(["chr1", "chr2", "*"]), rnd.randint(1, 900), i) for i in range(500)]
+    body = "".join(
+        f"r{i}\t{4 if c == '*' else 0}\t{c}\t{p if c != '*' else 0}\t60\t{'*' if c == '*' else '10M'}\t*\t0\t0\tACGTACGTAC\t*\n"
+        for c, p, i in rows
+    )
+    src = tmp_path / "in.sam"
+    src.write_text("@HD\tVN:1.6\tSO:unsorted\n@SQ\tSN:chr2\tLN:1000\n@SQ\tSN:chr1\tLN:1000\n" + body)
+    reader = SamReader(str(src))
+    assert not is_sorted(reader)
+
+    out = tmp_path / "out.sam.gz"
+    n = sort_file(reader, str(out), memory=4000, fan_in=3, tmpdir=str(tmp_path), index=True)
+    assert n == 500
+    assert not list(tmp_path.glob("*.run"))  # временные прогоны удалены
+    sorted_reader = SamReader(str(out))
+    assert sorted_reader.header.references == {"chr2": 1000, "chr1": 1000}
+    assert sorted_reader.header.sort_order == "coordinate"
+    assert sorted_reader.header.lines[0] == "@HD\tVN:1.6\tSO:coordinate"
+    assert is_sorted(sorted_reader)
+    rank = {"chr2": 0, "chr1": 1, "*": 2}
+    expected = sorted(rows, key=lambda r: (rank[r[0]], r[1] if r[0] != "*" else 0))  # устойчиво по i
+    assert [rec["qname"] for rec in sorted_reader.read()] == [f"r{i}" for _, _, i in expected]
+    assert len(list(sorted_reader.filter_by_region("chr1", 1, 1000))) == sum(c == "chr1" for c, _, _ in rows)
+
+
+def test_sort_file_adds_hd_line(tmp_path):
+    src = tmp_path / "nohd.sam"
+    src.write_text("@SQ\tSN:chr1\tLN:100\nb\t0\tchr1\t9\t60\t1M\t*\t0\t0\tA\t*\na\t0\tchr1\t2\t60\t1M\t*\t0\t0\tA\t*\n")
+    out = tmp_path / "out.sam"
+    assert sort_file(SamReader(str(src)), str(out)) == 2
+    sorted_reader = SamReader(str(out))
+    assert sorted_reader.header.sort_order == "coordinate"
+    assert [rec["qname"] for rec in sorted_reader.read()] == ["a", "b"]
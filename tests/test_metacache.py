@@ -0,0 +1,108 @@
+import os
+import pickle
+import time
+from bioformats import FastaReader, VcfReader
+from bioformats.metacache import MetadataCache
+
+
+def make_vcf(path, n, chrom="chr1"):
+    path.write_text(
+        "##fileformat=VCFv4.2\n##source=test reference=GRCh38\n#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\n"
+        + "".join(f"{chrom}\t{i + 1}\t.\tA\tG\t30\tPASS\t.\n" for i in range(n)),
+        encoding="utf-8",
+    )
+    return str(path)
+
+
+def no_reads(reader):
+    """Ридер, которому запрещено читать файл."""
+    def fail(*args, **kwargs):
+        raise AssertionError("file was read")
+
+    reader.read = fail
+    reader._read_header_model = fail
+    return reader
+
+
+def test_values_persist_across_readers(tmp_path):
+    cache = MetadataCache(str(tmp_path / "cache"))
+    vcf = make_vcf(tmp_path / "a.vcf", 7)
+
+    r = VcfReader(vcf, cache=cache)
+    assert r.count() == 7
+    assert r.get_reference_genome() == "GRCh38"
+
+    # новый ридер (как в новом процессе) — всё из SQLite
+    fresh = no_reads(VcfReader(vcf, cache=MetadataCache(str(tmp_path / "cache"))))
+    assert fresh.count() == 7
+    assert fresh.get_chromosomes() == ["chr1"]
+    assert fresh.header_by_group()["META"][1] == "##source=test reference=GRCh38"
+
+    # изменение файла инвалидирует запись
+    make_vcf(tmp_path / "a.vcf", 3, chrom="chr2")
+    st = os.stat(vcf)
+    os.utime(vcf, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    again = VcfReader(vcf, cache=cache)
+    assert again.count() == 3
+    assert again.get_chromosomes() == ["chr2"]
+
+
+def test_lru_eviction_and_pickle(tmp_path):
+    cache = MetadataCache(str(tmp_path / "cache"), max_files=2)
+    paths = [make_vcf(tmp_path / f"v{i}.vcf", i + 1) for i in range(3)]
+    for p in paths[:2]:
+        VcfReader(p, cache=cache).count()
+        time.sleep(0.01)
+    assert no_reads(VcfReader(paths[0], cache=cache)).count() == 1  # v0 — снова свежий
+    time.sleep(0.01)
+    VcfReader(paths[2], cache=cache).count()
+
+    assert len(cache) == 2
+    sig = lambda p: (os.path.getsize(p), os.stat(p).st_mtime_ns)  # noqa: E731
+    ns = VcfReader(paths[2])._cache_namespace()
+    assert cache.get(paths[1], sig(paths[1]), ns) == {}  # вытеснен как давно не запрошенный
+    assert cache.get(paths[2], sig(paths[2]), ns)["count"] == 3
+
+    fa = tmp_path / "s.fa"
+    fa.write_text(">a\nACGT\n", encoding="utf-8")
+    r = FastaReader(str(fa), cache=cache)
+    assert r.count() == 1
+    clone = pickle.loads(pickle.dumps(r))
+    assert no_reads(clone).count() == 1
+
+
+def test_content_hash_detects_same_size_rewrite(tmp_path):
+    cache = MetadataCache(str(tmp_path / "cache"), content_hash=True)
+    vcf = make_vcf(tmp_path / "h.vcf", 4)
+    assert VcfReader(vcf, cache=cache).get_chromosomes() == ["chr1"]
+
+    st = os.stat(vcf)
+    make_vcf(tmp_path / "h.vcf", 4, chrom="chr9")  # тот же размер
+    os.utime(vcf, ns=(st.st_atime_ns, st.st_mtime_ns))  # и тот же mtime
+    assert VcfReader(vcf, cache=cache).get_chromosomes() == ["chr9"]
+
+
+def test_reader_settings_are_part_of_key(tmp_path):
+    cache = MetadataCache(str(tmp_path / "cache"))
+    fa = tmp_path / "n.fa"
+    fa.write_text(">a\nACGT\n>b\nACGN\n", encoding="utf-8")
+
+    assert FastaReader(str(fa), alphabet="ACGT", cache=cache).count() == 1
+    assert FastaReader(str(fa), cache=cache).count() == 2
+    # обе настройки сохранены отдельно
+    assert no_reads(FastaReader(str(fa), alphabet="TGCA", cache=cache)).count() == 1
+    assert no_reads(FastaReader(str(fa), cache=cache)).count() == 2
+
+
+def test_validate_mode_is_part_of_key(tmp_path):
+    import pytest
+    from bioformats.validation import InvalidSequenceError
+
+    cache = MetadataCache(str(tmp_path / "cache"))
+    fa = tmp_path / "v.fa"
+    fa.write_text(">a\nACGT\n>b\nACXT\n>c\nGG\n", encoding="utf-8")
+
+    assert FastaReader(str(fa), validate="off", cache=cache).count() == 3
+    assert FastaReader(str(fa), cache=cache).count() == 2
+    with pytest.raises(InvalidSequenceError):
+        FastaReader(str(fa), validate="strict", cache=cache).count()
@@ -0,0 +1,89 @@
+import random
+import struct
+
+import numpy as np
+import pytest
+
+from bioformats import FastaReader, FastqReader
+from bioformats.packed import PackedSequence, decode_kmer
+from bioformats.twobit import TWOBIT_SIGNATURE, TwoBitReader, TwoBitWriter
+
+COMP = str.maketrans("ACGTNacgtnRYSWKMBDHV", "TGCANtgcanYRSWMKVHDB")
+
+
+def _random_seq(rnd, n, alphabet="ACGTACGTACGTNacgt"):
+    return "".join(rnd.choice(alphabet) for _ in range(n))
+
+
+def test_twobit_pack_slice_revcomp_gc_kmers():
+    rnd = random.Random(5)
+    seq = _random_seq(rnd, 203)
+    packed = PackedSequence.pack(seq)
+    assert packed.bits == 2 and packed.nbytes == 51
+    assert str(packed) == seq and packed == seq
+    for _ in range(50):
+        a, b = sorted(rnd.sample(range(len(seq) + 1), 2))
+        sub = packed[a:b]
+        assert str(sub) == seq[a:b]
+        assert sub.gc_count() == sum(c in "GCgc" for c in seq[a:b])
+        assert str(sub.reverse_complement()) == seq[a:b].translate(COMP)[::-1]
+    assert packed[-1] == seq[-1] and packed[::2] == seq[::2]
+
+    k = 5
+    expected = [w.upper() for w in (seq[i:i + k] for i in range(len(seq) - k + 1)) if "N" not in w.upper()]
+    assert [decode_kmer(c, k) for c in packed.kmers(k)] == expected
+    assert packed.kmers(k).dtype == np.uint64
+
+
+def test_fourbit_iupac():
+    seq = "ACGTRYSWKMBDHVN=ACG"
+    packed = PackedSequence.pack(seq, bits=4)
+    assert str(packed) == seq
+    assert str(packed[3:11].reverse_complement()) == seq[3:11].translate(COMP)[::-1]
+    assert packed.gc_count() == 5  # C, G, S, C, G
+    assert [decode_kmer(c, 3) for c in packed.kmers(3)] == ["ACG", "CGT", "ACG"]
+    assert PackedSequence.pack("acgu", bits=4) == "ACGT"  # регистр не хранится, U -> T
+    with pytest.raises(ValueError):
+        PackedSequence.pack(seq, bits=3)
+
+
+def test_twobit_file_roundtrip(tmp_path):
+    rnd = random.Random(9)
+    records = [("chr1", _random_seq(rnd, 1000)), ("chrM", "NNNNacgtACGT"), ("empty", "")]
+    fasta = tmp_path / "g.fa"
+    fasta.write_text("".join(f">{n}\n{s}\n" for n, s in records if s))
+    path = tmp_path / "g.2bit"
+    with TwoBitWriter(str(path)) as w:
+        assert w.write_all(FastaReader(str(fasta), packed=2).read()) == 2
+        w.write(records[2])
+
+    raw = path.read_bytes()
+    assert struct.unpack_from("<IIII", raw) == (TWOBIT_SIGNATURE, 0, 3, 0)
+    tb = TwoBitReader(str(path))
+    assert tb.names == ["chr1", "chrM", "empty"]
+    assert tb.lengths() == {"chr1": 1000, "chrM": 12, "empty": 0}
+    assert dict((n, str(s)) for n, s in tb.read()) == dict(records)
+    assert tb.fetch("chr1", 100, 250) == records[0][1][100:250]
+    assert tb.fetch("chrM", 2, 6) == "NNac"
+    assert tb["chr1"].data.base is not None  # байты — окно в отображение файла
+    with pytest.raises(KeyError):
+        tb["chrX"]
+    with pytest.raises(ValueError):
+        TwoBitReader(str(fasta))
+
+
+def test_reader_packed_batches(tmp_path):
+    path = tmp_path / "r.fastq"
+    reads = [("r1", "ACGTNACGTA"), ("r2", "GGGCCC"), ("r3", "TTTT")]
+    path.write_text("".join(f"@{n}\n{s}\n+\n{'I' * len(s)}\n" for n, s in reads))
+    pairs = list(FastqReader(str(path), packed=4).read())
+    assert all(isinstance(s, PackedSequence) and s.bits == 4 for _, s in pairs)
+    assert [(n, str(s)) for n, s in pairs] == reads
+
+    batches = list(FastqReader(str(path)).read_packed(batch_size=2))
+    assert [len(b) for b in batches] == [2, 1]
+    assert [(n, str(s)) for b in batches for n, s in b] == reads
+    assert batches[0][1][1].gc_count() == 6
+    assert batches[0].nbytes < sum(len(s) for _, s in reads[:2]) + 64
+    with pytest.raises(ValueError):
+        FastqReader(str(path), packed=3)
@@ -0,0 +1,81 @@
+import random
+from bioformats import FastaReader, FastqReader, SamReader, VcfReader
+from bioformats.bgzf import bgzip
+from bioformats.parallel import ParallelReader, split_ranges
+
+
+def random_seq(rnd, n):
+    return "".join(rnd.choice("ACGT") for _ in range(n))
+
+
+def test_parallel_fasta_matches_sequential(tmp_path):
+    rnd = random.Random(0)
+    p = tmp_path / "multi.fa"
+    with open(p, "w") as fh:
+        for i in range(40):
+            seq = random_seq(rnd, rnd.randint(1, 200))
+            fh.write(f">s{i} desc\n")
+            for j in range(0, len(seq), 60):
+                fh.write(seq[j:j + 60] + "\n")
+
+    r = FastaReader(str(p))
+    par = ParallelReader(r, workers=3, chunk_size=97)
+    assert list(par.read()) == list(r.read())
+    assert par.count() == 40
+    assert par.average_length() == r.average_length()
+
+
+def test_parallel_fastq_with_at_sign_qualities(tmp_path):
+    rnd = random.Random(1)
+    p = tmp_path / "r.fq"
+    with open(p, "w") as fh:
+        for i in range(60):
+            seq = random_seq(rnd, rnd.randint(5, 30))
+            # качество, начинающееся с '@', — ловушка для синхронизации
+            qual = "@" + "".join(rnd.choice("@+I#") for _ in range(len(seq) - 1))
+            fh.write(f"@r{i}\n{seq}\n+\n{qual}\n")
+
+    r = FastqReader(str(p))
+    par = ParallelReader(r, workers=4, chunk_size=53, ordered=False)
+    assert sorted(par.read()) == sorted(r.read())
+    assert par.count() == 60
+
+    rb = FastqReader(str(p), binary=True)
+    par = ParallelReader(rb, workers=4, chunk_size=53)
+    assert list(par.read()) == list(rb.read())
+
+
+def test_parallel_vcf_and_bgzf_sam(tmp_path):
+    vcf = tmp_path / "v.vcf"
+    lines = ["##fileformat=VCFv4.2", "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO"]
+    lines += [f"chr{i % 3}\t{i + 1}\t.\tA\tG\t30\tPASS\t." for i in range(500)]
+    vcf.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    par = ParallelReader(VcfReader(str(vcf)), workers=2, chunk_size=1000)
+    assert list(par.read()) == list(VcfReader(str(vcf)).read())
+    assert par.chrom_counts() == {"chr0": 167, "chr1": 167, "chr2": 166}
+
+    sam = tmp_path / "a.sam"
+    body = "".join(f"q{i}\t0\tchr1\t{i + 1}\t60\t4M\t*\t0\t0\tACGT\tIIII\n" for i in range(30000))
+    sam.write_text("@HD\tVN:1.6\n" + body, encoding="utf-8")
+    gz = bgzip(str(sam))
+    assert len(split_ranges(SamReader(gz), chunk_size=20000)) > 1
+    par = ParallelReader(SamReader(gz), workers=3, chunk_size=20000)
+    assert par.count() == 30000
+    assert [a["qname"] for a in par.read()] == [f"q{i}" for i in range(30000)]
+
+
+def test_parallel_fastq_respects_validate(tmp_path):
+    import pytest
+    from bioformats.validation import InvalidSequenceError
+
+    p = tmp_path / "v.fq"
+    p.write_text("@a\nACGT\n+\nIIII\n@b\nAC#T\n+\nIIII\n@c\nGGCC\n+\nIIII\n", encoding="utf-8")
+
+    fast = FastqReader(str(p), validate="fast")
+    assert ParallelReader(fast, workers=2, chunk_size=16).count() == fast.count() == 2
+    strict = FastqReader(str(p), validate="strict")
+    with pytest.raises(InvalidSequenceError):
+        strict.count()
+    with pytest.raises(InvalidSequenceError):
+        ParallelReader(strict, workers=2, chunk_size=16).count()
+    assert ParallelReader(FastqReader(str(p)), workers=2, chunk_size=16).count() == 3
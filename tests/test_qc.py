@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from bioformats import FastqReader
+from bioformats.qc import FastqQC, decode_qualities, guess_phred_offset
+
+
+def test_qc_matches_naive_statistics(tmp_path):
+    rnd = np.random.default_rng(0)
+    reads = []
+    for i in range(300):
+        n = int(rnd.integers(20, 60))
+        seq = "".join(rnd.choice(list("ACGTN"), n))
+        qual = "".join(chr(33 + int(q)) for q in rnd.integers(0, 42, n))
+        reads.append((seq, qual))
+    p = tmp_path / "r.fq"
+    p.write_text("".join(f"@r{i}\n{s}\n+\n{q}\n" for i, (s, q) in enumerate(reads)), encoding="utf-8")
+
+    qc = FastqQC().add_reader(FastqReader(str(p)), batch_size=64)
+    assert qc.n_reads == 300
+    assert qc.max_length == max(len(s) for s, _ in reads)
+
+    by_pos = {}
+    for _s, q in reads:
+        for i, ch in enumerate(q):
+            by_pos.setdefault(i, []).append(ord(ch) - 33)
+    mean = qc.mean_quality()
+    q1, med, q3 = qc.quantiles()
+    for i, vals in by_pos.items():
+        assert mean[i] == pytest.approx(np.mean(vals))
+        assert med[i] == np.sort(vals)[int(np.ceil(0.5 * len(vals))) - 1]
+
+    assert qc.base_counts[0].sum() == 300
+    assert qc.base_content()[0].sum() == pytest.approx(100.0)
+    assert qc.length_counts.sum() == 300
+
+
+def test_phred64_and_decoding():
+    assert guess_phred_offset(["hhhh", "BBBB"]) == 64
+    assert guess_phred_offset(["II#!"]) == 33
+    assert decode_qualities("hB", 64).tolist() == [40, 2]
+    with pytest.raises(ValueError):
+        decode_qualities("!!", 64)
+
+    qc = FastqQC(phred_offset=64)
+    qc.update(["ACG", "A"], ["hhB", "h"])
+    assert qc.mean_quality().tolist() == [40.0, 40.0, 2.0]
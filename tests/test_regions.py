@@ -0,0 +1,58 @@
+from bioformats import SamReader, VcfReader
+from bioformats.bgzf import bgzip
+from bioformats.regions import Region, RegionSet, read_bed
+
+
+def test_region_set_merges_and_reports_hits():
+    rs = RegionSet([("chr1", 100, 200), ("chr1", 150, 300), ("chr1", 500, 600), ("chr2", 1, 10)])
+    assert rs.intervals("chr1") == [(100, 300), (500, 600)]
+    assert rs.hits("chr1", 170) == [Region("chr1", 100, 200), Region("chr1", 150, 300)]
+    assert rs.hits("chr1", 250) == [Region("chr1", 150, 300)]
+    assert rs.hits("chr1", 400) == []
+    assert rs.hits("chrX", 5) == []
+
+
+def test_query_regions_with_and_without_index(tmp_path):
+    lines = ["##fileformat=VCFv4.2", "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO"]
+    for chrom in ("chr1", "chr2"):
+        for i in range(2000):
+            lines.append(f"{chrom}\t{1 + i * 50}\t.\tA\tG\t30\tPASS\t.")
+    vcf = tmp_path / "v.vcf"
+    vcf.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    bed = tmp_path / "targets.bed"
+    bed.write_text("chr1\t0\t120\nchr1\t100\t151\nchr2\t99000\t99960\n", encoding="utf-8")
+    assert list(read_bed(bed))[0] == Region("chr1", 1, 120)
+
+    got = [(r["chrom"], r["pos"], len(h)) for r, h in VcfReader(str(vcf)).query_regions(bed)]
+    # позиция 101 попадает в оба перекрывающихся региона chr1
+    assert got[:4] == [("chr1", 1, 1), ("chr1", 51, 1), ("chr1", 101, 2), ("chr1", 151, 1)]
+    assert len(got) == 4 + 20  # chr2: 99001..99951 с шагом 50
+
+    gz = bgzip(str(vcf))
+    VcfReader(gz).build_index()
+    got_idx = [(r["chrom"], r["pos"], len(h)) for r, h in VcfReader(gz).query_regions(str(bed))]
+    assert got_idx == got
+
+
+def test_query_regions_uses_alignment_span(tmp_path):
+    sam = tmp_path / "a.sam"
+    sam.write_text(
+        "@HD\tVN:1.6\tSO:coordinate\n@SQ\tSN:c1\tLN:1000\n"
+        "r1\t0\tc1\t150\t60\t60M\t*\t0\t0\t*\t*\n"  # 150..209 — начинается до региона
+        "r2\t0\tc1\t180\t60\t10M\t*\t0\t0\t*\t*\n"  # 180..189 — мимо
+        "r3\t0\tc1\t195\t60\t5M100N5M\t*\t0\t0\t*\t*\n"  # 195..304 — через интрон
+        "r4\t0\tc1\t205\t60\t10M\t*\t0\t0\t*\t*\n",
+        encoding="utf-8",
+    )
+    r = SamReader(str(sam))
+    by_region = [rec["qname"] for rec in r.filter_by_region("c1", 200, 210)]
+    assert by_region == ["r1", "r3", "r4"]
+    assert [rec["qname"] for rec, _ in r.query_regions([("c1", 200, 210)])] == by_region
+    gz = bgzip(str(sam))
+    SamReader(gz).build_index()
+    assert [rec["qname"] for rec, _ in SamReader(gz).query_regions([("c1", 200, 210)])] == by_region
+    assert RegionSet([("c1", 200, 210), ("c1", 400, 500)]).overlapping("c1", 150, 450) == [
+        Region("c1", 200, 210),
+        Region("c1", 400, 500),
+    ]
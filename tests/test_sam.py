@@ -34,3 +34,64 @@ class TestSamReader(unittest.TestCase):
         hits = list(self.reader.filter_by_region("chr1", 100, 120))
         assert len(hits) == 1
         assert hits[0]["qname"] == "read1"
+
+    def test_read_projection_and_lazy(self):
+        recs = list(self.reader.read(fields=["chrom", "pos"]))
+        assert recs == [{"chrom": "chr1", "pos": 100}, {"chrom": "chr2", "pos": 250}]
+
+        lazy = list(self.reader.read(lazy=True))
+        assert lazy[0]["flag"] == 0
+        assert lazy[1]["seq"] == "NNNNNNNNNN"
+        assert lazy[0].raw.startswith("read1\t")
+        assert dict(lazy[0]) == next(self.reader.read())
+
+    def test_header_model(self):
+        h = self.reader.header
+        assert h.hd == {"VN": "1.6", "SO": "coordinate"}
+        assert h.references == {"chr1": 1000, "chr2": 500}
+        assert h.sort_order == "coordinate"
+        assert h.end_offset == len(SAM_CONTENT.split("read1")[0])
+        assert self.reader.header_by_group()["SQ"][1] == "@SQ\tSN:chr2\tLN:500"
+
+
+def test_read_pushdown_filters(tmp_path):
+    path = tmp_path / "f.sam"
+    path.write_text(
+        "@SQ\tSN:chr1\tLN:1000\n"
+        "a\t0\tchr1\t10\t60\t5M\t*\t0\t0\tACGTA\t*\tNM:i:0\tRG:Z:g1\n"
+        "b\t1024\tchr1\t20\t60\t5M\t*\t0\t0\tACGTA\t*\tNM:i:1\n"
+        "c\t16\tchr1\t30\t3\t5M\t*\t0\t0\tACGTA\t*\tNM:i:0\tRG:Z:g2\n"
+        "d\t272\tchr1\t40\t60\t5M\t*\t0\t0\tACGTA\t*\tAS:f:12.5\n",
+        encoding="utf-8",
+    )
+    r = SamReader(str(path))
+    names = lambda **kw: [rec["qname"] for rec in r.read(**kw)]
+
+    assert next(r.read())["mapq"] == 60
+    assert names(exclude_flags=0x704) == ["a", "c"]
+    assert names(require_flags=0x10) == ["c", "d"]
+    assert names(min_mapq=10) == ["a", "b", "d"]
+    assert names(tags={"NM": 0}) == ["a", "c"]
+    assert names(tags={"RG": "g2", "NM": 0}) == ["c"]
+    assert names(tags={"AS": lambda v: v > 10}) == ["d"]
+    assert names(exclude_flags=0x400, min_mapq=10, tags={"NM": 0}) == ["a"]
+
+    lazy = list(r.read(lazy=True, exclude_flags=0x100))
+    assert [rec.raw[0] for rec in lazy] == ["a", "b", "c"]
+    assert list(r.read(fields=["pos"], require_flags=0x400)) == [{"pos": 20}]
+
+
+def test_short_lines_skipped_by_lazy_region_filter(tmp_path):
+    from bioformats.merge import is_sorted
+
+    path = tmp_path / "short.sam"
+    path.write_text(
+        "@SQ\tSN:chr1\tLN:1000\n"
+        "a\t0\tchr1\t10\t60\t5M\t*\t0\t0\tACGTA\t*\n"
+        "b\t0\tchr1\t5\n"
+        "c\t0\tchr1\t30\t60\t5M\t*\t0\t0\tACGTA\t*\n",
+        encoding="utf-8",
+    )
+    r = SamReader(str(path))
+    assert [rec["qname"] for rec in r.filter_by_region("chr1", 1, 100, lazy=True)] == ["a", "c"]
+    assert is_sorted(r)
@@ -0,0 +1,106 @@
+import os
+import textwrap
+from bioformats import FastaReader, VcfReader
+from bioformats.cli import main
+from bioformats.stats import Aggregator, Stats
+
+
+def write(tmp_path, name, content):
+    p = tmp_path / name
+    p.write_text(textwrap.dedent(content).lstrip(), encoding="utf-8")
+    return p
+
+
+FASTA = """
+    >a
+    GGGGCCCCAT
+    >b
+    ATATAT
+    >c
+    GCNN
+    """
+
+
+def counting_reads(reader):
+    """Подменить read() счётчиком проходов по файлу."""
+    passes = []
+    original = reader.read
+
+    def read(*args, **kwargs):
+        passes.append(1)
+        return original(*args, **kwargs)
+
+    reader.read = read
+    return passes
+
+
+def test_single_pass_and_values(tmp_path):
+    fasta = write(tmp_path, "s.fa", FASTA)
+    r = FastaReader(str(fasta))
+    passes = counting_reads(r)
+
+    st = r.stats("count", "n50", "gc", "length_hist")
+    assert st == {
+        "count": 3,
+        "n50": 10,
+        "gc": 100.0 * 10 / 18,
+        "length_hist": {4: 1, 6: 1, 10: 1},
+    }
+    # count/average_length посчитаны «впрок» тем же проходом
+    assert r.count() == 3
+    assert r.average_length() == 20 / 3
+    assert len(passes) == 1
+
+
+def test_cache_invalidated_on_change(tmp_path):
+    fasta = write(tmp_path, "s.fa", FASTA)
+    r = FastaReader(str(fasta))
+    passes = counting_reads(r)
+    assert r.count() == 3 and r.count() == 3
+    assert len(passes) == 1
+
+    with open(fasta, "a") as fh:
+        fh.write(">d\nACGT\n")
+    st = os.stat(fasta)
+    os.utime(fasta, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert r.count() == 4
+    assert len(passes) == 2
+
+
+def test_custom_aggregator_and_genomic(tmp_path):
+    class MaxLen(Aggregator):
+        name = "max_len"
+
+        def __init__(self):
+            self.m = 0
+
+        def add(self, item):
+            self.m = max(self.m, len(item[1]))
+
+        def result(self):
+            return self.m
+
+    fasta = write(tmp_path, "s.fa", FASTA)
+    assert Stats("count").add(MaxLen()).run(FastaReader(str(fasta))) == {"count": 3, "max_len": 10}
+
+    vcf = tmp_path / "v.vcf"
+    vcf.write_text(
+        "##fileformat=VCFv4.2\n#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\n"
+        + "".join(f"chr{i % 2}\t{i + 1}\t.\tA\tG\t30\tPASS\t.\n" for i in range(5)),
+        encoding="utf-8",
+    )
+    v = VcfReader(str(vcf))
+    passes = counting_reads(v)
+    assert v.validate_coordinate("chr1", 10)
+    assert not v.validate_coordinate("chr9", 10)
+    assert v.get_chromosomes() == ["chr0", "chr1"]
+    assert v.count() == 5
+    assert v.stats()["chrom_counts"] == {"chr0": 3, "chr1": 2}
+    assert len(passes) == 1
+
+
+def test_cli_fasta_stats(tmp_path, capsys):
+    fasta = write(tmp_path, "s.fa", FASTA)
+    main(["fasta", "stats", "-i", str(fasta)])
+    out = capsys.readouterr().out
+    assert "sequences: 3" in out and "N50: 10" in out and "GC: 55.56%" in out
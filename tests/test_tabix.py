@@ -0,0 +1,64 @@
+import pytest
+from bioformats import SamReader, VcfReader
+from bioformats.bgzf import bgzip
+from bioformats.tabix import TabixIndex, reg2bin, reg2bins
+
+
+def make_vcf(tmp_path, n=3000):
+    lines = ["##fileformat=VCFv4.2", "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO"]
+    for chrom in ("chr1", "chr2"):
+        for i in range(n):
+            lines.append(f"{chrom}\t{1 + i * 97}\t.\tA\tG\t{i % 60}\tPASS\tDP={i}")
+    p = tmp_path / "big.vcf"
+    p.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return bgzip(str(p))
+
+
+def test_reg2bin():
+    assert reg2bin(0, 1) == 4681
+    assert reg2bin(0, 1 << 14) == 4681
+    assert reg2bin(0, (1 << 14) + 1) == 585
+    assert reg2bin(0, 1 << 29) == 0
+    assert reg2bin(100, 200) in reg2bins(150, 160)
+
+
+def test_vcf_indexed_region_matches_scan(tmp_path):
+    gz = make_vcf(tmp_path)
+    plain = list(VcfReader(gz).filter_by_region("chr2", 50000, 120000))
+
+    VcfReader(gz).build_index()
+    r = VcfReader(gz)
+    assert r.index is not None and r.index.names == ["chr1", "chr2"]
+    assert list(r.filter_by_region("chr2", 50000, 120000)) == plain
+    assert len(plain) > 0
+    assert list(r.filter_by_region("chr3", 1, 100)) == []
+
+    # индекс читается обратно без потерь
+    idx = TabixIndex.load(gz + ".tbi")
+    assert idx.query("chr1", 0, 10) == r.index.query("chr1", 0, 10)
+
+
+def test_sam_index_uses_cigar_and_rejects_unsorted(tmp_path):
+    sam = tmp_path / "a.sam"
+    sam.write_text(
+        "@HD\tVN:1.6\tSO:coordinate\n"
+        "@SQ\tSN:chr1\tLN:1000000\n"
+        "r1\t0\tchr1\t100\t60\t10M\t*\t0\t0\tACGTACGTAC\t*\n"
+        "r2\t0\tchr1\t20000\t60\t5M100000N5M\t*\t0\t0\tACGTACGTAC\t*\n"
+        "r3\t0\tchr1\t300000\t60\t10M\t*\t0\t0\tACGTACGTAC\t*\n",
+        encoding="utf-8",
+    )
+    gz = bgzip(str(sam))
+    r = SamReader(gz)
+    r.build_index()
+    assert [a["qname"] for a in r.filter_by_region("chr1", 1, 300000)] == ["r1", "r2", "r3"]
+    assert [a["qname"] for a in r.filter_by_region("chr1", 20000, 20000)] == ["r2"]
+
+    bad = tmp_path / "bad.sam"
+    bad.write_text(
+        "r1\t0\tchr1\t500\t60\t10M\t*\t0\t0\tACGTACGTAC\t*\n"
+        "r2\t0\tchr1\t100\t60\t10M\t*\t0\t0\tACGTACGTAC\t*\n",
+        encoding="utf-8",
+    )
+    with pytest.raises(ValueError):
+        SamReader(bgzip(str(bad))).build_index()
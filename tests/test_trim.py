@@ -0,0 +1,53 @@
+import pytest
+
+from bioformats import FastqReader, FastqTrimmer
+from bioformats.trim import FastqBatch, quality_trim_3p, sliding_window_trim
+
+
+def write_fastq(path, records):
+    path.write_text("".join(f"@{i}\n{s}\n+\n{q}\n" for i, s, q in records), encoding="utf-8")
+    return str(path)
+
+
+def test_quality_and_window_trim_vectorized():
+    batch = FastqBatch.from_records([
+        ("a", "ACGTACGT", "IIIII#!#"),
+        ("b", "ACGT", "IIII"),
+        ("c", "ACGTAC", "II##II"),
+    ])
+    assert batch.phred.shape == (3, 8)
+    ends = quality_trim_3p(batch.phred, batch.lengths, 20)
+    assert ends.tolist() == [5, 4, 6]
+    ends = sliding_window_trim(batch.phred, batch.lengths, 2, 20)
+    assert ends.tolist() == [5, 4, 2]
+
+
+def test_trimmer_adapter_and_min_length(tmp_path):
+    src = write_fastq(tmp_path / "in.fq", [
+        ("r1", "ACGTACGTAGATCGGAAG", "I" * 18),
+        ("r2", "ACGTACGTACAGATC", "I" * 15),
+        ("r3", "AGATCGGAAGAGC", "I" * 13),
+        ("r4", "ACGTACGTAC", "IIIIIIII##"),
+    ])
+    out = tmp_path / "out.fq"
+    trimmer = FastqTrimmer(adapter="AGATCGGAAGAGC", quality_cutoff=20, min_length=5)
+    stats = trimmer.run(FastqReader(src), str(out))
+    recs = list(FastqReader(str(out)).read_records())
+    assert recs == [("r1", "ACGTACGT", "I" * 8), ("r2", "ACGTACGTAC", "I" * 10), ("r4", "ACGTACGT", "I" * 8)]
+    assert (stats.reads_in, stats.reads_out, stats.too_short, stats.adapter_trimmed) == (4, 3, 1, 3)
+
+
+def test_paired_lockstep_and_mismatch(tmp_path):
+    r1 = write_fastq(tmp_path / "r1.fq", [("p1/1", "ACGTACGT", "IIIIIIII"), ("p2/1", "ACGTACGT", "IIIIIIII")])
+    r2 = write_fastq(tmp_path / "r2.fq", [("p1/2", "ACGTACGT", "IIIIIIII"), ("p2/2", "ACG", "III")])
+    o1, o2 = tmp_path / "o1.fq", tmp_path / "o2.fq"
+    FastqTrimmer(min_length=4).run_paired(FastqReader(r1), FastqReader(r2), str(o1), str(o2), batch_size=1)
+    assert [r[0] for r in FastqReader(str(o1)).read_records()] == ["p1/1"]
+    assert [r[0] for r in FastqReader(str(o2)).read_records()] == ["p1/2"]
+
+    bad = write_fastq(tmp_path / "bad.fq", [("p1/2", "ACGT", "IIII"), ("px/2", "ACGT", "IIII")])
+    with pytest.raises(ValueError, match="differ at pair 2"):
+        FastqTrimmer().run_paired(FastqReader(r1), FastqReader(bad), str(o1), str(o2))
+    short = write_fastq(tmp_path / "short.fq", [("p1/2", "ACGT", "IIII")])
+    with pytest.raises(ValueError, match="different numbers"):
+        FastqTrimmer().run_paired(FastqReader(r1), FastqReader(short), str(o1), str(o2), batch_size=1)
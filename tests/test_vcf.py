@@ -34,3 +34,88 @@ class TestVcfReader(unittest.TestCase):
         hits = list(self.reader.filter_by_region("chr1", 90, 120))
         assert len(hits) == 1
         assert hits[0]["pos"] == 100
+
+    def test_read_projection_and_lazy(self):
+        recs = list(self.reader.read(fields=["pos", "qual"]))
+        assert recs[0] == {"pos": 100, "qual": 50.0}
+        assert len(recs) == 3
+
+        lazy = next(self.reader.read(lazy=True))
+        assert lazy.get("chrom") == "chr1"
+        assert lazy["qual"] == 50.0
+        assert set(lazy) == set(next(self.reader.read()))
+
+    def test_header_model(self):
+        assert self.reader.get_reference_genome() == "GRCh38"
+        p = Path(__file__).parent / "tiny.vcf"
+        p.write_text(
+            "##fileformat=VCFv4.2\n"
+            '##INFO=<ID=DP,Number=1,Type=Integer,Description="Depth, total">\n'
+            '##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">\n'
+            '##FILTER=<ID=q10,Description="Quality below 10">\n'
+            "##contig=<ID=chr1,length=1000>\n"
+            "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tS1\tS2\n"
+            "chr1\t5\t.\tA\tG\t1\tPASS\tDP=3\tGT\t0/1\t1/1\n",
+            encoding="utf-8",
+        )
+        r = VcfReader(str(p))
+        h = r.header
+        assert h.fileformat == "VCFv4.2"
+        assert h.info["DP"].type == "Integer" and h.info["DP"].description == "Depth, total"
+        assert h.format["GT"].number == "1"
+        assert h.filters == {"q10": "Quality below 10"}
+        assert h.contigs == {"chr1": 1000}
+        assert h.samples == ["S1", "S2"]
+        assert [v["pos"] for v in r.read()] == [5]
+
+    def test_typed_info_and_genotypes(self):
+        import numpy as np
+
+        p = Path(__file__).parent / "tiny.vcf"
+        p.write_text(
+            "##fileformat=VCFv4.2\n"
+            '##INFO=<ID=DP,Number=1,Type=Integer,Description="Depth">\n'
+            '##INFO=<ID=AF,Number=A,Type=Float,Description="Allele freq">\n'
+            '##INFO=<ID=DB,Number=0,Type=Flag,Description="dbSNP">\n'
+            '##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">\n'
+            '##FORMAT=<ID=DP,Number=1,Type=Integer,Description="Depth">\n'
+            '##FORMAT=<ID=GQ,Number=1,Type=Float,Description="Quality">\n'
+            "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tS1\tS2\tS3\n"
+            "chr1\t5\t.\tA\tG,T\t1\tPASS\tDP=10;AF=0.5,.;DB\tGT:DP:GQ\t0/1:7:30\t1|2:.:.\t./.\n"
+            "chr1\t9\t.\tC\tT\t1\tPASS\t.\tDP:GT\t3:1\t4:0/0\t5:1/1\n",
+            encoding="utf-8",
+        )
+        r = VcfReader(str(p))
+        recs = list(r.read(info=True))
+        assert recs[0]["info"] == {"DP": 10, "AF": [0.5, None], "DB": True}
+        assert recs[1]["info"] == {}
+        assert next(r.read(fields=["pos", "info"], info=["DP"])) == {"pos": 5, "info": {"DP": 10}}
+
+        g = r.genotypes(fields=["GT", "DP", "GQ"])
+        assert g.gt.dtype == np.int8 and g.gt.shape == (2, 3, 2)
+        assert g.gt[0].tolist() == [[0, 1], [1, 2], [-1, -1]]
+        assert g.gt[1].tolist() == [[1, -2], [0, 0], [1, 1]]  # гаплоидный вызов: второй аллель -2
+        assert g.phased[0].tolist() == [False, True, False]
+        assert g["DP"].dtype == np.int32 and g["DP"].tolist() == [[7, -1, -1], [3, 4, 5]]
+        assert np.isnan(g["GQ"][0, 1]) and g["GQ"][0, 0] == 30.0
+
+        sub = r.genotypes(samples=["S3", "S1"])
+        assert sub.samples == ["S3", "S1"]
+        assert sub.gt[:, :, 0].tolist() == [[-1, 0], [1, 1]]
+        assert sub.alt_allele_counts().tolist() == [[0, 1], [2, 1]]
+
+
+def test_short_lines_skipped_in_every_read_mode(tmp_path):
+    p = tmp_path / "short.vcf"
+    p.write_text(
+        "##fileformat=VCFv4.2\n"
+        "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\n"
+        "chr1\t100\trs1\tA\tG\t50\tPASS\t.\n"
+        "chr1\t150\tbroken\n",
+        encoding="utf-8",
+    )
+    r = VcfReader(str(p))
+    assert len(list(r.read())) == 1
+    assert len(list(r.read(fields=["chrom", "pos"]))) == 1
+    assert [rec["id"] for rec in r.read(lazy=True)] == ["rs1"]
+    assert [rec["pos"] for rec in r.filter_by_region("chr1", 1, 200, lazy=True)] == [100]
@@ -0,0 +1,128 @@
+import gzip
+import random
+
+import pytest
+
+from bioformats import FastaReader, FastqReader, SamReader, VcfReader
+from bioformats.cli import main
+from bioformats.writers import FastaWriter, FastqWriter, SamWriter, VcfWriter
+
+
+def test_fasta_writer_roundtrip_with_index(tmp_path):
+    rnd = random.Random(0)
+    records = [(f"s{i}", "".join(rnd.choice("ACGT") for _ in range(rnd.randint(1, 150)))) for i in range(30)]
+    for name in ("out.fa", "out.fa.gz"):
+        path = str(tmp_path / name)
+        with FastaWriter(path, line_width=50, index=True, buffer_size=100) as w:
+            w.write_all(records)
+        r = FastaReader(path)
+        assert list(r.read()) == records
+        # индекс, построенный при записи, совпадает с построенным по файлу
+        on_the_fly = [tuple(rec) for rec in r.index]
+        assert on_the_fly == [tuple(rec) for rec in FastaReader(path).build_index(save=False)]
+        assert r.fetch("s7", 3, 40) == records[7][1][3:40]
+
+
+def test_fastq_writer_and_validation(tmp_path):
+    src = tmp_path / "in.fq"
+    src.write_text("@r1 lane\nACGT\n+\nIIII\n@r2\nGG\n+\n#I\n", encoding="utf-8")
+    out = tmp_path / "out.fq.gz"
+    with FastqWriter(str(out)) as w:
+        w.write_all(FastqReader(str(src), binary=True).read_records())
+    assert gzip.decompress(out.read_bytes()).decode() == "@r1 lane\nACGT\n+\nIIII\n@r2\nGG\n+\n#I\n"
+    with FastqWriter(str(tmp_path / "bad.fq")) as w:
+        with pytest.raises(ValueError):
+            w.write(("r1", "ACGT"))
+        with pytest.raises(ValueError):
+            w.write(("r1", "ACGT", "II"))
+
+
+def write_vcf(path, n=300):
+    lines = [
+        "##fileformat=VCFv4.2",
+        '##INFO=<ID=DP,Number=1,Type=Integer,Description="depth">',
+        '##FORMAT=<ID=GT,Number=1,Type=String,Description="genotype">',
+        "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tS1",
+    ]
+    lines += [
+        f"chr{1 + i // 150}\t{(i % 150) * 100 + 1}\t.\tA\tG\t{30 + i % 5}\t{'PASS' if i % 3 else 'LowQ'}\tDP={i}\tGT\t0/1"
+        for i in range(n)
+    ]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_vcf_streaming_filter_with_tabix(tmp_path):
+    src = tmp_path / "in.vcf"
+    write_vcf(src)
+    out = str(tmp_path / "pass.vcf.gz")
+    r = VcfReader(str(src))
+    with VcfWriter(out, header=r.header, index=True, buffer_size=512) as w:
+        w.write_all(rec for rec in r.read(lazy=True) if rec["filter"] == "PASS")
+
+    back = VcfReader(out)
+    assert back.header.samples == ["S1"]
+    assert back.count() == 200
+    assert back.index is not None  # .tbi записан при записи
+    expected = [rec for rec in VcfReader(str(src)).filter_by_region("chr2", 1000, 5000) if rec["filter"] == "PASS"]
+    assert list(back.filter_by_region("chr2", 1000, 5000)) == expected
+
+    # dict-записи и батчи; typed INFO сериализуется обратно
+    dict_out = str(tmp_path / "dict.vcf")
+    with VcfWriter(dict_out, header=r.header) as w:
+        w.write_all(VcfReader(str(src)).read(info=True))
+    first = VcfReader(dict_out).read()
+    assert next(first) == next(VcfReader(str(src)).read())
+    batch_out = str(tmp_path / "batch.vcf")
+    with VcfWriter(batch_out) as w:
+        for batch in VcfReader(str(src)).read_batches(batch_size=64):
+            w.write_batch(batch)
+    assert list(VcfReader(batch_out).read()) == list(VcfReader(str(src)).read())
+
+    unsorted = str(tmp_path / "unsorted.vcf.gz")
+    with pytest.raises(ValueError):
+        with VcfWriter(unsorted, index=True, buffer_size=1) as w:
+            w.write({"chrom": "chr1", "pos": 10, "ref": "A", "alt": "G"})
+            w.write({"chrom": "chr1", "pos": 5, "ref": "A", "alt": "G"})
+
+
+def test_sam_slice_cli_writes_all_hits(tmp_path, capsys):
+    sam = tmp_path / "a.sam"
+    body = "".join(f"q{i}\t0\tchr1\t{i + 1}\t{i % 60}\t4M\t*\t0\t0\tACGT\tIIII\tNM:i:0\n" for i in range(50))
+    sam.write_text("@HD\tVN:1.6\tSO:coordinate\n@SQ\tSN:chr1\tLN:1000\n" + body, encoding="utf-8")
+    out = tmp_path / "slice.sam.gz"
+    main(["sam", "slice", "-i", str(sam), "--chrom", "chr1", "--start", "11", "--end", "40", "-o", str(out), "--index"])
+    assert "33 alignments saved" in capsys.readouterr().out
+    text = gzip.decompress(out.read_bytes()).decode().splitlines()
+    assert text[:2] == ["@HD\tVN:1.6\tSO:coordinate", "@SQ\tSN:chr1\tLN:1000"]
+    # строки сохранены целиком (MAPQ, теги); q7 (8-11) пересекает регион концом
+    assert text[2] == "q7\t0\tchr1\t8\t7\t4M\t*\t0\t0\tACGT\tIIII\tNM:i:0"
+    assert len(list(SamReader(str(out)).filter_by_region("chr1", 20, 25))) == 9
+
+
+def test_sam_writer_roundtrip(tmp_path):
+    sam = tmp_path / "in.sam"
+    body = "".join(
+        f"q{i}\t{16 if i % 2 else 0}\tchr{1 + i % 2}\t{10 + i * 7}\t{i % 61}\t5M\t*\t0\t0\tACGTA\tIIIII\tNM:i:{i % 3}\n"
+        for i in range(40)
+    )
+    header = "@HD\tVN:1.6\tSO:unsorted\n@SQ\tSN:chr1\tLN:1000\n@SQ\tSN:chr2\tLN:1000\n"
+    sam.write_text(header + body, encoding="utf-8")
+    r = SamReader(str(sam))
+
+    # LazyRecord — строка целиком, включая QUAL и теги
+    lazy_out = tmp_path / "lazy.sam"
+    with SamWriter(str(lazy_out), header=r.header) as w:
+        assert w.write_all(r.read(lazy=True)) == 40
+    assert lazy_out.read_text(encoding="utf-8") == header + body
+
+    # dict-записи и батчи: колонки ридера сохраняются, QUAL/теги — «нет данных»
+    dict_out = str(tmp_path / "dict.sam")
+    with SamWriter(dict_out, header=r.header) as w:
+        w.write_all(SamReader(str(sam)).read())
+    assert list(SamReader(dict_out).read()) == list(r.read())
+    assert open(dict_out, encoding="utf-8").read().splitlines()[3] == "q0\t0\tchr1\t10\t0\t5M\t*\t0\t0\tACGTA\t*"
+    batch_out = str(tmp_path / "batch.sam")
+    with SamWriter(batch_out, header=r.header) as w:
+        for batch in SamReader(str(sam)).read_batches(batch_size=16):
+            w.write_batch(batch)
+    assert list(SamReader(batch_out).read()) == list(r.read())